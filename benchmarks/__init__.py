@@ -0,0 +1 @@
+"""Benchmarks for Drive Network Analyzer."""
@@ -0,0 +1,103 @@
+"""Accuracy and memory benchmark: approximate versus exact leaders.
+
+Builds the same generated command stream into an exact Network and into
+ApproxNetwork at several error bounds, then reports the time ingestion took,
+the memory each holds after ingestion, how many company leaders match the
+exact result, and the count error on the matching leaders.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_approx --contacts 1000000 --partners 20000 --epsilons 0.1 0.01
+"""
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.generate import generate_commands
+from src.approx import ApproxNetwork
+from src.cli import parse_command
+from src.entities import Network
+
+
+def build(factory, lines: list[str]):
+    """Parse lines into a new network; return it, the bytes it holds and the seconds taken."""
+    # Timed in a separate pass because tracemalloc slows down every allocation
+    network = factory()
+    start = time.perf_counter()
+    for line in lines:
+        parse_command(line, network)
+    elapsed = time.perf_counter() - start
+
+    network = factory()
+    tracemalloc.start()
+    for line in lines:
+        parse_command(line, network)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return network, current, elapsed
+
+
+def compare(exact: Network, approx: ApproxNetwork) -> tuple[float, float]:
+    """
+    Compare approximate leaders against exact ones.
+
+    Args:
+        exact: Network built from the commands
+        approx: ApproxNetwork built from the same commands
+
+    Returns:
+        tuple: (fraction of companies with the same leader partner,
+                mean relative count error over those companies)
+    """
+    matches = 0
+    relative_error = 0.0
+    for company_name in exact.companies:
+        expected = exact.get_leader(company_name)
+        sketch = approx.sketches.get(company_name)
+        found = sketch.leader() if sketch is not None else None
+        if expected is None or found is None:
+            matches += expected is None and found is None
+            continue
+        if found[0] == expected[0]:
+            matches += 1
+            relative_error += (found[1] - expected[1]) / expected[1]
+    num_companies = max(len(exact.companies), 1)
+    return matches / num_companies, relative_error / max(matches, 1)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
+    parser = argparse.ArgumentParser(description="Compare approximate and exact leaders.")
+    parser.add_argument("--contacts", type=int, default=200_000)
+    parser.add_argument("--partners", type=int, default=5_000)
+    parser.add_argument("--companies", type=int, default=200)
+    parser.add_argument("--employees-per-company", type=int, default=10)
+    parser.add_argument("--skew", type=float, default=1.1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--epsilons", type=float, nargs="+", default=[0.1, 0.02, 0.005])
+    return parser
+
+
+def main(argv=None) -> None:
+    """Run the benchmark and print a comparison."""
+    args = build_parser().parse_args(argv)
+    lines = list(generate_commands(
+        num_partners=args.partners, num_companies=args.companies,
+        employees_per_company=args.employees_per_company,
+        num_contacts=args.contacts, skew=args.skew, seed=args.seed))
+
+    exact, exact_bytes, exact_seconds = build(Network, lines)
+    print(f"contacts: {args.contacts:,}  partners: {args.partners:,}  "
+          f"companies: {args.companies:,}")
+    print(f"{'engine':>16}{'seconds':>10}{'MiB':>10}{'leaders match':>16}{'count error':>14}")
+    print(f"{'exact':>16}{exact_seconds:>10.2f}{exact_bytes / 2**20:>10.1f}"
+          f"{'100.0%':>16}{'0.00%':>14}")
+    for epsilon in args.epsilons:
+        approx, approx_bytes, approx_seconds = build(lambda: ApproxNetwork(epsilon), lines)
+        accuracy, error = compare(exact, approx)
+        print(f"{f'approx {epsilon:g}':>16}{approx_seconds:>10.2f}{approx_bytes / 2**20:>10.1f}"
+              f"{accuracy:>16.1%}{error:>14.2%}")
+
+
+if __name__ == "__main__":
+    main()
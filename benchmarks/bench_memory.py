@@ -0,0 +1,82 @@
+"""Memory benchmark: list[Contact] versus the columnar ContactStore.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_memory [num_contacts] [run_length]
+
+With a run_length above 1, each generated contact is recorded that many
+times, and the store is measured twice: with the repeats back to back, as in
+logs that record the same contact over and over, and interleaved with other
+contacts. ContactStore only merges repeats that arrive in a row, so the
+interleaved layout takes one row per contact, as with run_length 1.
+"""
+import random
+import sys
+import tracemalloc
+
+from src.entities import CONTACT_TYPES, Contact, ContactStore
+
+
+def generate_contacts(num_contacts: int, num_employees: int = 10_000,
+                      num_partners: int = 50, seed: int = 0) -> list[tuple[str, str, str]]:
+    """Generate deterministic (employee, partner, type) triples.
+
+    Args:
+        num_contacts: Number of contacts to generate
+        num_employees: Number of distinct employee names
+        num_partners: Number of distinct partner names
+        seed: Random seed
+
+    Returns:
+        list of (employee_name, partner_name, contact_type) tuples
+    """
+    rng = random.Random(seed)
+    employees = [f"Employee{i}" for i in range(num_employees)]
+    partners = [f"Partner{i}" for i in range(num_partners)]
+    return [(rng.choice(employees), rng.choice(partners), rng.choice(CONTACT_TYPES))
+            for _ in range(num_contacts)]
+
+
+def measure(build) -> int:
+    """Return the bytes still allocated by the object build() returns."""
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison."""
+    num_contacts = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    run_length = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    distinct = generate_contacts(num_contacts // run_length)
+    layouts = {
+        "back to back": [triple for triple in distinct for _ in range(run_length)],
+        "interleaved": distinct * run_length,
+    }
+    num_contacts = len(distinct) * run_length
+
+    def build_list(triples):
+        return [Contact(e, p, t) for e, p, t in triples]
+
+    def build_store(triples):
+        store = ContactStore()
+        for e, p, t in triples:
+            store.append(e, p, t)
+        return store
+
+    print(f"{'contacts:':<28}{num_contacts:,} ({run_length} of each)")
+    list_bytes = measure(lambda: build_list(layouts["interleaved"]))
+    print(f"{'list[Contact]:':<28}{list_bytes / 2**20:8.1f} MiB "
+          f"({list_bytes / num_contacts:.1f} B/contact)")
+    for layout, triples in layouts.items():
+        store_bytes = measure(lambda: build_store(triples))
+        print(f"{f'ContactStore, {layout}:':<28}{store_bytes / 2**20:8.1f} MiB "
+              f"({store_bytes / num_contacts:.1f} B/contact, "
+              f"{list_bytes / store_bytes:.1f}x reduction)")
+
+
+if __name__ == "__main__":
+    main()
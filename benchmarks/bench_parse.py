@@ -0,0 +1,75 @@
+"""Parser throughput benchmark: parse_command per line versus parse_commands on an mmap.
+
+Each parser is timed twice: end to end into a real Network, and against a
+network whose add_* methods do nothing, which isolates the parsing cost from
+entity validation and counting.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_parse [num_contacts]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.generate import write_commands
+from src.cli import parse_command, parse_file_mmap
+from src.entities import Network
+
+
+class NullNetwork:
+    """Stand-in network that accepts every command and stores nothing."""
+
+    def add_partner(self, name):
+        pass
+
+    def add_company(self, name):
+        pass
+
+    def add_employee(self, name, company_name):
+        pass
+
+    def add_contact(self, employee_name, partner_name, contact_type):
+        pass
+
+
+def time_parser(parse, path: str, network_class=Network) -> float:
+    """Return the seconds parse(path, network) takes on a fresh network."""
+    network = network_class()
+    start = time.perf_counter()
+    parse(path, network)
+    return time.perf_counter() - start
+
+
+def parse_lines(path: str, network: Network) -> None:
+    """Parse a file line by line with parse_command, the way main does."""
+    with open(path) as f:
+        for line in f:
+            parse_command(line, network)
+
+
+def main() -> None:
+    """Run the benchmark and print lines per second for each parser."""
+    num_contacts = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "input.txt")
+        with open(path, 'w') as f:
+            num_lines = write_commands(f, num_contacts=num_contacts, num_companies=1_000,
+                                       employees_per_company=10, skew=0.0)
+
+        results = {}
+        for label, network_class in (("end to end", Network), ("parse only", NullNetwork)):
+            results[label] = (time_parser(parse_lines, path, network_class),
+                              time_parser(parse_file_mmap, path, network_class))
+
+    print(f"lines: {num_lines:,}")
+    for label, (line_seconds, mmap_seconds) in results.items():
+        print(f"{label}:")
+        print(f"  parse_command:   {line_seconds:8.2f} s ({num_lines / line_seconds:,.0f} lines/s)")
+        print(f"  parse_commands:  {mmap_seconds:8.2f} s ({num_lines / mmap_seconds:,.0f} lines/s)")
+        print(f"  speedup:         {line_seconds / mmap_seconds:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
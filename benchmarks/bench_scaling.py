@@ -0,0 +1,181 @@
+"""Scaling benchmark: parse, aggregate and output cost across input sizes.
+
+For each size a command file is generated with benchmarks.generate and then
+measured in a fresh child process, so peak memory is not carried over from
+earlier sizes. Results can be saved to JSON and compared against an earlier
+run to spot regressions.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_scaling --sizes 10000 100000 1000000 --save base.json
+    python -m benchmarks.bench_scaling --sizes 10000 100000 1000000 --compare base.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Optional
+
+from benchmarks.generate import write_commands
+
+# Metrics reported per size, in display order
+METRICS = (
+    "parse_seconds", "aggregate_seconds", "output_seconds",
+    "parse_peak_mib", "aggregate_peak_mib", "output_peak_mib",
+)
+
+
+def peak_rss_mib() -> float:
+    """Return this process's peak resident set size in MiB."""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    if sys.platform == "darwin":
+        return peak / 2**20
+    return peak / 2**10
+
+
+def run_stages(path: str, engine: str) -> dict:
+    """
+    Parse, aggregate and output one command file, measuring each stage.
+
+    Meant to run in a fresh process; peak memory is the process high-water
+    mark after each stage.
+
+    Args:
+        path: Command file to measure
+        engine: Analysis engine name from src.analyzer.ENGINES
+
+    Returns:
+        dict: Seconds and peak MiB for each stage
+    """
+    from src.analyzer import ENGINES
+    from src.cli import iter_input, parse_command
+    from src.entities import Network
+
+    result = {}
+
+    start = time.perf_counter()
+    network = Network()
+    for line in iter_input(path):
+        parse_command(line, network)
+    result["parse_seconds"] = time.perf_counter() - start
+    result["parse_peak_mib"] = peak_rss_mib()
+
+    start = time.perf_counter()
+    output = ENGINES[engine](network)
+    result["aggregate_seconds"] = time.perf_counter() - start
+    result["aggregate_peak_mib"] = peak_rss_mib()
+
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as f:
+        print(output, file=f)
+    result["output_seconds"] = time.perf_counter() - start
+    result["output_peak_mib"] = peak_rss_mib()
+
+    return result
+
+
+def measure_size(num_contacts: int, options: dict, engine: str) -> dict:
+    """
+    Generate a command file and measure it in a child process.
+
+    Args:
+        num_contacts: Number of contacts to generate
+        options: Other keyword arguments for generate_commands
+        engine: Analysis engine name
+
+    Returns:
+        dict: Size, line count and stage metrics
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "input.txt")
+        with open(path, 'w') as f:
+            num_lines = write_commands(f, num_contacts=num_contacts, **options)
+        completed = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_scaling", "--run", path, "--engine", engine],
+            check=True, capture_output=True, text=True,
+        )
+    result = {"contacts": num_contacts, "lines": num_lines}
+    result.update(json.loads(completed.stdout))
+    return result
+
+
+def format_results(results: list[dict], baseline: Optional[dict] = None) -> str:
+    """
+    Format results as a table, with ratios to a baseline run if given.
+
+    Args:
+        results: Per-size results from measure_size
+        baseline: Earlier saved run to compare against
+
+    Returns:
+        str: Multi-line table
+    """
+    previous = {}
+    if baseline is not None:
+        previous = {r["contacts"]: r for r in baseline["results"]}
+
+    header = f"{'contacts':>12}" + "".join(f"{name:>20}" for name in METRICS)
+    lines = [header]
+    for result in results:
+        row = f"{result['contacts']:>12,}"
+        for name in METRICS:
+            cell = f"{result[name]:.3f}"
+            old = previous.get(result["contacts"], {}).get(name)
+            if old:
+                cell += f" ({result[name] / old:.2f}x)"
+            row += f"{cell:>20}"
+        lines.append(row)
+    return "\n".join(lines)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
+    parser = argparse.ArgumentParser(description="Run the scaling benchmark suite.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000],
+                        help="Numbers of contacts to measure")
+    parser.add_argument("--partners", type=int, default=50)
+    parser.add_argument("--companies", type=int, default=1_000)
+    parser.add_argument("--employees-per-company", type=int, default=10)
+    parser.add_argument("--skew", type=float, default=1.0)
+    parser.add_argument("--interleave", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--engine", default="python")
+    parser.add_argument("--save", metavar="PATH", help="Save results to a JSON file")
+    parser.add_argument("--compare", metavar="PATH", help="Compare against saved results")
+    parser.add_argument("--run", metavar="PATH", help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv=None) -> None:
+    """Entry point for the benchmark suite."""
+    args = build_parser().parse_args(argv)
+
+    if args.run is not None:
+        # Child process: measure one file and report JSON on stdout
+        print(json.dumps(run_stages(args.run, args.engine)))
+        return
+
+    options = dict(num_partners=args.partners, num_companies=args.companies,
+                   employees_per_company=args.employees_per_company,
+                   skew=args.skew, interleave=args.interleave, seed=args.seed)
+    results = [measure_size(size, options, args.engine) for size in args.sizes]
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print(format_results(results, baseline))
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({"options": options, "engine": args.engine, "results": results}, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Stdin ingestion benchmark: readlines() versus the read-ahead pipeline.
+
+The input is produced by a child process that generates commands as it
+writes them (benchmarks.generate), standing in for a slow upstream process
+in a pipe. Each mode reads the same commands from a fresh child and parses
+them into a Network:
+
+- readlines: read the whole pipe with readlines(), then parse
+- lines: iterate over the pipe and parse each line as it arrives
+- pipelined: a reader thread reads ahead in chunks (iter_input's stdin path)
+
+With more than one core, the pipelined mode lets reading wait on the
+producer while the previous chunk is parsed.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_stdin [num_contacts] [chunk_kib]
+"""
+import io
+import subprocess
+import sys
+import time
+
+from src.cli import parse_command
+from src.entities import Network
+from src.pipeline import QUEUED_BLOCKS, open_pipelined
+
+
+def parse_readlines(pipe) -> Network:
+    """Read everything with readlines(), then parse it."""
+    network = Network()
+    for line in io.TextIOWrapper(pipe).readlines():
+        parse_command(line, network)
+    return network
+
+
+def parse_lines(pipe) -> Network:
+    """Parse lines as they are read from the pipe."""
+    network = Network()
+    for line in io.TextIOWrapper(pipe):
+        parse_command(line, network)
+    return network
+
+
+def parse_pipelined(pipe, chunk_size: int) -> Network:
+    """Parse lines while a background thread reads the pipe ahead."""
+    network = Network()
+    with open_pipelined(pipe, 'r', chunk_size, QUEUED_BLOCKS) as f:
+        for line in f:
+            parse_command(line, network)
+    return network
+
+
+def time_mode(parse, num_contacts: int) -> float:
+    """Return the seconds taken to parse the output of a fresh generator."""
+    producer = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.generate", "--contacts", str(num_contacts)],
+        stdout=subprocess.PIPE,
+    )
+    start = time.perf_counter()
+    parse(producer.stdout)
+    elapsed = time.perf_counter() - start
+    producer.stdout.close()
+    producer.wait()
+    return elapsed
+
+
+def main() -> None:
+    """Run the benchmark and print the time and speedup of each mode."""
+    num_contacts = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    chunk_size = (int(sys.argv[2]) if len(sys.argv) > 2 else 1024) << 10
+    modes = {
+        "readlines": parse_readlines,
+        "lines": parse_lines,
+        "pipelined": lambda pipe: parse_pipelined(pipe, chunk_size),
+    }
+
+    results = {label: time_mode(parse, num_contacts) for label, parse in modes.items()}
+    baseline = results["readlines"]
+    print(f"contacts: {num_contacts:,}, chunk: {chunk_size >> 10} KiB")
+    for label, seconds in results.items():
+        print(f"  {label:10} {seconds:8.2f} s  ({baseline / seconds:5.2f}x vs readlines)")
+
+
+if __name__ == "__main__":
+    main()
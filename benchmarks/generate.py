@@ -0,0 +1,153 @@
+"""Deterministic synthetic command file generator.
+
+Writes a command file with a chosen number of partners, companies,
+employees per company and contacts. Partner popularity follows a Zipf
+distribution whose exponent is set with --skew (0 is uniform), and
+--interleave controls how many partner and employee declarations are
+spread through the contact stream instead of written up front. Every
+contact only references entities that were declared before it, so the
+output always parses. The same arguments and seed always produce the
+same file.
+
+Run from the repository root:
+
+    python -m benchmarks.generate --contacts 1000000 --skew 1.1 -o input.txt
+"""
+import argparse
+import bisect
+import itertools
+import random
+import sys
+from typing import Iterator, TextIO
+
+from src.entities import CONTACT_TYPES
+
+
+def generate_commands(num_partners: int = 50, num_companies: int = 1_000,
+                      employees_per_company: int = 10, num_contacts: int = 100_000,
+                      skew: float = 1.0, interleave: float = 0.0,
+                      seed: int = 0) -> Iterator[str]:
+    """
+    Generate command lines, without trailing newlines.
+
+    Args:
+        num_partners: Number of partners
+        num_companies: Number of companies
+        employees_per_company: Number of employees at each company
+        num_contacts: Number of Contact commands
+        skew: Zipf exponent for partner popularity; 0 picks partners uniformly
+        interleave: Fraction (0-1) of partner and employee declarations that
+                    are spread through the contacts instead of written first
+        seed: Random seed
+
+    Yields:
+        str: Command lines
+    """
+    if num_contacts and (num_partners < 1 or num_companies < 1 or employees_per_company < 1):
+        raise ValueError("Contacts need at least one partner, company and employee")
+    if not 0.0 <= interleave <= 1.0:
+        raise ValueError("interleave must be between 0 and 1")
+
+    rng = random.Random(seed)
+    partners = [f"P{i}" for i in range(num_partners)]
+    companies = [f"C{i}" for i in range(num_companies)]
+    employees = [(f"E{i}", companies[i // employees_per_company])
+                 for i in range(num_companies * employees_per_company)]
+    rng.shuffle(employees)
+
+    # Cumulative Zipf weights, so a partner index is one bisect away. The
+    # most popular partners are declared first.
+    partner_weights = list(itertools.accumulate(1.0 / (rank + 1) ** skew
+                                                for rank in range(num_partners)))
+
+    for company in companies:
+        yield f"Company {company}"
+
+    # At least one partner and employee must exist before the first contact
+    upfront_partners = max(1, round(num_partners * (1 - interleave)))
+    upfront_employees = max(1, round(len(employees) * (1 - interleave)))
+    for partner in partners[:upfront_partners]:
+        yield f"Partner {partner}"
+    for employee, company in employees[:upfront_employees]:
+        yield f"Employee {employee} {company}"
+
+    # Spread the remaining declarations evenly through the contacts
+    declared_partners = upfront_partners
+    declared_employees = upfront_employees
+    late_partners = num_partners - upfront_partners
+    late_employees = len(employees) - upfront_employees
+
+    for i in range(num_contacts):
+        while declared_partners < num_partners and \
+                (declared_partners - upfront_partners) * num_contacts <= i * late_partners:
+            yield f"Partner {partners[declared_partners]}"
+            declared_partners += 1
+        while declared_employees < len(employees) and \
+                (declared_employees - upfront_employees) * num_contacts <= i * late_employees:
+            employee, company = employees[declared_employees]
+            yield f"Employee {employee} {company}"
+            declared_employees += 1
+
+        employee = employees[rng.randrange(declared_employees)][0]
+        target = rng.random() * partner_weights[declared_partners - 1]
+        partner = partners[bisect.bisect_right(partner_weights, target, 0, declared_partners - 1)]
+        yield f"Contact {employee} {partner} {rng.choice(CONTACT_TYPES)}"
+
+    # Declarations that had no contacts left to interleave with
+    for partner in partners[declared_partners:]:
+        yield f"Partner {partner}"
+    for employee, company in employees[declared_employees:]:
+        yield f"Employee {employee} {company}"
+
+
+def write_commands(f: TextIO, **options) -> int:
+    """
+    Write generated commands to a text file.
+
+    Args:
+        f: Open text file
+        **options: Keyword arguments for generate_commands
+
+    Returns:
+        int: Number of lines written
+    """
+    num_lines = 0
+    for line in generate_commands(**options):
+        f.write(line)
+        f.write("\n")
+        num_lines += 1
+    return num_lines
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic command file.")
+    parser.add_argument("--partners", type=int, default=50)
+    parser.add_argument("--companies", type=int, default=1_000)
+    parser.add_argument("--employees-per-company", type=int, default=10)
+    parser.add_argument("--contacts", type=int, default=100_000)
+    parser.add_argument("--skew", type=float, default=1.0,
+                        help="Zipf exponent for partner popularity (0 = uniform)")
+    parser.add_argument("--interleave", type=float, default=0.0,
+                        help="Fraction of declarations spread among the contacts")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    return parser
+
+
+def main(argv=None) -> None:
+    """Entry point for the generator."""
+    args = build_parser().parse_args(argv)
+    options = dict(num_partners=args.partners, num_companies=args.companies,
+                   employees_per_company=args.employees_per_company,
+                   num_contacts=args.contacts, skew=args.skew,
+                   interleave=args.interleave, seed=args.seed)
+    if args.output is None:
+        write_commands(sys.stdout, **options)
+    else:
+        with open(args.output, 'w') as f:
+            write_commands(f, **options)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,76 @@
 """Relationship strength analysis logic."""
+import heapq
+from typing import Optional
+
 from src.entities import Network
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional and only needed for the numpy engine
+    np = None
+
+# Largest company x partner matrix analyze_network_numpy counts densely (4M
+# float64 cells, 32 MiB), and the most cells per contact row it may have: a
+# cell takes 8 bytes, while the sparse count takes a few times that per row
+_DENSE_LIMIT = 1 << 22
+_DENSE_CELLS_PER_ROW = 4
+
+
+def format_leaders(company_names, leaders: dict[str, tuple[str, int]]) -> str:
+    """
+    Format the strongest relationship for each company.
+
+    Args:
+        company_names: Company names in output order
+        leaders: {company_name: (partner_name, count)} for companies with contacts
+
+    Returns:
+        str: One line per company, "Company: Partner (count)" or
+             "Company: No current relationship"
+    """
+    results = []
+    for company_name in company_names:
+        leader = leaders.get(company_name)
+        if leader is not None:
+            best_partner, max_count = leader
+            results.append(f"{company_name}: {best_partner} ({max_count})")
+        else:
+            # Company has no contacts
+            results.append(f"{company_name}: No current relationship")
+
+    return "\n".join(results)
+
+
+def format_delta(company_names, before: dict[str, tuple[str, int]],
+                 after: dict[str, tuple[str, int]]) -> str:
+    """
+    Format the leaders that differ between two leader tables.
+
+    Args:
+        company_names: Companies to compare, in output order
+        before: {company_name: (partner_name, count)} of the prior state
+        after: {company_name: (partner_name, count)} of the current state
+
+    Returns:
+        str: One line per company whose leader or leader's count differs:
+             "+ Company: Partner (count)" for a new leader,
+             "- Company: Partner (count)" for a leader that is gone, and
+             "~ Company: Old (count) -> New (count)" for a change
+    """
+    results = []
+    for company_name in company_names:
+        old = before.get(company_name)
+        new = after.get(company_name)
+        if old == new:
+            continue
+        if old is None:
+            results.append(f"+ {company_name}: {new[0]} ({new[1]})")
+        elif new is None:
+            results.append(f"- {company_name}: {old[0]} ({old[1]})")
+        else:
+            results.append(f"~ {company_name}: {old[0]} ({old[1]}) -> {new[0]} ({new[1]})")
+    return "\n".join(results)
+
 
 def analyze_network(network: Network) -> str:
     """
@@ -16,51 +86,189 @@ def analyze_network(network: Network) -> str:
         str: Formatted output showing strongest relationships, one company per line,
              sorted alphabetically by company name
     """
-    # Count contacts for each (company, partner) pair
-    company_partner_counts = {}
+    # Contact counts and leaders are maintained by Network.add_contact, so
+    # this only walks the companies and never rescans the contacts. The text
+    # is memoized until the network next changes.
+    return network.memoize("analyze_network", lambda network: format_leaders(
+        [company_name for company_name, _ in leader_table(network)], network.leaders))
 
-    for contact in network.get_contacts():
 
-        # Find which company this employee works at
-        employee = network.employees[contact.employee_name]
-        company_name = employee.company_name
-        partner_name = contact.partner_name
+def leader_table(network: Network) -> list[tuple[str, Optional[tuple[str, int]]]]:
+    """
+    Get the strongest relationship for each company as data.
 
-        # Initialize company dict if first time seeing this company
-        if company_name not in company_partner_counts:
-            company_partner_counts[company_name] = {}
+    The table is memoized until the network next changes and is shared
+    between callers, so it must not be modified.
 
-        # Initialize partner count if first time seeing this partner for this company
-        if partner_name not in company_partner_counts[company_name]:
-            company_partner_counts[company_name][partner_name] = 0
+    Args:
+        network: Network instance containing all entities and contacts
 
-        # Increment the contact count
-        company_partner_counts[company_name][partner_name] += 1
+    Returns:
+        list: (company_name, (partner_name, count)) per company, sorted by
+              company name, with None for companies without contacts
+    """
+    return network.memoize("leader_table", lambda network: [
+        (company_name, network.leaders.get(company_name))
+        for company_name in sorted(network.companies)])
 
-    # Build output for each company (sorted alphabetically)
-    results = []
-    for company_name in sorted(network.companies.keys()):
-        if company_name in company_partner_counts:
 
-            # Company has contacts - find the partner with most contacts
-            partner_counts = company_partner_counts[company_name]
+def top_partners(network: Network, company_name: str, k: int) -> list[tuple[str, int]]:
+    """
+    Find the k partners with the strongest relationship to a company.
 
-            # Find the maximum count
-            max_count = max(partner_counts.values())
+    Uses a bounded heap over the company's maintained partner counts, so the
+    cost is O(P log k) for P partners and the full map is never sorted.
 
-            # Get all partners with the max count (handles ties)
-            best_partners = []
-            for partner, count in partner_counts.items():
-                if count == max_count:
-                    best_partners.append(partner)
+    Args:
+        network: Network instance containing all entities and contacts
+        company_name: Name of the company
+        k: Maximum number of partners to return
 
-            # If multiple partners tied, pick first alphabetically
-            best_partners.sort()
-            best_partner = best_partners[0]
+    Returns:
+        list[tuple[str, int]]: (partner_name, count) pairs, strongest first,
+                               ties broken alphabetically by partner name
+    """
+    partner_counts = network.company_partner_counts.get(company_name)
+    if not partner_counts or k <= 0:
+        return []
+    if k == 1:
+        return [network.get_leader(company_name)]
+    return heapq.nsmallest(k, partner_counts.items(), key=lambda item: (-item[1], item[0]))
 
-            results.append(f"{company_name}: {best_partner} ({max_count})")
+
+def analyze_top_partners(network: Network, k: int) -> str:
+    """
+    Analyze partner-company relationships, listing the top k partners per company.
+
+    Args:
+        network: Network instance containing all entities and contacts
+        k: Number of partners to list per company
+
+    Returns:
+        str: One line per company sorted alphabetically, with partners
+             strongest first, e.g. "Acme: Alice (3), Bob (1)". With k=1
+             the output matches analyze_network.
+    """
+    results = []
+    for company_name in sorted(network.companies.keys()):
+        top = top_partners(network, company_name, k)
+        if top:
+            partners = ", ".join(f"{partner} ({count})" for partner, count in top)
+            results.append(f"{company_name}: {partners}")
         else:
-            # Company has no contacts
             results.append(f"{company_name}: No current relationship")
 
     return "\n".join(results)
+
+
+def analyze_partner(network: Network, partner_name: str) -> str:
+    """
+    Describe one partner's standing at every company they have contacts at.
+
+    Args:
+        network: Network instance containing all entities and contacts
+        partner_name: Name of the partner
+
+    Returns:
+        str: One "Company: #rank (count)" line per company, sorted
+             alphabetically; rank #1 means the partner leads the company
+    """
+    standing = network.get_partner_standing(partner_name)
+    if not standing:
+        return f"{partner_name}: No current relationship"
+    return "\n".join(f"{company_name}: #{rank} ({count})"
+                     for company_name, rank, count in standing)
+
+
+def analyze_network_numpy(network: Network) -> str:
+    """
+    Analyze partner-company relationships with vectorized NumPy aggregation.
+
+    Recomputes every count from the contact columns instead of using the
+    network's maintained counters. Contact runs are mapped to (company,
+    partner) index arrays and reduced with a single bincount weighted by run
+    length (or a sort-based unique count when the company x partner matrix
+    would be too large). Partners are indexed in alphabetical order, so
+    taking the first maximum keeps the alphabetical tie-break.
+
+    Args:
+        network: Network instance containing all entities and contacts
+
+    Returns:
+        str: Same output as analyze_network
+    """
+    if np is None:
+        raise ImportError("The numpy engine requires numpy (pip install numpy)")
+
+    company_names = sorted(network.companies.keys())
+    partner_names = sorted(network.partners.keys())
+    store = network.get_contacts()
+    # Apply pending removals so the columns hold exactly the live contacts
+    store.compact()
+    if len(store) == 0:
+        return format_leaders(company_names, {})
+
+    # Map string table IDs to company index (for employees) and
+    # alphabetical partner index (for partners)
+    company_index = {name: i for i, name in enumerate(company_names)}
+    employee_company = np.zeros(len(store.names), dtype=np.int64)
+    partner_index = np.zeros(len(store.names), dtype=np.int64)
+    for name, employee in network.employees.items():
+        name_id = store.name_ids.get(name)
+        if name_id is not None:
+            employee_company[name_id] = company_index[employee.company_name]
+    for i, name in enumerate(partner_names):
+        name_id = store.name_ids.get(name)
+        if name_id is not None:
+            partner_index[name_id] = i
+
+    # Turn the contact columns into (company, partner) index arrays without copying
+    companies = employee_company[np.frombuffer(store.employee_ids, dtype=np.intc)]
+    partners = partner_index[np.frombuffer(store.partner_ids, dtype=np.intc)]
+    # Run lengths; float64 weights are exact for any realistic count (< 2**53)
+    weights = np.frombuffer(store.counts, dtype=np.uintc)
+
+    num_companies = len(company_names)
+    num_partners = len(partner_names)
+    keys = companies * num_partners + partners
+
+    num_cells = num_companies * num_partners
+    if num_cells <= min(_DENSE_LIMIT, _DENSE_CELLS_PER_ROW * len(keys)):
+        # Dense company x partner count matrix, kept as the float64 bincount
+        # returns it rather than copied to integers; argmax returns the first
+        # (alphabetically smallest) partner among ties
+        counts = np.bincount(keys, weights=weights, minlength=num_cells)
+        counts = counts.reshape(num_companies, num_partners)
+        best = counts.argmax(axis=1)
+        best_counts = counts[np.arange(num_companies), best]
+        has_contacts = best_counts > 0
+        leader_companies = np.nonzero(has_contacts)[0]
+        leader_partners = best[has_contacts]
+        leader_counts = best_counts[has_contacts].astype(np.int64)
+    else:
+        # Sparse: count each distinct (company, partner) key, then order by
+        # company, descending count, partner and keep the first row per company
+        pairs, inverse = np.unique(keys, return_inverse=True)
+        pair_counts = np.bincount(inverse.ravel(), weights=weights).astype(np.int64)
+        pair_companies = pairs // num_partners
+        pair_partners = pairs % num_partners
+        order = np.lexsort((pair_partners, -pair_counts, pair_companies))
+        ordered_companies = pair_companies[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = ordered_companies[1:] != ordered_companies[:-1]
+        leader_companies = ordered_companies[first]
+        leader_partners = pair_partners[order][first]
+        leader_counts = pair_counts[order][first]
+
+    leaders = {
+        company_names[c]: (partner_names[p], int(n))
+        for c, p, n in zip(leader_companies.tolist(), leader_partners.tolist(),
+                           leader_counts.tolist())
+    }
+    return format_leaders(company_names, leaders)
+
+# Analysis engines selectable from the CLI
+ENGINES = {
+    "python": analyze_network,
+    "numpy": analyze_network_numpy,
+}
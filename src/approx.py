@@ -0,0 +1,194 @@
+"""Approximate, bounded-memory leader tracking with Space-Saving sketches.
+
+ApproxNetwork accepts the same commands as Network, but instead of storing
+contacts it keeps one Space-Saving sketch per company. A sketch holds at
+most `capacity` partner counters, so memory per company is fixed no matter
+how many distinct partners appear. With capacity = ceil(1 / epsilon), every
+reported count overestimates the true count by at most epsilon times the
+company's total number of contacts, and any partner holding more than that
+share of a company's contacts is guaranteed to be tracked.
+"""
+import heapq
+import math
+from typing import Optional
+
+from src.entities import CONTACT_TYPES, Company, Employee, Partner
+
+
+class SpaceSaving:
+    """Space-Saving heavy-hitter sketch over partner names."""
+
+    def __init__(self, capacity: int):
+        """Initialize an empty sketch.
+
+        Args:
+            capacity: Maximum number of partner counters kept
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        # {partner_name: [estimated_count, max_overestimate]}
+        self.counters: dict[str, list[int]] = {}
+        # One (count, partner_name) entry per counter. Counts only grow, so an
+        # entry may lag behind its counter but never exceeds it; stale entries
+        # are refreshed when they reach the top of the heap.
+        self._heap: list[tuple[int, str]] = []
+
+    def add(self, partner_name: str, count: int = 1) -> None:
+        """Count contacts with a partner.
+
+        Args:
+            partner_name: Name of the partner
+            count: Number of contacts to add
+        """
+        counter = self.counters.get(partner_name)
+        if counter is not None:
+            counter[0] += count
+        elif len(self.counters) < self.capacity:
+            self.counters[partner_name] = [count, 0]
+            heapq.heappush(self._heap, (count, partner_name))
+        else:
+            # Replace the smallest counter; the newcomer inherits its count
+            # as a possible overestimate
+            floor = self._pop_smallest()
+            self.counters[partner_name] = [floor + count, floor]
+            heapq.heappush(self._heap, (floor + count, partner_name))
+
+    def _pop_smallest(self) -> int:
+        # Refresh stale entries until the top one is current; every other
+        # entry is then a lower bound on a count at least as large
+        heap = self._heap
+        while True:
+            stored, name = heap[0]
+            count = self.counters[name][0]
+            if stored == count:
+                heapq.heappop(heap)
+                del self.counters[name]
+                return count
+            heapq.heapreplace(heap, (count, name))
+
+    def leader(self) -> Optional[tuple[str, int, bool]]:
+        """Get the partner with the highest estimated count.
+
+        Ties are broken alphabetically by partner name.
+
+        Returns:
+            (partner_name, estimated_count, max_overestimate) or None if
+            nothing was added; max_overestimate is 0 when the count is exact
+        """
+        if not self.counters:
+            return None
+        partner_name, (count, error) = min(self.counters.items(),
+                                           key=lambda item: (-item[1][0], item[0]))
+        return partner_name, count, error
+
+
+class ApproxNetwork:
+    """Network that tracks per-company heavy hitters instead of contacts."""
+
+    def __init__(self, epsilon: float = 0.01):
+        """Initialize an empty network.
+
+        Args:
+            epsilon: Maximum count error, as a fraction of each company's contacts
+        """
+        if not 0 < epsilon <= 1:
+            raise ValueError("epsilon must be in (0, 1]")
+        self.capacity = math.ceil(1 / epsilon)
+        self.partners: dict[str, Partner] = {}
+        self.companies: dict[str, Company] = {}
+        self.employees: dict[str, Employee] = {}
+        # {company_name: SpaceSaving}
+        self.sketches: dict[str, SpaceSaving] = {}
+
+    def add_partner(self, name: str) -> None:
+        """Add a partner to the network.
+
+        Args:
+            name: Partner's name
+        """
+        if name in self.partners:
+            raise ValueError(f"Partner '{name}' already exists")
+        self.partners[name] = Partner(name)
+
+    def add_company(self, name: str) -> None:
+        """Add a company to the network.
+
+        Args:
+            name: Company's name
+        """
+        if name in self.companies:
+            raise ValueError(f"Company '{name}' already exists")
+        self.companies[name] = Company(name)
+
+    def add_employee(self, name: str, company_name: str) -> None:
+        """Add an employee to the network.
+
+        Args:
+            name: Employee's name
+            company_name: Name of the company where they work
+        """
+        if name in self.employees:
+            raise ValueError(f"Employee '{name}' already exists")
+        if company_name not in self.companies:
+            raise ValueError(f"Company '{company_name}' does not exist")
+        self.employees[name] = Employee(name, company_name)
+
+    def add_contact(self, employee_name: str, partner_name: str, contact_type: str,
+                    count: int = 1) -> None:
+        """Count a contact between an employee and a partner.
+
+        Args:
+            employee_name: Name of the employee
+            partner_name: Name of the partner
+            contact_type: Type of contact (email, call, coffee)
+            count: Number of identical contacts to count at once
+        """
+        if employee_name not in self.employees:
+            raise ValueError(f"Employee '{employee_name}' does not exist")
+        if partner_name not in self.partners:
+            raise ValueError(f"Partner '{partner_name}' does not exist")
+        if contact_type.lower() not in CONTACT_TYPES:
+            raise ValueError(f"Invalid contact type '{contact_type}'. Must be email, call, coffee, or pitch")
+
+        company_name = self.employees[employee_name].company_name
+        sketch = self.sketches.get(company_name)
+        if sketch is None:
+            sketch = self.sketches[company_name] = SpaceSaving(self.capacity)
+        sketch.add(partner_name, count)
+
+    def move_employee(self, name: str, company_name: str) -> None:
+        """Not supported: sketches cannot give back one employee's contacts."""
+        raise ValueError("Move is not supported in approximate mode")
+
+    def remove_employee(self, name: str) -> None:
+        """Not supported: sketches cannot give back one employee's contacts."""
+        raise ValueError("Remove is not supported in approximate mode")
+
+    def remove_contact(self, employee_name: str, partner_name: str, contact_type: str) -> None:
+        """Not supported: Space-Saving counts can only grow."""
+        raise ValueError("Remove is not supported in approximate mode")
+
+
+def analyze_approx(network: ApproxNetwork) -> str:
+    """
+    Analyze an approximate network.
+
+    Args:
+        network: ApproxNetwork to analyze
+
+    Returns:
+        str: analyze_network format, except that counts which may be
+             overestimated are prefixed with "~", e.g. "Acme: Alice (~42)"
+    """
+    results = []
+    for company_name in sorted(network.companies.keys()):
+        sketch = network.sketches.get(company_name)
+        leader = sketch.leader() if sketch is not None else None
+        if leader is not None:
+            partner_name, count, error = leader
+            marker = "~" if error else ""
+            results.append(f"{company_name}: {partner_name} ({marker}{count})")
+        else:
+            results.append(f"{company_name}: No current relationship")
+    return "\n".join(results)
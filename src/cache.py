@@ -0,0 +1,167 @@
+"""On-disk result cache keyed by the content of the input file.
+
+Every cached input is identified by the SHA-256 of its bytes. An entry
+holds a snapshot of the network built from that input plus the printed
+output for each set of output options it has been run with:
+
+    index.json          {digest: {"size", "resumable", "last_used", "bytes", "outputs"}}
+    <digest>.snap       network snapshot (see src.snapshot)
+
+A lookup hashes the input once. Along the way it also hashes every prefix
+whose length matches a cached entry, so an input that is a cached input
+plus appended lines is recognised in the same pass. The caller can then
+reload that entry's snapshot and parse only the new tail. Only inputs that
+end with a newline are used this way, since an append to an input without
+one would extend its last line.
+
+The cache is bounded by the total size of its snapshots and outputs; the
+least recently used entries are removed first.
+"""
+import hashlib
+import json
+import os
+import time
+from typing import NamedTuple, Optional
+
+from src.entities import Network
+
+# Default bound on the total size of cached snapshots and outputs
+DEFAULT_MAX_BYTES = 1 << 30
+
+# Bytes hashed per read
+READ_SIZE = 1 << 20
+
+
+class CacheLookup(NamedTuple):
+    """Result of looking an input file up in the cache."""
+    digest: str            # SHA-256 of the whole input
+    size: int              # Input size in bytes
+    resumable: bool        # Input ends with a newline
+    output: Optional[str]  # Cached output for the requested options
+    snapshot: Optional[str]  # Snapshot of the exact input, or of the prefix
+    offset: int            # Bytes covered by snapshot; parse from here
+
+
+class ResultCache:
+    """Content-addressed cache of network snapshots and outputs."""
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Open or create a cache directory.
+
+        Args:
+            directory: Directory holding the cache
+            max_bytes: Bound on the total size of cached snapshots and outputs
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self.index_path = os.path.join(directory, "index.json")
+        try:
+            with open(self.index_path) as f:
+                self.index: dict[str, dict] = json.load(f)
+        except (OSError, ValueError):
+            self.index = {}
+
+    def snapshot_path(self, digest: str) -> str:
+        """Return the snapshot file path for an entry."""
+        return os.path.join(self.directory, f"{digest}.snap")
+
+    def lookup(self, path: str, variant: str) -> CacheLookup:
+        """
+        Hash an input file and find what the cache holds for it.
+
+        Args:
+            path: Input command file
+            variant: Key for the output options, e.g. "leaders" or "top=3"
+
+        Returns:
+            CacheLookup: The input's digest and any reusable cached state
+        """
+        # Cached inputs that could be a prefix of this one, shortest first
+        candidates = sorted((entry["size"], digest) for digest, entry in self.index.items()
+                            if entry["resumable"])
+        hasher = hashlib.sha256()
+        position = 0
+        last_byte = b""
+        prefix: Optional[tuple[str, int]] = None
+        with open(path, 'rb') as f:
+            while True:
+                # Stop each read at the next candidate length so its prefix
+                # hash can be checked
+                while candidates and candidates[0][0] <= position:
+                    size, candidate = candidates.pop(0)
+                    if size == position and hasher.hexdigest() == candidate:
+                        prefix = (candidate, size)
+                limit = READ_SIZE
+                if candidates:
+                    limit = min(limit, candidates[0][0] - position)
+                block = f.read(limit)
+                if not block:
+                    break
+                hasher.update(block)
+                position += len(block)
+                last_byte = block[-1:]
+
+        digest = hasher.hexdigest()
+        entry = self.index.get(digest)
+        if entry is not None and os.path.exists(self.snapshot_path(digest)):
+            self._touch(digest)
+            return CacheLookup(digest, position, last_byte == b"\n",
+                               entry["outputs"].get(variant), self.snapshot_path(digest), position)
+        if prefix is not None and prefix[0] != digest and os.path.exists(self.snapshot_path(prefix[0])):
+            self._touch(prefix[0])
+            return CacheLookup(digest, position, last_byte == b"\n",
+                               None, self.snapshot_path(prefix[0]), prefix[1])
+        return CacheLookup(digest, position, last_byte == b"\n", None, None, 0)
+
+    def store(self, lookup: CacheLookup, network: Network, variant: str, output: str) -> None:
+        """
+        Record the network and output for an input.
+
+        Args:
+            lookup: Result of lookup for the input
+            network: Network built from the input
+            variant: Key for the output options
+            output: Printed output
+        """
+        entry = self.index.get(lookup.digest)
+        snapshot_path = self.snapshot_path(lookup.digest)
+        if entry is None or not os.path.exists(snapshot_path):
+            network.save_snapshot(snapshot_path)
+            entry = self.index[lookup.digest] = {
+                "size": lookup.size,
+                "resumable": lookup.resumable,
+                "bytes": os.path.getsize(snapshot_path),
+                "outputs": {},
+            }
+        entry["bytes"] += len(output) - len(entry["outputs"].get(variant, ""))
+        entry["outputs"][variant] = output
+        entry["last_used"] = time.time()
+        self._evict()
+        self._save_index()
+
+    def _touch(self, digest: str) -> None:
+        """Mark an entry as most recently used."""
+        self.index[digest]["last_used"] = time.time()
+        self._save_index()
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the size bound holds."""
+        total = sum(entry["bytes"] for entry in self.index.values())
+        by_age = sorted(self.index, key=lambda digest: self.index[digest]["last_used"])
+        # The newest entry is kept even if it alone exceeds the bound
+        for digest in by_age[:-1]:
+            if total <= self.max_bytes:
+                break
+            total -= self.index.pop(digest)["bytes"]
+            try:
+                os.remove(self.snapshot_path(digest))
+            except FileNotFoundError:
+                pass
+
+    def _save_index(self) -> None:
+        """Write the index atomically."""
+        temporary = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(temporary, 'w') as f:
+            json.dump(self.index, f)
+        os.replace(temporary, self.index_path)
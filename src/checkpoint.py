@@ -0,0 +1,183 @@
+"""Checkpointed ingestion of long command files.
+
+Commands are parsed as bytes so the input offset of every line is known.
+Every `every` lines, and before giving up on a bad line or an interrupt,
+the network is saved as a snapshot alongside a small JSON file recording
+the input offset and line number it covers:
+
+    <path>              {"input", "offset", "line_number", "anchor", "snapshot"}
+    <path>.<n>.snap     network snapshot for checkpoint n
+
+The JSON file is replaced atomically after its snapshot is written, so it
+always points at a complete snapshot. `anchor` is a hash of the input bytes
+just before the offset, checked on resume so a checkpoint is not applied to
+a different file.
+
+With a quarantine file, lines that fail are written there, each preceded
+by a "# line N: error" comment, and ingestion carries on. Unknown commands
+are ignored, so the quarantine file can itself be fixed up and replayed.
+"""
+import hashlib
+import json
+import os
+from typing import BinaryIO, Optional, TextIO
+
+from src.cli import parse_command
+from src.entities import Network
+
+# Lines parsed between checkpoints by default
+CHECKPOINT_EVERY = 1_000_000
+
+# Bytes before the checkpoint offset hashed to recognise the input
+ANCHOR_SIZE = 4096
+
+
+def input_anchor(path: str, offset: int) -> str:
+    """
+    Hash the input bytes just before an offset.
+
+    Args:
+        path: Input command file
+        offset: Checkpoint offset
+
+    Returns:
+        str: Hex digest of up to ANCHOR_SIZE bytes ending at offset
+    """
+    start = max(0, offset - ANCHOR_SIZE)
+    with open(path, 'rb') as f:
+        f.seek(start)
+        return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+
+class Checkpointer:
+    """Saves and restores ingestion checkpoints for one input file."""
+
+    def __init__(self, path: str, input_path: str, every: int = CHECKPOINT_EVERY):
+        """Initialize a checkpointer.
+
+        Args:
+            path: Checkpoint file path
+            input_path: Input command file being ingested
+            every: Lines parsed between checkpoints
+        """
+        self.path = path
+        self.input_path = input_path
+        self.every = every
+        self.generation = 0
+
+    def save(self, network: Network, offset: int, line_number: int) -> None:
+        """
+        Write a checkpoint.
+
+        Args:
+            network: Network built from the input up to offset
+            offset: Byte offset of the first line not yet applied
+            line_number: Number of lines before offset
+        """
+        previous = self._read_state()
+        self.generation += 1
+        snapshot = f"{self.path}.{self.generation}.snap"
+        network.save_snapshot(snapshot)
+
+        state = {
+            "input": os.path.abspath(self.input_path),
+            "offset": offset,
+            "line_number": line_number,
+            "anchor": input_anchor(self.input_path, offset),
+            "snapshot": os.path.basename(snapshot),
+        }
+        temporary = f"{self.path}.tmp"
+        with open(temporary, 'w') as f:
+            json.dump(state, f)
+        os.replace(temporary, self.path)
+
+        if previous is not None and previous["snapshot"] != state["snapshot"]:
+            self._remove_snapshot(previous)
+
+    def load(self) -> Optional[tuple[Network, int, int]]:
+        """
+        Restore the last checkpoint, if there is one.
+
+        Returns:
+            (network, offset, line_number), or None without a checkpoint
+
+        Raises:
+            ValueError: If the checkpoint was taken from different input
+        """
+        state = self._read_state()
+        if state is None:
+            return None
+        offset = state["offset"]
+        if (os.path.getsize(self.input_path) < offset
+                or input_anchor(self.input_path, offset) != state["anchor"]):
+            raise ValueError(f"Checkpoint '{self.path}' does not match input '{self.input_path}'")
+
+        snapshot = os.path.join(os.path.dirname(self.path), state["snapshot"])
+        # Carry on numbering after the restored generation
+        self.generation = int(state["snapshot"].rsplit(".", 2)[-2])
+        return Network.load_snapshot(snapshot), offset, state["line_number"]
+
+    def clear(self) -> None:
+        """Remove the checkpoint and its snapshot."""
+        state = self._read_state()
+        if state is not None:
+            self._remove_snapshot(state)
+            os.remove(self.path)
+
+    def _read_state(self) -> Optional[dict]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _remove_snapshot(self, state: dict) -> None:
+        try:
+            os.remove(os.path.join(os.path.dirname(self.path), state["snapshot"]))
+        except FileNotFoundError:
+            pass
+
+
+def ingest(stream: BinaryIO, network: Network, offset: int = 0, line_number: int = 0,
+           checkpointer: Optional[Checkpointer] = None,
+           quarantine: Optional[TextIO] = None) -> int:
+    """
+    Parse command lines from a binary stream with checkpoints and quarantine.
+
+    Args:
+        stream: Binary stream positioned at offset
+        network: Network instance to update
+        offset: Input offset of the stream's current position
+        line_number: Number of input lines before offset
+        checkpointer: Saves a checkpoint every checkpointer.every lines, and
+                      before a bad line or interrupt ends ingestion
+        quarantine: Text file to write failing lines to instead of raising
+
+    Returns:
+        int: Number of lines quarantined
+
+    Raises:
+        ValueError: If a line fails and there is no quarantine file
+    """
+    quarantined = 0
+    try:
+        for raw in stream:
+            try:
+                parse_command(raw.decode('utf-8'), network)
+            except (ValueError, IndexError) as e:
+                if quarantine is None:
+                    raise
+                quarantine.write(f"# line {line_number + 1}: {e}\n")
+                quarantine.write(raw.decode('utf-8', errors='replace').rstrip("\r\n") + "\n")
+                quarantined += 1
+            offset += len(raw)
+            line_number += 1
+            if checkpointer is not None and line_number % checkpointer.every == 0:
+                checkpointer.save(network, offset, line_number)
+    except (ValueError, IndexError, KeyboardInterrupt):
+        # Keep everything before the failing line so --resume can pick up
+        # from it once the input is fixed
+        if checkpointer is not None:
+            checkpointer.save(network, offset, line_number)
+        raise
+    return quarantined
@@ -1,7 +1,28 @@
 """Command-line interface for the network analyzer."""
+import argparse
+import glob
+import io
+import itertools
+import mmap
+import os
+import re
 import sys
+from typing import Iterator, Optional
 from src.entities import Network
-from src.analyzer import analyze_network
+from src.analyzer import ENGINES, analyze_partner, analyze_top_partners, format_delta
+from src.cache import DEFAULT_MAX_BYTES, ResultCache
+from src.compression import detect_compression, open_input, open_stream
+from src.pipeline import BLOCK_SIZE, QUEUED_BLOCKS
+from src.profiling import Profiler
+from src.snapshot import is_snapshot
+
+# Lines parse_trusted reads and loads at a time
+TRUSTED_BATCH_SIZE = 5_000
+
+# Lines that are all well-formed Contact commands, or blank. Such a batch has
+# exactly four words per contact, so it can be split as one string. The
+# quantifiers are possessive so matching keeps no backtracking state.
+CONTACT_LINES = re.compile(r"(?:\s*+Contact(?:[^\S\n]++\S++){3}+[^\S\n]*+(?:\n|\Z))*+\s*")
 
 
 def parse_command(line: str, network: Network) -> None:
@@ -13,6 +34,9 @@ def parse_command(line: str, network: Network) -> None:
     - Company <Name>
     - Employee <Name> <CompanyName>
     - Contact <EmployeeName> <PartnerName> <ContactType>
+    - Move <EmployeeName> <CompanyName>
+    - Remove Employee <EmployeeName>
+    - Remove Contact <EmployeeName> <PartnerName> <ContactType>
 
     Args:
         line: Command string to parse
@@ -50,6 +74,184 @@ def parse_command(line: str, network: Network) -> None:
         contact_type = parts[3]
         network.add_contact(employee_name, partner_name, contact_type)
 
+    elif command == "Move":
+        if len(parts) != 3:
+            raise ValueError("Invalid number of arguments")
+        network.move_employee(parts[1], parts[2])
+
+    elif command == "Remove":
+        parse_remove(parts, network)
+
+
+def parse_remove(parts: list[str], network: Network) -> None:
+    """
+    Execute a split Remove command.
+
+    Args:
+        parts: Words of the command line, starting with "Remove"
+        network: Network instance to update
+    """
+    if len(parts) == 3 and parts[1] == "Employee":
+        network.remove_employee(parts[2])
+    elif len(parts) == 5 and parts[1] == "Contact":
+        network.remove_contact(parts[2], parts[3], parts[4])
+    elif len(parts) > 1 and parts[1] in ("Employee", "Contact"):
+        raise ValueError("Invalid number of arguments")
+    else:
+        raise ValueError("Remove must be followed by Employee or Contact")
+
+
+def parse_trusted(lines: Iterator[str], network: Network,
+                  batch_size: int = TRUSTED_BATCH_SIZE) -> None:
+    """
+    Parse command lines from a trusted source in batches.
+
+    Lines are read batch_size at a time, which bounds the memory used while
+    the input streams past. A batch of only Contact lines, the bulk of an
+    export, is split as one string into columns for Network.add_contacts.
+    Otherwise runs of Partner, Company, Employee and Contact lines are
+    loaded with one Network.bulk_load call each. Any other line (Move,
+    Remove, or a line with the wrong number of arguments) ends the run and
+    goes through parse_command, so errors are raised in the same order and
+    with the same messages as parsing line by line.
+
+    Args:
+        lines: Input lines
+        network: Network instance to update
+        batch_size: Number of lines read and loaded at a time
+    """
+    lines = iter(lines)
+    while True:
+        chunk = list(itertools.islice(lines, batch_size))
+        if not chunk:
+            return
+        text = "\n".join(chunk)
+        if CONTACT_LINES.fullmatch(text):
+            words = text.split()
+            network.add_contacts(words[1::4], words[2::4], words[3::4])
+            continue
+
+        commands = [line.split() for line in chunk]
+        batch: list[list[str]] = []
+        start = 0
+        # Only lines other than well-formed contacts need a closer look
+        for index in [index for index, parts in enumerate(commands)
+                      if len(parts) != 4 or parts[0] != "Contact"]:
+            parts = commands[index]
+            command = parts[0] if parts else None
+            if (command in ("Partner", "Company") and len(parts) >= 2
+                    or command == "Employee" and len(parts) >= 3):
+                continue
+            # Empty lines and unknown commands are dropped, as parse_command
+            # ignores them; the rest run on their own
+            batch += commands[start:index]
+            start = index + 1
+            if command in ("Contact", "Partner", "Company", "Employee", "Move", "Remove"):
+                network.bulk_load(batch)
+                batch = []
+                parse_command(chunk[index], network)
+        batch += commands[start:]
+        network.bulk_load(batch)
+
+
+def parse_commands(buffer, network: Network, profiler: Optional[Profiler] = None) -> None:
+    """
+    Parse and execute every command in a bytes buffer.
+
+    Batch counterpart to parse_command for raw bytes, such as a memory-mapped
+    file. Lines are split as bytes without decoding, commands are dispatched
+    through a keyword table, and each distinct name is decoded to str only
+    the first time it is seen. Contact lines, which dominate real inputs,
+    are handled inline before the table lookup.
+
+    Args:
+        buffer: bytes-like object, or an object with a bytes readline()
+                method such as mmap.mmap
+        network: Network instance to update
+        profiler: Profiler to record reading, lines and commands in, if any
+    """
+    names: dict[bytes, str] = {}
+    get_name = names.get
+
+    def decode(raw: bytes) -> str:
+        name = names[raw] = raw.decode('utf-8')
+        return name
+
+    def partner(parts: list[bytes]) -> None:
+        network.add_partner(get_name(parts[1]) or decode(parts[1]))
+
+    def company(parts: list[bytes]) -> None:
+        network.add_company(get_name(parts[1]) or decode(parts[1]))
+
+    def employee(parts: list[bytes]) -> None:
+        network.add_employee(get_name(parts[1]) or decode(parts[1]),
+                             get_name(parts[2]) or decode(parts[2]))
+
+    def contact(parts: list[bytes]) -> None:
+        if len(parts) != 4:
+            raise ValueError("Invalid number of arguments")
+        add_contact(get_name(parts[1]) or decode(parts[1]),
+                    get_name(parts[2]) or decode(parts[2]),
+                    get_name(parts[3]) or decode(parts[3]))
+
+    def move(parts: list[bytes]) -> None:
+        if len(parts) != 3:
+            raise ValueError("Invalid number of arguments")
+        network.move_employee(get_name(parts[1]) or decode(parts[1]),
+                              get_name(parts[2]) or decode(parts[2]))
+
+    def remove(parts: list[bytes]) -> None:
+        parse_remove([get_name(part) or decode(part) for part in parts], network)
+
+    handlers = {
+        b"Partner": partner,
+        b"Company": company,
+        b"Employee": employee,
+        b"Contact": contact,
+        b"Move": move,
+        b"Remove": remove,
+    }
+    get_handler = handlers.get
+    add_contact = network.add_contact
+
+    if hasattr(buffer, 'readline'):
+        readline = buffer.readline
+    else:
+        readline = io.BytesIO(buffer).readline
+
+    lines = iter(readline, b"")
+    if profiler is not None:
+        lines = profiler.timed_lines(lines)
+    for line in lines:
+        parts = line.split()
+        if not parts:
+            continue
+        if len(parts) == 4 and parts[0] == b"Contact":
+            add_contact(get_name(parts[1]) or decode(parts[1]),
+                        get_name(parts[2]) or decode(parts[2]),
+                        get_name(parts[3]) or decode(parts[3]))
+            continue
+        handler = get_handler(parts[0])
+        if handler is not None:
+            handler(parts)
+
+
+def parse_file_mmap(path: str, network: Network, profiler: Optional[Profiler] = None) -> None:
+    """
+    Memory-map a command file and parse it with parse_commands.
+
+    Args:
+        path: Command file to parse
+        network: Network instance to update
+        profiler: Profiler to record reading, lines and commands in, if any
+    """
+    with open(path, 'rb') as f:
+        # mmap cannot map an empty file
+        if f.seek(0, io.SEEK_END) == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            parse_commands(buffer, network, profiler)
+
 
 def read_input(source) -> list[str]:
     """
@@ -65,31 +267,533 @@ def read_input(source) -> list[str]:
         # Read from stdin
         return sys.stdin.readlines()
     else:
-        # Read from file path
-        with open(source, 'r') as f:
+        # Read from file path, decompressing it if needed
+        with open_input(source) as f:
             return f.readlines()
 
 
-def main() -> None:
-    """Entry point for the CLI."""
-    
-    # Determine input source
-    if len(sys.argv) > 1:
-        input_source = sys.argv[1]
+def iter_input(source, chunk_size: int = BLOCK_SIZE,
+               queued_chunks: int = QUEUED_BLOCKS) -> Iterator[str]:
+    """
+    Stream input lines from file or stdin one at a time.
+
+    Unlike read_input, lines are yielded as they are read so the whole
+    input is never held in memory at once. Stdin is read ahead by a
+    background thread, so a slow upstream process and parsing overlap, and
+    is decompressed if it is compressed.
+
+    Args:
+        source: File path string or None for stdin
+        chunk_size: Bytes per chunk read ahead from stdin
+        queued_chunks: Chunks read ahead from stdin before reading waits
+
+    Yields:
+        str: Lines of input
+    """
+    if source is None:
+        buffer = getattr(sys.stdin, "buffer", None)
+        if buffer is None:
+            # stdin replaced by a text stream, e.g. a StringIO
+            yield from sys.stdin
+            return
+        with open_stream(buffer, 'r', chunk_size, queued_chunks, sys.stdin.encoding) as f:
+            yield from f
+    else:
+        # Stream from file path, decompressing it if needed
+        with open_input(source) as f:
+            yield from f
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
+    parser = argparse.ArgumentParser(
+        description="Analyze partner-company relationships."
+    )
+    parser.add_argument(
+        "input", nargs="*",
+        help="Command file or network snapshot to read (default: stdin); "
+             "several command files or glob patterns are parsed together, "
+             "declaration files first and Contact-only shards after",
+    )
+    parser.add_argument(
+        "--engine", choices=sorted(ENGINES), default="python",
+        help="Analysis engine (numpy requires numpy to be installed)",
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1,
+        help="Parse the input file with this many worker processes",
+    )
+    parser.add_argument(
+        "--fast", action="store_true",
+        help="Parse the input file through a memory map with the bytes-level parser",
+    )
+    parser.add_argument(
+        "--trusted", action="store_true",
+        help="Load pre-validated input in batches with Network.bulk_load, "
+             "validating each batch once instead of every command",
+    )
+    parser.add_argument(
+        "--read-chunk", type=int, default=BLOCK_SIZE >> 10, metavar="KIB",
+        help="Size of the chunks a background thread reads ahead from stdin "
+             "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--read-ahead", type=int, default=QUEUED_BLOCKS, metavar="N",
+        help="Chunks read ahead from stdin before the reader waits for the "
+             "parser (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--top", type=int, metavar="K",
+        help="List the K strongest partners for each company instead of only the leader",
+    )
+    parser.add_argument(
+        "--partner", metavar="NAME",
+        help="List the partner's rank and count at every company they have "
+             "contacts at, instead of the leader of each company",
+    )
+    parser.add_argument(
+        "--delta", metavar="SNAPSHOT",
+        help="Apply the input on top of a saved snapshot and print only the "
+             "leaders that were added, removed or changed, with old and new "
+             "counts (with a snapshot as input, compare the two snapshots)",
+    )
+    parser.add_argument(
+        "--approx", type=float, metavar="EPSILON",
+        help="Track per-company leaders approximately in fixed memory; counts "
+             "are off by at most EPSILON times the company's contacts",
+    )
+    parser.add_argument(
+        "--db", metavar="PATH",
+        help="Store the network in an SQLite database instead of memory "
+             "(created if missing, appended to if it exists)",
+    )
+    parser.add_argument(
+        "--serve", metavar="ADDRESS",
+        help="Keep the network in memory and serve writes and queries on "
+             "[host:]port or a Unix socket path",
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="Print per-stage timings and counters to stderr",
+    )
+    parser.add_argument(
+        "--stats-json", metavar="PATH",
+        help="Write per-stage timings and counters to a JSON file",
+    )
+    parser.add_argument(
+        "--cache-dir", metavar="DIR",
+        help="Cache results and network snapshots by input content in DIR, and "
+             "parse only the appended tail of a grown input "
+             "(default: $NETWORK_ANALYZER_CACHE_DIR, unset disables the cache)",
+    )
+    parser.add_argument(
+        "--cache-size", type=int, default=DEFAULT_MAX_BYTES >> 20, metavar="MIB",
+        help="Bound on the cache size; least recently used entries are removed first",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Bypass the result cache",
+    )
+    parser.add_argument(
+        "--checkpoint", metavar="PATH",
+        help="Periodically save the parse position and network to PATH while "
+             "reading the input file",
+    )
+    parser.add_argument(
+        "--checkpoint-every", type=int, metavar="LINES",
+        help="Lines parsed between checkpoints (default: 1000000)",
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="Continue from the --checkpoint file if it exists",
+    )
+    parser.add_argument(
+        "--quarantine", metavar="PATH",
+        help="Append lines that fail to PATH and keep going instead of stopping",
+    )
+    parser.add_argument(
+        "--save-snapshot", metavar="PATH",
+        help="Save the built network to a binary snapshot file",
+    )
+    parser.add_argument(
+        "-f", "--follow", action="store_true",
+        help="Keep reading commands appended to the input file and print updates",
+    )
+    parser.add_argument(
+        "--changed-only", action="store_true",
+        help="With --follow, print only companies whose leader changed",
+    )
+    parser.add_argument(
+        "--poll-interval", type=float, metavar="SECONDS",
+        help="With --follow, how often to check for new lines (default: 0.5)",
+    )
+    return parser
+
+
+def expand_inputs(patterns: list[str]) -> list[str]:
+    """
+    Expand glob patterns in input arguments.
+
+    Args:
+        patterns: Input paths and glob patterns, in command-line order
+
+    Returns:
+        list[str]: Paths in the given order, each pattern's matches sorted
+
+    Raises:
+        ValueError: If a pattern matches no files
+    """
+    paths = []
+    for pattern in patterns:
+        if not glob.has_magic(pattern):
+            paths.append(pattern)
+            continue
+        matches = sorted(glob.glob(pattern))
+        if not matches:
+            raise ValueError(f"No files match '{pattern}'")
+        paths.extend(matches)
+    return paths
+
+
+def load_network(args: argparse.Namespace, profiler: Optional[Profiler] = None,
+                 network: Optional[Network] = None) -> Network:
+    """
+    Build the network described by the parsed command-line arguments.
+
+    Args:
+        args: Parsed arguments from build_parser
+        profiler: Profiler to record input reading in, if any
+        network: Network to apply input commands to, instead of a new one;
+                 unused when the input is a snapshot
+
+    Returns:
+        Network: The loaded network
+    """
+    if args.input is not None and is_snapshot(args.input):
+        return Network.load_snapshot(args.input)
+
+    if args.checkpoint is not None or args.quarantine is not None:
+        return ingest_input(args)
+
+    if network is None:
+        network = Network()
+    if len(args.inputs) > 1:
+        # Imported here because src.parallel itself imports parse_command
+        from src.parallel import parse_files_parallel
+        parse_files_parallel(args.inputs, network, args.jobs, profiler)
+    elif args.jobs > 1:
+        # Imported here because src.parallel itself imports parse_command
+        from src.parallel import parse_file_parallel
+        parse_file_parallel(args.input, network, args.jobs, profiler)
+    elif args.fast:
+        parse_file_mmap(args.input, network, profiler)
+    elif args.trusted:
+        lines = iter_input(args.input, args.read_chunk << 10, args.read_ahead)
+        if profiler is not None:
+            lines = profiler.timed_lines(lines)
+        parse_trusted(lines, network)
     else:
-        input_source = None
+        # Build network by parsing lines as they are read
+        lines = iter_input(args.input, args.read_chunk << 10, args.read_ahead)
+        if profiler is not None:
+            lines = profiler.timed_lines(lines)
+        for line in lines:
+            parse_command(line, network)
+    return network
 
-    # Read input
-    lines = read_input(input_source)
 
-    # Build network by parsing lines in the input
+def ingest_input(args: argparse.Namespace) -> Network:
+    """
+    Build the network with checkpoints and/or a quarantine file.
+
+    Args:
+        args: Parsed arguments with checkpoint or quarantine set
+
+    Returns:
+        Network: The loaded network
+    """
+    # Imported here because src.checkpoint itself imports parse_command
+    from src.checkpoint import CHECKPOINT_EVERY, Checkpointer, ingest
+
     network = Network()
-    for line in lines:
-        parse_command(line, network)
+    offset = line_number = 0
+    checkpointer = None
+    if args.checkpoint is not None:
+        checkpointer = Checkpointer(args.checkpoint, args.input,
+                                    args.checkpoint_every or CHECKPOINT_EVERY)
+        restored = checkpointer.load() if args.resume else None
+        if restored is not None:
+            network, offset, line_number = restored
+            print(f"Resuming from line {line_number + 1}", file=sys.stderr)
+
+    quarantine = open(args.quarantine, 'a') if args.quarantine is not None else None
+    try:
+        if args.input is None:
+            with open_stream(sys.stdin.buffer, 'rb', args.read_chunk << 10,
+                             args.read_ahead) as f:
+                quarantined = ingest(f, network, quarantine=quarantine)
+        else:
+            with open_input(args.input, 'rb') as f:
+                if offset:
+                    f.seek(offset)
+                quarantined = ingest(f, network, offset, line_number, checkpointer, quarantine)
+    finally:
+        if quarantine is not None:
+            quarantine.close()
+
+    if quarantined:
+        print(f"{quarantined} bad lines written to {args.quarantine}", file=sys.stderr)
+    if checkpointer is not None:
+        checkpointer.clear()
+    return network
+
+
+def resume_network(path: str, snapshot_path: str, offset: int,
+                   profiler: Optional[Profiler] = None) -> Network:
+    """
+    Restore a network from a snapshot and apply the rest of its input file.
+
+    Args:
+        path: Input command file
+        snapshot_path: Snapshot of the network built from the first offset bytes
+        offset: Byte offset of the first line not in the snapshot
+        profiler: Profiler to record input reading in, if any
+
+    Returns:
+        Network: The network for the whole input
+    """
+    network = Network.load_snapshot(snapshot_path)
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        lines = io.TextIOWrapper(f)
+        if profiler is not None:
+            lines = profiler.timed_lines(lines)
+        for line in lines:
+            parse_command(line, network)
+    return network
+
+
+def main(argv=None) -> None:
+    """Entry point for the CLI.
+
+    Args:
+        argv: Argument list, defaults to sys.argv[1:]
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        args.inputs = expand_inputs(args.input)
+    except ValueError as e:
+        parser.error(str(e))
+    args.input = args.inputs[0] if len(args.inputs) == 1 else None
+    if len(args.inputs) > 1:
+        if any(is_snapshot(path) for path in args.inputs):
+            parser.error("a network snapshot must be the only input")
+        if (args.fast or args.approx is not None or args.db is not None or args.follow
+                or args.checkpoint is not None or args.quarantine is not None):
+            parser.error("multiple inputs cannot be combined with --fast, --approx, --db, "
+                         "--follow, --checkpoint or --quarantine")
+    compressed = (args.input is not None and os.path.isfile(args.input)
+                  and detect_compression(args.input) is not None)
+    # Compressed streams cannot seek to byte offsets of the input
+    if compressed and (args.jobs > 1 or args.fast or args.follow or args.checkpoint is not None):
+        parser.error("--jobs, --fast, --follow and --checkpoint require an "
+                     "uncompressed input file")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.trusted and (
+            len(args.inputs) > 1 or args.jobs > 1 or args.fast or args.approx is not None
+            or args.db is not None or args.follow or args.checkpoint is not None
+            or args.quarantine is not None):
+        parser.error("--trusted needs a single input and cannot be combined with --jobs, "
+                     "--fast, --approx, --db, --follow, --checkpoint or --quarantine")
+    if args.read_chunk < 1 or args.read_ahead < 1:
+        parser.error("--read-chunk and --read-ahead must be at least 1")
+    if args.jobs > 1 and not args.inputs:
+        parser.error("--jobs requires an input file")
+    if args.fast and args.input is None:
+        parser.error("--fast requires an input file")
+    if args.fast and args.jobs > 1:
+        parser.error("--fast cannot be combined with --jobs")
+    if args.top is not None and args.top < 1:
+        parser.error("--top must be at least 1")
+    if args.partner is not None and args.top is not None:
+        parser.error("--partner cannot be combined with --top")
+    if args.delta is not None and (
+            args.top is not None or args.partner is not None or args.approx is not None
+            or args.db is not None or args.serve is not None or args.follow
+            or args.checkpoint is not None or args.quarantine is not None):
+        parser.error("--delta cannot be combined with --top, --partner, --approx, --db, "
+                     "--serve, --follow, --checkpoint or --quarantine")
+    if args.checkpoint is not None:
+        if args.input is None or is_snapshot(args.input):
+            parser.error("--checkpoint requires an input command file")
+        if args.checkpoint_every is not None and args.checkpoint_every < 1:
+            parser.error("--checkpoint-every must be at least 1")
+    if (args.changed_only or args.poll_interval is not None) and not args.follow:
+        parser.error("--changed-only and --poll-interval require --follow")
+    if args.resume and args.checkpoint is None:
+        parser.error("--resume requires --checkpoint")
+    if args.checkpoint_every is not None and args.checkpoint is None:
+        parser.error("--checkpoint-every requires --checkpoint")
+    if (args.checkpoint is not None or args.quarantine is not None) and (
+            args.jobs > 1 or args.fast or args.approx is not None or args.db is not None
+            or args.follow):
+        parser.error("--checkpoint and --quarantine cannot be combined with --jobs, --fast, "
+                     "--approx, --db or --follow")
+    # The server answers its own queries, so options that shape the one-off
+    # output, and the other long-running or out-of-memory modes, do not apply
+    if args.serve is not None and (
+            args.top is not None or args.partner is not None or args.engine != "python"
+            or args.save_snapshot or args.profile or args.stats_json is not None
+            or args.cache_dir is not None or args.db is not None or args.follow
+            or args.checkpoint is not None or args.quarantine is not None):
+        parser.error("--serve cannot be combined with --top, --partner, --engine, "
+                     "--save-snapshot, --profile, --stats-json, --cache-dir, --db, "
+                     "--follow, --checkpoint or --quarantine")
+    if args.approx is not None:
+        if not 0 < args.approx <= 1:
+            parser.error("--approx must be greater than 0 and at most 1")
+        if (args.jobs > 1 or args.fast or args.top is not None or args.engine != "python"
+                or args.db is not None or args.serve is not None or args.save_snapshot
+                or args.follow or args.partner is not None or args.profile
+                or args.stats_json is not None):
+            parser.error("--approx cannot be combined with --jobs, --fast, --top, --engine, "
+                         "--db, --serve, --save-snapshot, --follow, --partner, --profile "
+                         "or --stats-json")
+        if args.input is not None and is_snapshot(args.input):
+            parser.error("--approx requires an input command file")
+        from src.approx import ApproxNetwork, analyze_approx
+
+        network = ApproxNetwork(args.approx)
+        for line in iter_input(args.input, args.read_chunk << 10, args.read_ahead):
+            parse_command(line, network)
+        print(analyze_approx(network))
+        return
+
+    if args.follow:
+        if args.input is None or is_snapshot(args.input):
+            parser.error("--follow requires an input command file")
+        if (args.jobs > 1 or args.fast or args.top is not None or args.partner is not None
+                or args.save_snapshot or args.profile or args.stats_json is not None
+                or args.cache_dir is not None):
+            parser.error("--follow cannot be combined with --jobs, --fast, --top, --partner, "
+                         "--save-snapshot, --profile, --stats-json or --cache-dir")
+        if args.poll_interval is not None and args.poll_interval <= 0:
+            parser.error("--poll-interval must be greater than 0")
+
+        # Imported here because src.follow itself imports parse_command
+        from src.follow import POLL_INTERVAL, follow
+        poll_interval = args.poll_interval if args.poll_interval is not None else POLL_INTERVAL
+        try:
+            follow(args.input, Network(), changed_only=args.changed_only,
+                   poll_interval=poll_interval, analyze=ENGINES[args.engine])
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if args.db is not None:
+        if (args.jobs > 1 or args.fast or args.top is not None or args.engine != "python"
+                or args.partner is not None or args.save_snapshot or args.profile
+                or args.stats_json is not None or args.serve is not None
+                or args.cache_dir is not None):
+            parser.error("--db cannot be combined with --jobs, --fast, --top, --engine, "
+                         "--partner, --save-snapshot, --profile, --stats-json, --serve "
+                         "or --cache-dir")
+        if args.input is not None and is_snapshot(args.input):
+            parser.error("--db requires an input command file")
+        from src.sqlite_backend import SqliteNetwork, analyze_sqlite
+
+        network = SqliteNetwork(args.db)
+        try:
+            # One transaction, so a failing line leaves the database unchanged
+            with network.transaction():
+                for line in iter_input(args.input, args.read_chunk << 10, args.read_ahead):
+                    parse_command(line, network)
+            print(analyze_sqlite(network))
+        finally:
+            network.close()
+        return
+
+    if args.serve is not None:
+        # Imported here because src.server itself imports parse_command
+        import asyncio
+        from src.server import serve
+
+        # Without an input file the server starts from an empty network
+        network = load_network(args) if args.inputs else Network()
+        try:
+            asyncio.run(serve(network, args.serve))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    profiler = Profiler(enabled=args.profile or args.stats_json is not None)
+    cache = lookup = None
+    if args.partner is not None:
+        variant = f"partner={args.partner}"
+    elif args.top is not None:
+        variant = f"top={args.top}"
+    else:
+        variant = "leaders"
+    # Checkpointed and quarantined runs are not cached: a cached result or
+    # prefix replay would bypass the quarantine and hide invalid input
+    cache_dir = args.cache_dir or os.environ.get("NETWORK_ANALYZER_CACHE_DIR")
+    if (cache_dir and not args.no_cache and args.delta is None and not compressed
+            and args.checkpoint is None and args.quarantine is None
+            and args.input is not None and not is_snapshot(args.input)):
+        cache = ResultCache(cache_dir, args.cache_size << 20)
+        with profiler.stage("cache_lookup"):
+            lookup = cache.lookup(args.input, variant)
+
+    network = None
+    result = lookup.output if lookup is not None and not args.save_snapshot else None
+    if result is None:
+        with profiler.stage("parse", exclude="read_input"):
+            if lookup is not None and lookup.snapshot is not None:
+                # Cached state for this input or a prefix of it
+                network = resume_network(args.input, lookup.snapshot, lookup.offset, profiler)
+            elif args.delta is not None:
+                prior = Network.load_snapshot(args.delta)
+                before = dict(prior.leaders)
+                prior.pop_changed_companies()
+                network = load_network(args, profiler, prior)
+                if network is prior:
+                    # Only companies whose leader moved during ingestion can differ
+                    changed = network.pop_changed_companies()
+                else:
+                    changed = set(before) | set(network.leaders)
+            else:
+                network = load_network(args, profiler)
+        if args.save_snapshot:
+            with profiler.stage("save_snapshot"):
+                network.save_snapshot(args.save_snapshot)
+
+        # Analyze and print results
+        with profiler.stage("analyze"):
+            if args.delta is not None:
+                result = format_delta(sorted(changed), before, network.leaders)
+            elif args.partner is not None:
+                result = analyze_partner(network, args.partner)
+            elif args.top is not None:
+                result = analyze_top_partners(network, args.top)
+            else:
+                result = ENGINES[args.engine](network)
+    with profiler.stage("output"):
+        # No changes in delta mode means no output at all, not a blank line
+        if result or args.delta is None:
+            print(result)
+    if cache is not None and network is not None:
+        with profiler.stage("cache_store"):
+            cache.store(lookup, network, variant, result)
 
-    # Analyze and print results
-    result = analyze_network(network)
-    print(result)
+    if profiler.enabled:
+        if network is not None:
+            profiler.record_network(network)
+        if args.profile:
+            print(profiler.format_report(), file=sys.stderr)
+        if args.stats_json is not None:
+            profiler.write_json(args.stats_json)
 
 
 if __name__ == "__main__":
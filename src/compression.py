@@ -0,0 +1,119 @@
+"""Transparent decompression of gzip, bzip2 and xz command files.
+
+Compressed files are recognised by their magic bytes rather than their
+names, and compressed stdin by peeking at its first bytes. A
+pipeline.BlockReader thread decompresses the input in fixed-size blocks and
+hands them to the reading thread through a bounded queue, so decompression
+(which releases the GIL) and parsing run on separate cores.
+
+Compressed streams cannot seek, so options that work on byte offsets of the
+input (--jobs chunking, --fast, --follow, --checkpoint and cache resume)
+need an uncompressed file.
+"""
+import bz2
+import gzip
+import io
+import lzma
+from typing import BinaryIO, Callable, Optional, Union
+
+from src.pipeline import BLOCK_SIZE, QUEUED_BLOCKS, BlockReader, open_pipelined
+
+# Leading bytes of each supported format
+MAGIC = {
+    b"\x1f\x8b": "gzip",
+    b"BZh": "bz2",
+    b"\xfd7zXZ\x00": "xz",
+}
+MAGIC_SIZE = max(len(magic) for magic in MAGIC)
+
+OPENERS: dict[str, Callable[..., BinaryIO]] = {
+    "gzip": gzip.open,
+    "bz2": bz2.open,
+    "xz": lzma.open,
+}
+
+
+def detect_compression(path: str) -> Optional[str]:
+    """
+    Detect whether a file is compressed from its magic bytes.
+
+    Args:
+        path: File to check
+
+    Returns:
+        Optional[str]: "gzip", "bz2" or "xz", or None for anything else
+    """
+    with open(path, 'rb') as f:
+        return _match_magic(f.read(MAGIC_SIZE))
+
+
+def detect_stream_compression(stream: BinaryIO) -> Optional[str]:
+    """
+    Detect whether a stream is compressed from its magic bytes, without consuming them.
+
+    Args:
+        stream: Buffered binary stream with peek, such as sys.stdin.buffer
+
+    Returns:
+        Optional[str]: "gzip", "bz2" or "xz", or None for anything else
+    """
+    # peek makes at most one read, which on a pipe returns the first bytes
+    # written and so holds the whole magic in practice
+    return _match_magic(stream.peek(MAGIC_SIZE)[:MAGIC_SIZE])
+
+
+def _match_magic(head: bytes) -> Optional[str]:
+    """Get the format whose magic bytes start head, if any."""
+    for magic, compression in MAGIC.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def open_input(path: str, mode: str = 'r') -> Union[BinaryIO, io.TextIOWrapper]:
+    """
+    Open a command file for reading, decompressing it if it is compressed.
+
+    Args:
+        path: File to open
+        mode: 'r' for text or 'rb' for bytes
+
+    Returns:
+        The open file; compressed files are not seekable
+    """
+    compression = detect_compression(path)
+    if compression is None:
+        return open(path, mode)
+
+    raw = BlockReader(lambda: OPENERS[compression](path, 'rb'))
+    stream = io.BufferedReader(raw, BLOCK_SIZE)
+    return stream if 'b' in mode else io.TextIOWrapper(stream)
+
+
+def open_stream(stream: BinaryIO, mode: str = 'r', block_size: int = BLOCK_SIZE,
+                queued_blocks: int = QUEUED_BLOCKS,
+                encoding: Optional[str] = None) -> Union[BinaryIO, io.TextIOWrapper]:
+    """
+    Read a stream such as stdin ahead in a background thread, decompressing it if needed.
+
+    Streams without peek are read as they are. Closing the returned file
+    stops the thread but leaves the stream open.
+
+    Args:
+        stream: Binary stream to read, such as sys.stdin.buffer
+        mode: 'r' for text or 'rb' for bytes
+        block_size: Bytes per chunk
+        queued_blocks: Chunks to read ahead of the consumer
+        encoding: Text encoding, defaulting to the locale's
+
+    Returns:
+        The read-ahead file
+    """
+    compression = detect_stream_compression(stream) if hasattr(stream, "peek") else None
+    if compression is None:
+        return open_pipelined(stream, mode, block_size, queued_blocks, encoding)
+
+    # The decompressors leave a stream they were given open when closed
+    raw = BlockReader(lambda: OPENERS[compression](stream, 'rb'), block_size, queued_blocks)
+    buffered = io.BufferedReader(raw, block_size)
+    return buffered if 'b' in mode else io.TextIOWrapper(buffered, encoding)
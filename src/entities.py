@@ -1,4 +1,15 @@
 """Domain entities for the network analyzer."""
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
+
+# Valid contact types; a contact's type is stored as its index in this tuple
+CONTACT_TYPES = ('email', 'call', 'coffee', 'pitch')
+CONTACT_TYPE_IDS = {name: type_id for type_id, name in enumerate(CONTACT_TYPES)}
+
+# Largest multiplicity one ContactStore row can hold (the uint32 maximum)
+MAX_ROW_COUNT = 2**32 - 1
 
 
 class Partner:
@@ -67,6 +78,261 @@ class Contact:
         return f"Contact('{self.employee_name}', '{self.partner_name}', '{self.contact_type}')"
 
 
+class ContactStore:
+    """Columnar storage for contacts.
+
+    Employee and partner names are interned to small integer IDs in a shared
+    string table, and contacts are stored as rows of compact typed arrays
+    instead of as Contact objects. Each row is a run of identical contacts:
+    an (employee, partner, type) triple and how many times it was recorded
+    in a row, so repetitive inputs take one row per run rather than one per
+    contact. Order is preserved, and indexing and iterating the store still
+    yield one Contact object per contact, built on demand.
+
+    Removals are recorded and applied lazily: identical contacts are
+    interchangeable, so removing one only needs to remember how many rows of
+    that (employee, partner, type) to drop. The rows are dropped in one pass
+    by compact(), which every read of the columns calls first.
+    """
+
+    def __init__(self):
+        """Initialize an empty store."""
+        # String table: names[id] -> name, and the reverse lookup
+        self.names: list[str] = []
+        self.name_ids: dict[str, int] = {}
+
+        # One entry per run of identical contacts in each column
+        self.employee_ids = array('i')
+        self.partner_ids = array('i')
+        self.type_ids = array('B')
+        self.counts = array('I')
+        # Total of counts, and the running totals used to find the row of a
+        # contact index (rebuilt when they no longer add up to the total)
+        self.num_contacts = 0
+        self._row_ends: Optional[list[int]] = None
+        # Triple of the last row, which the next identical contact extends
+        self._last_key: Optional[tuple[int, int, int]] = None
+
+        # Removals not yet applied to the columns: rows to drop per
+        # (employee_id, partner_id, type_id), employees whose rows all go,
+        # and the total number of rows those cover
+        self.pending_removals: dict[tuple[int, int, int], int] = {}
+        self.removed_employee_ids: set[int] = set()
+        self.num_removed = 0
+
+    def intern(self, name: str) -> int:
+        """Get the ID for a name, adding it to the string table if new.
+
+        Args:
+            name: Employee or partner name
+
+        Returns:
+            int: ID of the name
+        """
+        name_id = self.name_ids.get(name)
+        if name_id is None:
+            name_id = len(self.names)
+            self.names.append(name)
+            self.name_ids[name] = name_id
+        return name_id
+
+    def append(self, employee_name: str, partner_name: str, contact_type: str,
+               count: int = 1) -> None:
+        """Store a contact.
+
+        Args:
+            employee_name: Name of the employee
+            partner_name: Name of the partner
+            contact_type: Lowercase contact type, one of CONTACT_TYPES
+            count: Number of identical contacts to store
+        """
+        name_ids = self.name_ids
+        employee_id = name_ids.get(employee_name)
+        if employee_id is None:
+            employee_id = self.intern(employee_name)
+        partner_id = name_ids.get(partner_name)
+        if partner_id is None:
+            partner_id = self.intern(partner_name)
+        type_id = CONTACT_TYPE_IDS[contact_type]
+        if self.removed_employee_ids and employee_id in self.removed_employee_ids:
+            # A removed employee's name was reused; drop the old rows first so
+            # the new ones are kept
+            self.compact()
+        self.num_contacts += count
+
+        key = (employee_id, partner_id, type_id)
+        if key == self._last_key:
+            counts = self.counts
+            if counts[-1] + count <= MAX_ROW_COUNT:
+                # Same as the previous contact: extend its run
+                counts[-1] += count
+                return
+        self._last_key = key
+        while count > MAX_ROW_COUNT:
+            self.employee_ids.append(employee_id)
+            self.partner_ids.append(partner_id)
+            self.type_ids.append(type_id)
+            self.counts.append(MAX_ROW_COUNT)
+            count -= MAX_ROW_COUNT
+        self.employee_ids.append(employee_id)
+        self.partner_ids.append(partner_id)
+        self.type_ids.append(type_id)
+        self.counts.append(count)
+
+    def extend(self, employee_names: Sequence[str], partner_names: Sequence[str],
+               type_ids: Sequence[int]) -> None:
+        """Store many contacts at once, one row each.
+
+        Identical contacts in a row are not merged into runs, so this suits
+        inputs with few repeated contacts in a row.
+
+        Args:
+            employee_names: Name of the employee of each contact
+            partner_names: Name of the partner of each contact, in the same order
+            type_ids: Index in CONTACT_TYPES of each contact's type, in the same order
+        """
+        if not type_ids:
+            return
+        if self.removed_employee_ids:
+            # Names of removed employees may be reused by the new contacts
+            self.compact()
+        name_ids = self.name_ids
+        for name in set(employee_names).union(partner_names).difference(name_ids):
+            self.intern(name)
+        self.employee_ids.extend(array('i', map(name_ids.__getitem__, employee_names)))
+        self.partner_ids.extend(array('i', map(name_ids.__getitem__, partner_names)))
+        self.type_ids.extend(array('B', type_ids))
+        self.counts.extend(array('I', [1]) * len(type_ids))
+        self.num_contacts += len(type_ids)
+        self._last_key = (self.employee_ids[-1], self.partner_ids[-1], self.type_ids[-1])
+
+    def remove(self, employee_name: str, partner_name: str, contact_type: str,
+               count: int = 1) -> None:
+        """Remove stored contacts.
+
+        The caller must make sure that many matching contacts exist.
+
+        Args:
+            employee_name: Name of the employee
+            partner_name: Name of the partner
+            contact_type: Lowercase contact type, one of CONTACT_TYPES
+            count: Number of identical contacts to remove
+        """
+        key = (self.name_ids[employee_name], self.name_ids[partner_name],
+               CONTACT_TYPES.index(contact_type))
+        self.pending_removals[key] = self.pending_removals.get(key, 0) + count
+        self.num_removed += count
+
+    def remove_employee(self, employee_name: str, num_contacts: int) -> None:
+        """Remove every stored contact of an employee.
+
+        Args:
+            employee_name: Name of the employee
+            num_contacts: Number of the employee's contacts still stored
+        """
+        employee_id = self.name_ids.get(employee_name)
+        if employee_id is None or not num_contacts:
+            # Nothing stored, or every row is already pending removal
+            return
+        # Rows already pending removal are covered by the employee's removal
+        for key in [key for key in self.pending_removals if key[0] == employee_id]:
+            del self.pending_removals[key]
+        self.removed_employee_ids.add(employee_id)
+        self.num_removed += num_contacts
+
+    def compact(self) -> None:
+        """Drop removed contacts from the columns."""
+        if not self.num_removed:
+            return
+        remaining = self.pending_removals
+        removed_employees = self.removed_employee_ids
+        employee_ids = array('i')
+        partner_ids = array('i')
+        type_ids = array('B')
+        counts = array('I')
+        for e, p, t, n in zip(self.employee_ids, self.partner_ids, self.type_ids, self.counts):
+            if e in removed_employees:
+                continue
+            if remaining:
+                key = (e, p, t)
+                left = remaining.get(key)
+                if left:
+                    taken = min(left, n)
+                    if taken == left:
+                        del remaining[key]
+                    else:
+                        remaining[key] = left - taken
+                    n -= taken
+                    if not n:
+                        continue
+            if counts and employee_ids[-1] == e and partner_ids[-1] == p and type_ids[-1] == t \
+                    and counts[-1] + n <= MAX_ROW_COUNT:
+                # Removing the rows between two runs joined them
+                counts[-1] += n
+                continue
+            employee_ids.append(e)
+            partner_ids.append(p)
+            type_ids.append(t)
+            counts.append(n)
+        self.employee_ids = employee_ids
+        self.partner_ids = partner_ids
+        self.type_ids = type_ids
+        self.counts = counts
+        self.num_contacts -= self.num_removed
+        self._row_ends = None
+        self._last_key = (employee_ids[-1], partner_ids[-1], type_ids[-1]) if counts else None
+        self.pending_removals = {}
+        self.removed_employee_ids = set()
+        self.num_removed = 0
+
+    def rows(self) -> Iterator[tuple[str, str, str, int]]:
+        """Iterate over runs of identical contacts.
+
+        Yields:
+            tuple: (employee_name, partner_name, contact_type, count)
+        """
+        self.compact()
+        names = self.names
+        for e, p, t, n in zip(self.employee_ids, self.partner_ids, self.type_ids, self.counts):
+            yield names[e], names[p], CONTACT_TYPES[t], n
+
+    def _contact(self, row: int) -> Contact:
+        """Build a Contact object for the run at row."""
+        names = self.names
+        return Contact(names[self.employee_ids[row]],
+                       names[self.partner_ids[row]],
+                       CONTACT_TYPES[self.type_ids[row]])
+
+    def _row(self, index: int) -> int:
+        """Find the row holding the contact at index."""
+        ends = self._row_ends
+        if ends is None or (ends[-1] if ends else 0) != self.num_contacts:
+            self._row_ends = list(accumulate(self.counts))
+        return bisect_right(self._row_ends, index)
+
+    def __len__(self) -> int:
+        return self.num_contacts - self.num_removed
+
+    def __getitem__(self, index):
+        self.compact()
+        if isinstance(index, slice):
+            return [self._contact(self._row(i)) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("contact index out of range")
+        return self._contact(self._row(index))
+
+    def __iter__(self) -> Iterator[Contact]:
+        self.compact()
+        for row, count in enumerate(self.counts):
+            for _ in range(count):
+                yield self._contact(row)
+
+    def __repr__(self):
+        return f"ContactStore({len(self)} contacts)"
+
+
 class Network:
     """Central data structure managing all entities and relationships."""
 
@@ -75,7 +341,29 @@ class Network:
         self.partners: dict[str, Partner] = {}
         self.companies: dict[str, Company] = {}
         self.employees: dict[str, Employee] = {}
-        self.contacts: list[Contact] = []
+        self.contacts = ContactStore()
+
+        # Running contact counts, kept up to date by add_contact so analysis
+        # never has to rescan the contact list:
+        # {company_name: {partner_name: contact_count}}
+        self.company_partner_counts: dict[str, dict[str, int]] = {}
+        # Current strongest partner per company: {company_name: (partner_name, count)}
+        self.leaders: dict[str, tuple[str, int]] = {}
+        # Companies added or whose leader changed since pop_changed_companies
+        self.changed_companies: set[str] = set()
+        # Reverse index for partner queries, built from the counters the first
+        # time one is made and kept up to date after: companies each partner
+        # has contacts at, and the companies each partner leads
+        self.partner_companies: Optional[dict[str, set[str]]] = None
+        self.partner_leads: Optional[dict[str, set[str]]] = None
+        # Per-employee contact index for Move and Remove, built from the
+        # contact store the first time one is used and kept up to date after:
+        # {employee_name: {(partner_name, contact_type): count}}
+        self.employee_contacts: Optional[dict[str, dict[tuple[str, str], int]]] = None
+        # Bumped by every mutation, so results computed from the network can
+        # be reused until it changes: {key: (version, result)}
+        self.version = 0
+        self.results: dict[str, tuple[int, Any]] = {}
 
     def add_partner(self, name: str) -> None:
         """Add a partner to the network.
@@ -88,6 +376,7 @@ class Network:
 
         partner = Partner(name)
         self.partners[name] = partner
+        self.version += 1
 
     def add_company(self, name: str) -> None:
         """Add a company to the network.
@@ -100,6 +389,8 @@ class Network:
         
         company = Company(name)
         self.companies[name] = company
+        self.changed_companies.add(name)
+        self.version += 1
 
     def add_employee(self, name: str, company_name: str) -> None:
         """Add an employee to the network.
@@ -115,31 +406,508 @@ class Network:
 
         employee = Employee(name, company_name)
         self.employees[name] = employee
+        self.version += 1
 
-    def add_contact(self, employee_name: str, partner_name: str, contact_type: str) -> None:
+    def add_contact(self, employee_name: str, partner_name: str, contact_type: str,
+                    count: int = 1) -> None:
         """Record a contact between an employee and a partner.
 
         Args:
             employee_name: Name of the employee
             partner_name: Name of the partner
             contact_type: Type of contact (email, call, coffee)
+            count: Number of identical contacts to record at once
         """
         if employee_name not in self.employees:
             raise ValueError(f"Employee '{employee_name}' does not exist")
         if partner_name not in self.partners:
             raise ValueError(f"Partner '{partner_name}' does not exist")
 
-        valid_types = {'email', 'call', 'coffee', 'pitch'}
-        if contact_type.lower() not in valid_types:
+        lowered = contact_type.lower()
+        if lowered not in CONTACT_TYPES:
             raise ValueError(f"Invalid contact type '{contact_type}'. Must be email, call, coffee, or pitch")
 
-        contact = Contact(employee_name, partner_name, contact_type.lower())
-        self.contacts.append(contact)
+        self._insert_contact(employee_name, partner_name, lowered, count)
+
+    def _insert_contact(self, employee_name: str, partner_name: str, contact_type: str,
+                        count: int) -> None:
+        """Store and count a validated contact.
+
+        Args:
+            employee_name: Name of an existing employee
+            partner_name: Name of an existing partner
+            contact_type: Lowercase contact type, one of CONTACT_TYPES
+            count: Number of identical contacts to record
+        """
+        self.contacts.append(employee_name, partner_name, contact_type, count)
+        self._count_contact(self.employees[employee_name].company_name, partner_name, count)
+        if self.employee_contacts is not None:
+            contacts = self.employee_contacts.setdefault(employee_name, {})
+            key = (partner_name, contact_type)
+            contacts[key] = contacts.get(key, 0) + count
+        self.version += 1
+
+    def bulk_load(self, commands: Iterable[Sequence[str]]) -> None:
+        """Add a batch of Partner, Company, Employee and Contact commands.
+
+        Meant for trusted input such as exports of a valid network. Commands
+        are collected without the per-command checks of the add_* methods and
+        the whole batch is validated with set operations over its distinct
+        names before anything is stored; contacts are then stored and counted
+        in one pass, as by add_contacts. If the batch is invalid, the error of
+        its first invalid command is raised with the message add_* would give,
+        and the network is left unchanged.
+
+        The counters, leaders and contacts are the same as adding the
+        commands one at a time, except that repeated contacts in a row are
+        stored as one row each rather than as one run.
+
+        The batch is held in memory, so large inputs should be loaded in
+        several batches.
+
+        Args:
+            commands: Split commands, e.g. ("Contact", "Dave", "Alice", "email").
+                      Partner and Company need a name, Employee a name and
+                      company, and Contact exactly three arguments; other
+                      commands are ignored
+        """
+        commands = list(commands)
+        contacts = [command for command in commands if command[0] == "Contact"]
+        declarations = ([(position, command) for position, command in enumerate(commands)
+                         if command[0] != "Contact"]
+                        if len(contacts) < len(commands) else [])
+
+        # Position of each name's first declaration in the batch, so a use
+        # can be checked against declarations that come before it
+        partners: dict[str, int] = {}
+        companies: dict[str, int] = {}
+        employees: dict[str, tuple[str, int]] = {}
+        # Errors found so far as (position, check order, message); the
+        # smallest is the one sequential loading would stop at
+        errors: list[tuple[int, int, str]] = []
+
+        for position, command in declarations:
+            kind = command[0]
+            if kind == "Employee":
+                name = command[1]
+                if name in employees:
+                    errors.append((position, 0, f"Employee '{name}' already exists"))
+                else:
+                    employees[name] = (command[2], position)
+            elif kind == "Partner":
+                name = command[1]
+                if name in partners:
+                    errors.append((position, 0, f"Partner '{name}' already exists"))
+                else:
+                    partners[name] = position
+            elif kind == "Company":
+                name = command[1]
+                if name in companies:
+                    errors.append((position, 0, f"Company '{name}' already exists"))
+                else:
+                    companies[name] = position
+
+        for name in partners.keys() & self.partners.keys():
+            errors.append((partners[name], 0, f"Partner '{name}' already exists"))
+        for name in companies.keys() & self.companies.keys():
+            errors.append((companies[name], 0, f"Company '{name}' already exists"))
+        for name in employees.keys() & self.employees.keys():
+            errors.append((employees[name][1], 0, f"Employee '{name}' already exists"))
+        for name, (company_name, position) in employees.items():
+            if company_name not in self.companies and companies.get(company_name, position) >= position:
+                errors.append((position, 1, f"Company '{company_name}' does not exist"))
+
+        employee_names = [command[1] for command in contacts]
+        partner_names = [command[2] for command in contacts]
+        contact_types = [command[3] for command in contacts]
+        # Usual case for exports: every declaration comes before the first
+        # contact, so contacts only need their names to be declared at all
+        ordered = (not contacts or not declarations
+                   or declarations[-1][0] < commands.index(contacts[0]))
+        if (errors or not ordered
+                or set(employee_names).difference(self.employees).difference(employees)
+                or set(partner_names).difference(self.partners).difference(partners)
+                or not {name.lower() for name in set(contact_types)} <= set(CONTACT_TYPES)):
+            self._check_batch_contacts(commands, partners, employees, errors)
+        if errors:
+            raise ValueError(min(errors)[2])
+
+        for name in partners:
+            self.partners[name] = Partner(name)
+        for name in companies:
+            self.companies[name] = Company(name)
+        self.changed_companies.update(companies)
+        for name, (company_name, _) in employees.items():
+            self.employees[name] = Employee(name, company_name)
+        self._store_contacts(employee_names, partner_names, contact_types)
+        self.version += 1
+
+    def add_contacts(self, employee_names: Sequence[str], partner_names: Sequence[str],
+                     contact_types: Sequence[str]) -> None:
+        """Record many contacts at once.
+
+        Bulk counterpart to add_contact: the contacts are validated together
+        with set operations over their distinct names, then stored and
+        counted in one pass. If any is invalid, the error add_contact would
+        raise for the first invalid one is raised and the network is left
+        unchanged.
+
+        Args:
+            employee_names: Name of the employee of each contact
+            partner_names: Name of the partner of each contact, in the same order
+            contact_types: Type of each contact, in the same order
+        """
+        if (set(employee_names).difference(self.employees)
+                or set(partner_names).difference(self.partners)
+                or not {name.lower() for name in set(contact_types)} <= set(CONTACT_TYPES)):
+            errors: list[tuple[int, int, str]] = []
+            self._check_batch_contacts([("Contact", *contact) for contact in
+                                        zip(employee_names, partner_names, contact_types)],
+                                       {}, {}, errors)
+            raise ValueError(errors[0][2])
+        self._store_contacts(employee_names, partner_names, contact_types)
+        self.version += 1
+
+    def _store_contacts(self, employee_names: Sequence[str], partner_names: Sequence[str],
+                        contact_types: Sequence[str]) -> None:
+        """Store and count validated contacts, given as parallel columns."""
+        if not contact_types:
+            return
+        type_index = {name: CONTACT_TYPES.index(name.lower()) for name in set(contact_types)}
+        type_ids = list(map(type_index.__getitem__, contact_types))
+        self.contacts.extend(employee_names, partner_names, type_ids)
+        employees = self.employees
+        self._count_contacts(zip([employees[name].company_name for name in employee_names],
+                                 partner_names))
+        if self.employee_contacts is not None:
+            for employee_name, partner_name, type_id in zip(employee_names, partner_names, type_ids):
+                index = self.employee_contacts.setdefault(employee_name, {})
+                key = (partner_name, CONTACT_TYPES[type_id])
+                index[key] = index.get(key, 0) + 1
+
+    def _check_batch_contacts(self, commands: list[Sequence[str]], partners: dict[str, int],
+                              employees: dict[str, tuple[str, int]],
+                              errors: list[tuple[int, int, str]]) -> None:
+        """Check the contacts of a bulk_load batch against the declarations
+        made before each one, adding the first error found."""
+        for position, command in enumerate(commands):
+            if command[0] != "Contact":
+                continue
+            _, employee_name, partner_name, contact_type = command
+            if (employee_name not in self.employees
+                    and employees.get(employee_name, ("", position))[1] >= position):
+                errors.append((position, 0, f"Employee '{employee_name}' does not exist"))
+            elif partner_name not in self.partners and partners.get(partner_name, position) >= position:
+                errors.append((position, 1, f"Partner '{partner_name}' does not exist"))
+            elif contact_type.lower() not in CONTACT_TYPES:
+                errors.append((position, 2, f"Invalid contact type '{contact_type}'. "
+                                            f"Must be email, call, coffee, or pitch"))
+            else:
+                continue
+            # Later contacts cannot fail before this one
+            return
+
+    def memoize(self, key: str, compute: Callable[["Network"], Any]) -> Any:
+        """Get a result computed from the network, reusing it until the network changes.
+
+        Args:
+            key: Name of the result
+            compute: Computes the result from the network
+
+        Returns:
+            The result for the current version; callers must not modify it
+        """
+        entry = self.results.get(key)
+        if entry is not None and entry[0] == self.version:
+            return entry[1]
+        result = compute(self)
+        self.results[key] = (self.version, result)
+        return result
+
+    def clear_results(self) -> None:
+        """Drop every memoized result to reclaim its memory."""
+        self.results.clear()
+
+    def _employee_index(self) -> dict[str, dict[tuple[str, str], int]]:
+        """Get the per-employee contact index, building it on first use."""
+        if self.employee_contacts is None:
+            self.employee_contacts = {}
+            for employee_name, partner_name, contact_type, count in self.contacts.rows():
+                contacts = self.employee_contacts.setdefault(employee_name, {})
+                key = (partner_name, contact_type)
+                contacts[key] = contacts.get(key, 0) + count
+        return self.employee_contacts
+
+    def move_employee(self, name: str, company_name: str) -> None:
+        """Move an employee, and the counts of their contacts, to another company.
+
+        Args:
+            name: Employee's name
+            company_name: Name of the company they now work at
+        """
+        if name not in self.employees:
+            raise ValueError(f"Employee '{name}' does not exist")
+        if company_name not in self.companies:
+            raise ValueError(f"Company '{company_name}' does not exist")
+
+        employee = self.employees[name]
+        old_company = employee.company_name
+        if company_name == old_company:
+            return
+
+        partner_counts: dict[str, int] = {}
+        for (partner_name, _), count in self._employee_index().get(name, {}).items():
+            partner_counts[partner_name] = partner_counts.get(partner_name, 0) + count
+        for partner_name, count in partner_counts.items():
+            self._uncount_contact(old_company, partner_name, count)
+            self._count_contact(company_name, partner_name, count)
+        employee.company_name = company_name
+        self.version += 1
+
+    def remove_employee(self, name: str) -> None:
+        """Remove an employee and all of their contacts.
+
+        Args:
+            name: Employee's name
+        """
+        if name not in self.employees:
+            raise ValueError(f"Employee '{name}' does not exist")
+
+        company_name = self.employees.pop(name).company_name
+        contacts = self._employee_index().pop(name, {})
+        partner_counts: dict[str, int] = {}
+        for (partner_name, _), count in contacts.items():
+            partner_counts[partner_name] = partner_counts.get(partner_name, 0) + count
+        for partner_name, count in partner_counts.items():
+            self._uncount_contact(company_name, partner_name, count)
+        self.contacts.remove_employee(name, sum(partner_counts.values()))
+        self.version += 1
+
+    def remove_contact(self, employee_name: str, partner_name: str, contact_type: str) -> None:
+        """Remove one contact between an employee and a partner.
+
+        Args:
+            employee_name: Name of the employee
+            partner_name: Name of the partner
+            contact_type: Type of contact (email, call, coffee)
+        """
+        if employee_name not in self.employees:
+            raise ValueError(f"Employee '{employee_name}' does not exist")
+        if partner_name not in self.partners:
+            raise ValueError(f"Partner '{partner_name}' does not exist")
+        if contact_type.lower() not in CONTACT_TYPES:
+            raise ValueError(f"Invalid contact type '{contact_type}'. Must be email, call, coffee, or pitch")
+
+        contacts = self._employee_index().get(employee_name, {})
+        key = (partner_name, contact_type.lower())
+        count = contacts.get(key, 0)
+        if not count:
+            raise ValueError(f"Contact '{employee_name} {partner_name} {contact_type}' does not exist")
+        if count == 1:
+            del contacts[key]
+        else:
+            contacts[key] = count - 1
+
+        self.contacts.remove(employee_name, partner_name, contact_type.lower())
+        self._uncount_contact(self.employees[employee_name].company_name, partner_name)
+        self.version += 1
+
+    def _count_contact(self, company_name: str, partner_name: str, increment: int = 1) -> None:
+        """Increment the company/partner counter and update the company's leader.
+
+        Args:
+            company_name: Company the contacted employee works at
+            partner_name: Name of the partner
+            increment: Number of contacts to add
+        """
+        partner_counts = self.company_partner_counts.setdefault(company_name, {})
+        count = partner_counts.get(partner_name, 0) + increment
+        partner_counts[partner_name] = count
+        if count == increment and self.partner_companies is not None:
+            self.partner_companies.setdefault(partner_name, set()).add(company_name)
+
+        # Counts only ever grow here, so the new count can only take the lead
+        # by beating the current leader outright or tying it alphabetically first
+        leader = self.leaders.get(company_name)
+        if (leader is None or count > leader[1]
+                or (count == leader[1] and partner_name < leader[0])):
+            if leader is None or leader[0] != partner_name:
+                self._move_lead(company_name, leader, partner_name)
+            self.leaders[company_name] = (partner_name, count)
+            self.changed_companies.add(company_name)
+
+    def _count_contacts(self, pairs: Iterable[tuple[str, str]]) -> None:
+        """Count one contact per (company_name, partner_name) pair.
+
+        Same as calling _count_contact for each pair, with the loop kept in
+        one frame for bulk_load.
+        """
+        company_partner_counts = self.company_partner_counts
+        leaders = self.leaders
+        partner_companies = self.partner_companies
+        for company_name, partner_name in pairs:
+            partner_counts = company_partner_counts.get(company_name)
+            if partner_counts is None:
+                partner_counts = company_partner_counts[company_name] = {}
+            count = partner_counts.get(partner_name, 0) + 1
+            partner_counts[partner_name] = count
+            if count == 1 and partner_companies is not None:
+                partner_companies.setdefault(partner_name, set()).add(company_name)
+
+            leader = leaders.get(company_name)
+            if (leader is None or count > leader[1]
+                    or (count == leader[1] and partner_name < leader[0])):
+                if leader is None or leader[0] != partner_name:
+                    self._move_lead(company_name, leader, partner_name)
+                leaders[company_name] = (partner_name, count)
+                self.changed_companies.add(company_name)
+
+    def _uncount_contact(self, company_name: str, partner_name: str, decrement: int = 1) -> None:
+        """Decrement the company/partner counter and update the company's leader.
+
+        Args:
+            company_name: Company the contacted employee works at
+            partner_name: Name of the partner
+            decrement: Number of contacts to remove
+        """
+        partner_counts = self.company_partner_counts[company_name]
+        count = partner_counts[partner_name] - decrement
+        if count:
+            partner_counts[partner_name] = count
+        else:
+            del partner_counts[partner_name]
+            if not partner_counts:
+                del self.company_partner_counts[company_name]
+            if self.partner_companies is not None:
+                touched = self.partner_companies[partner_name]
+                touched.discard(company_name)
+                if not touched:
+                    del self.partner_companies[partner_name]
+
+        # Only a drop in the leader's own count can change the lead; find the
+        # new one among this company's partners
+        leader = self.leaders.get(company_name)
+        if leader is not None and leader[0] == partner_name:
+            if partner_counts:
+                new_leader = min(partner_counts.items(), key=lambda item: (-item[1], item[0]))
+                self.leaders[company_name] = new_leader
+                if new_leader[0] != partner_name:
+                    self._move_lead(company_name, leader, new_leader[0])
+            else:
+                del self.leaders[company_name]
+                self._move_lead(company_name, leader, None)
+            self.changed_companies.add(company_name)
+
+    def _move_lead(self, company_name: str, old_leader: Optional[tuple[str, int]],
+                   partner_name: Optional[str]) -> None:
+        """Record in partner_leads that a company's lead passed to another partner."""
+        if self.partner_leads is None:
+            return
+        if old_leader is not None:
+            led = self.partner_leads[old_leader[0]]
+            led.discard(company_name)
+            if not led:
+                del self.partner_leads[old_leader[0]]
+        if partner_name is not None:
+            self.partner_leads.setdefault(partner_name, set()).add(company_name)
+
+    def _partner_index(self) -> tuple[dict[str, set[str]], dict[str, set[str]]]:
+        """Get partner_companies and partner_leads, building them on first use."""
+        if self.partner_companies is None or self.partner_leads is None:
+            self.partner_companies = {}
+            for company_name, partner_counts in self.company_partner_counts.items():
+                for partner_name in partner_counts:
+                    self.partner_companies.setdefault(partner_name, set()).add(company_name)
+            self.partner_leads = {}
+            for company_name, (partner_name, _) in self.leaders.items():
+                self.partner_leads.setdefault(partner_name, set()).add(company_name)
+        return self.partner_companies, self.partner_leads
+
+    def pop_changed_companies(self) -> set[str]:
+        """Get and reset the companies whose output line may have changed.
+
+        A company is included if it was added, or if its leader or the
+        leader's count changed, since the previous call.
+
+        Returns:
+            set[str]: Names of the changed companies
+        """
+        changed = self.changed_companies
+        self.changed_companies = set()
+        return changed
+
+    def get_partner_standing(self, partner_name: str) -> list[tuple[str, int, int]]:
+        """Get a partner's rank and count at every company they have contacts at.
+
+        Rank 1 is the company's leader; partners are ranked by count, ties
+        broken alphabetically by partner name, as for the leader. The first
+        query builds the reverse index from the counters; after that the cost
+        is proportional to the partners at the companies this partner touched,
+        not to the whole network.
+
+        Args:
+            partner_name: Name of the partner
+
+        Returns:
+            list of (company_name, rank, count) tuples sorted by company name
+        """
+        if partner_name not in self.partners:
+            raise ValueError(f"Partner '{partner_name}' does not exist")
+
+        partner_companies, partner_leads = self._partner_index()
+        led = partner_leads.get(partner_name, ())
+        standing = []
+        for company_name in sorted(partner_companies.get(partner_name, ())):
+            partner_counts = self.company_partner_counts[company_name]
+            count = partner_counts[partner_name]
+            if company_name in led:
+                rank = 1
+            else:
+                rank = 1 + sum(1 for other, n in partner_counts.items()
+                               if n > count or (n == count and other < partner_name))
+            standing.append((company_name, rank, count))
+        return standing
+
+    def get_leader(self, company_name: str) -> Optional[tuple[str, int]]:
+        """Get the partner with the strongest relationship to a company.
+
+        Ties are broken alphabetically by partner name.
+
+        Args:
+            company_name: Name of the company
+
+        Returns:
+            (partner_name, count) tuple, or None if the company has no contacts
+        """
+        return self.leaders.get(company_name)
+
+    def save_snapshot(self, path: str) -> None:
+        """Save the network to a binary snapshot file.
+
+        Args:
+            path: Destination file path
+        """
+        from src.snapshot import save_snapshot
+        save_snapshot(self, path)
+
+    @classmethod
+    def load_snapshot(cls, path: str) -> "Network":
+        """Load a network from a binary snapshot file.
+
+        Args:
+            path: Snapshot file path
+
+        Returns:
+            Network: The restored network
+        """
+        from src.snapshot import load_snapshot
+        return load_snapshot(path)
 
-    def get_contacts(self) -> list[Contact]:
+    def get_contacts(self) -> ContactStore:
         """Get all contacts in the network.
 
         Returns:
-            List of all Contact objects
+            Sequence view of all contacts; indexing or iterating it yields
+            Contact objects
         """
         return self.contacts
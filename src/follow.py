@@ -0,0 +1,114 @@
+"""Tail mode: apply commands appended to a growing input file."""
+import time
+from typing import Callable, Iterator, TextIO
+
+from src.analyzer import analyze_network, format_leaders
+from src.cli import parse_command
+from src.entities import Network
+
+# Default seconds to wait before checking the file for new lines again
+POLL_INTERVAL = 0.5
+
+
+class LineFollower:
+    """Reads complete lines from a file that is still being appended to."""
+
+    def __init__(self, f: TextIO):
+        """Initialize a follower.
+
+        Args:
+            f: Open text file, positioned where reading should start
+        """
+        self.f = f
+        # Start of a line whose newline has not been written yet
+        self.partial = ""
+
+    def read_available(self) -> Iterator[str]:
+        """Yield each complete line currently in the file.
+
+        A trailing line without a newline is held back until the rest of it
+        is appended.
+
+        Yields:
+            str: Complete lines, including the newline
+        """
+        while True:
+            chunk = self.f.readline()
+            if not chunk:
+                return
+            if not chunk.endswith("\n"):
+                self.partial += chunk
+                return
+            if self.partial:
+                chunk = self.partial + chunk
+                self.partial = ""
+            yield chunk
+
+
+def apply_available(follower: LineFollower, network: Network) -> int:
+    """
+    Parse every complete line currently available into the network.
+
+    Args:
+        follower: Follower for the input file
+        network: Network instance to update
+
+    Returns:
+        int: Number of lines applied
+    """
+    applied = 0
+    for line in follower.read_available():
+        parse_command(line, network)
+        applied += 1
+    return applied
+
+
+def format_update(network: Network, changed_only: bool,
+                  analyze: Callable[[Network], str] = analyze_network) -> str:
+    """
+    Format output after a batch of commands.
+
+    Args:
+        network: Network the batch was applied to
+        changed_only: Only include companies that changed in the batch
+        analyze: Engine used when every company is reported
+
+    Returns:
+        str: Output lines in analyze_network format, possibly empty
+    """
+    changed = network.pop_changed_companies()
+    if changed_only:
+        return format_leaders(sorted(changed), network.leaders)
+    return analyze(network)
+
+
+def follow(path: str, network: Network, changed_only: bool = False,
+           poll_interval: float = POLL_INTERVAL,
+           analyze: Callable[[Network], str] = analyze_network) -> None:
+    """
+    Parse a file, then keep applying and reporting lines appended to it.
+
+    Prints the full analysis once the existing content is parsed, then after
+    each batch of new lines prints either every company or only the ones
+    that changed. Runs until interrupted.
+
+    Args:
+        path: Command file to follow
+        network: Network instance to update
+        changed_only: After each batch, print only companies that changed
+        poll_interval: Seconds to wait before checking for new lines
+        analyze: Engine used for every full analysis
+    """
+    with open(path, 'r') as f:
+        follower = LineFollower(f)
+        apply_available(follower, network)
+        network.pop_changed_companies()
+        print(analyze(network), flush=True)
+
+        while True:
+            if apply_available(follower, network):
+                output = format_update(network, changed_only, analyze)
+                if output:
+                    print(output, flush=True)
+            else:
+                time.sleep(poll_interval)
@@ -0,0 +1,303 @@
+"""Multi-process parsing of large command files.
+
+The input file is split into byte ranges on line boundaries and each range is
+parsed by a worker process. Workers cannot validate contacts themselves,
+because the Partner/Company/Employee declarations a contact depends on may sit
+in another chunk. Instead each worker turns its chunk into an ordered list of
+events that the parent replays against the Network in file order:
+
+- a command line (str) to run through parse_command as-is, and
+- a batch of contact counts ({(employee, partner, type): count}) for a run
+  of Contact lines between two other commands.
+
+Within a batch, only the first contact using each employee and each partner
+(and the first malformed contact) is sent as a command line. Any contact in
+the batch that would fail validation has an earlier-or-equal line among
+those, so replaying them through parse_command raises exactly the error,
+at exactly the line, that sequential parsing would. The remaining contacts in
+the batch are known to be valid once those lines pass and are added with a
+single add_contact call per distinct (employee, partner, type).
+
+Many files are parsed with the same pool: every file is split into chunks
+of about the same size (compressed files are parsed whole), and files
+holding only Contact lines (shards) are replayed after the files that
+declare the entities they refer to.
+
+With a Profiler, each worker times its reads and its chunk and counts lines
+and commands, and sends that back with its events; the parent merges it in
+as the "workers.read_input" and "workers.parse" stages.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Iterable, Iterator, Optional, Union
+
+from src.cli import parse_command
+from src.compression import detect_compression, open_input
+from src.entities import CONTACT_TYPES, Network
+from src.profiling import Profiler
+
+# Contact counts for a run of Contact lines: {(employee, partner, type): count}
+ContactBatch = dict[tuple[str, str, str], int]
+Event = Union[str, ContactBatch]
+
+# Number of chunks to create per worker, so uneven chunks balance out
+CHUNKS_PER_JOB = 4
+
+
+def split_file(path: str, num_chunks: int) -> list[tuple[int, int]]:
+    """
+    Split a file into byte ranges that start and end on line boundaries.
+
+    Args:
+        path: File to split
+        num_chunks: Target number of chunks
+
+    Returns:
+        list[tuple[int, int]]: (start, end) byte offsets covering the whole file
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+
+    boundaries = [0]
+    with open(path, 'rb') as f:
+        for i in range(1, num_chunks):
+            target = size * i // num_chunks
+            if target <= boundaries[-1]:
+                continue
+            # Move the boundary to the start of the next line
+            f.seek(target - 1)
+            f.readline()
+            offset = f.tell()
+            if boundaries[-1] < offset < size:
+                boundaries.append(offset)
+    boundaries.append(size)
+
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def read_range(f: BinaryIO, start: int, end: Optional[int]) -> Iterator[bytes]:
+    """
+    Read the lines of a byte range of a file.
+
+    Args:
+        f: Binary file positioned at start
+        start: Offset of the first line
+        end: Offset just past the last line, or None to read to the end
+
+    Yields:
+        bytes: Each line, with its newline
+    """
+    position = start
+    for raw in iter(f.readline, b""):
+        yield raw
+        position += len(raw)
+        if end is not None and position >= end:
+            return
+
+
+def parse_chunk(path: str, start: int, end: Optional[int],
+                profiler: Optional[Profiler] = None) -> list[Event]:
+    """
+    Parse one byte range of a command file into replayable events.
+
+    Args:
+        path: File to read, decompressing it if needed
+        start: Offset of the first line in the chunk
+        end: Offset just past the last line in the chunk, or None to read to
+             the end of the file
+        profiler: Profiler to record reading, lines and commands in, if any
+
+    Returns:
+        list[Event]: Command lines and contact batches, in file order
+    """
+    events: list[Event] = []
+    batch: ContactBatch = {}
+    seen_employees: set[str] = set()
+    seen_partners: set[str] = set()
+
+    with open_input(path, 'rb') as f:
+        if start:
+            f.seek(start)
+        lines = read_range(f, start, end)
+        if profiler is not None:
+            lines = profiler.timed_lines(lines)
+        for raw in lines:
+            line = raw.decode('utf-8')
+
+            parts = line.split()
+            if not parts:
+                continue
+
+            if parts[0] != "Contact":
+                # Any other command may change what contacts are valid, so
+                # close the current batch and replay the command in order
+                if batch:
+                    events.append(batch)
+                    batch = {}
+                seen_employees = set()
+                seen_partners = set()
+                events.append(line)
+                continue
+
+            if len(parts) != 4 or parts[3].lower() not in CONTACT_TYPES:
+                # Replaying this line is guaranteed to raise, so nothing
+                # after it in the chunk can matter
+                events.append(line)
+                break
+
+            employee_name, partner_name, contact_type = parts[1], parts[2], parts[3]
+            if employee_name not in seen_employees or partner_name not in seen_partners:
+                # First use of a name in this batch: replay it so it is
+                # validated against the declarations in effect at this line
+                seen_employees.add(employee_name)
+                seen_partners.add(partner_name)
+                if batch:
+                    events.append(batch)
+                    batch = {}
+                events.append(line)
+                continue
+
+            key = (employee_name, partner_name, contact_type.lower())
+            batch[key] = batch.get(key, 0) + 1
+
+    if batch:
+        events.append(batch)
+    return events
+
+
+def _parse_chunk_args(args: tuple[str, int, Optional[int], bool]
+                      ) -> tuple[list[Event], Optional[Profiler]]:
+    """Parse a (path, start, end, profile) tuple for ProcessPoolExecutor.map.
+
+    Returns the chunk's events, and with profile set, a Profiler holding the
+    chunk's read_input and parse stages and its line and command counts.
+    """
+    path, start, end, profile = args
+    if not profile:
+        return parse_chunk(path, start, end), None
+    profiler = Profiler()
+    with profiler.stage("parse", exclude="read_input"):
+        events = parse_chunk(path, start, end, profiler)
+    return events, profiler
+
+
+def _merge_workers(results: Iterable[tuple[list[Event], Optional[Profiler]]],
+                   profiler: Optional[Profiler]) -> Iterator[list[Event]]:
+    """Yield each chunk's events, merging worker profilers into profiler."""
+    for events, worker_profiler in results:
+        if worker_profiler is not None:
+            profiler.merge(worker_profiler, "workers.")
+        yield events
+
+
+def apply_events(events: list[Event], network: Network) -> None:
+    """
+    Replay events produced by parse_chunk against a network.
+
+    Args:
+        events: Events from parse_chunk, in file order
+        network: Network instance to update
+    """
+    for event in events:
+        if isinstance(event, str):
+            parse_command(event, network)
+        else:
+            for (employee_name, partner_name, contact_type), count in event.items():
+                network.add_contact(employee_name, partner_name, contact_type, count)
+
+
+def parse_file_parallel(path: str, network: Network, jobs: int,
+                        profiler: Optional[Profiler] = None) -> None:
+    """
+    Parse a command file using multiple worker processes.
+
+    The resulting network has the same entities, counts and leaders as
+    parsing the file line by line, and any invalid line raises the same
+    error. Only the order of contacts in network.contacts may differ.
+
+    Args:
+        path: Command file to parse
+        network: Network instance to update
+        jobs: Number of worker processes
+        profiler: Profiler to merge the workers' stages and counts into, if any
+    """
+    chunks = split_file(path, jobs * CHUNKS_PER_JOB)
+    profile = profiler is not None and profiler.enabled
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        # map yields results in chunk order, so events are replayed in file
+        # order while later chunks are still being parsed
+        tasks = [(path, start, end, profile) for start, end in chunks]
+        for events in _merge_workers(pool.map(_parse_chunk_args, tasks), profiler):
+            apply_events(events, network)
+
+
+def _has_declarations(events: list[Event]) -> bool:
+    """Check whether events include any command other than Contact."""
+    return any(isinstance(event, str) and event.split(None, 1)[0] != "Contact"
+               for event in events)
+
+
+def _apply_files(files: list[int], results: Iterable[list[Event]], network: Network) -> None:
+    """
+    Replay per-chunk events file by file, shards after declaration files.
+
+    Args:
+        files: Index of the file each chunk belongs to, in chunk order
+        results: Events for each chunk, in chunk order
+        network: Network instance to update
+    """
+    shards: list[list[Event]] = []
+    events: list[Event] = []
+    for i, chunk_events in enumerate(results):
+        events.extend(chunk_events)
+        if i + 1 < len(files) and files[i + 1] == files[i]:
+            continue
+        # Last chunk of a file: declarations are applied straight away so
+        # later declaration files see them, shards wait until the end
+        if _has_declarations(events):
+            apply_events(events, network)
+        else:
+            shards.append(events)
+        events = []
+    for events in shards:
+        apply_events(events, network)
+
+
+def parse_files_parallel(paths: list[str], network: Network, jobs: int,
+                         profiler: Optional[Profiler] = None) -> None:
+    """
+    Parse many command files using a pool of worker processes.
+
+    Files containing any command other than Contact are applied first, in
+    the order given, followed by the files containing only Contact lines,
+    also in the order given. The result, including any error raised, is the
+    same as parsing the files one after the other in that order.
+
+    Args:
+        paths: Command files to parse
+        network: Network instance to update
+        jobs: Number of worker processes; 1 parses in this process
+        profiler: Profiler to merge the workers' stages and counts into, if any
+    """
+    profile = profiler is not None and profiler.enabled
+    sizes = [os.path.getsize(path) for path in paths]
+    chunk_size = max(1, sum(sizes) // (jobs * CHUNKS_PER_JOB))
+    tasks = []
+    files = []
+    for i, (path, size) in enumerate(zip(paths, sizes)):
+        if detect_compression(path) is not None:
+            # A compressed file cannot be split, so one worker reads it all
+            tasks.append((path, 0, None, profile))
+            files.append(i)
+            continue
+        for start, end in split_file(path, -(-size // chunk_size)):
+            tasks.append((path, start, end, profile))
+            files.append(i)
+
+    if jobs == 1:
+        _apply_files(files, _merge_workers(map(_parse_chunk_args, tasks), profiler), network)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        _apply_files(files, _merge_workers(pool.map(_parse_chunk_args, tasks), profiler),
+                     network)
@@ -0,0 +1,126 @@
+"""Read-ahead of input streams in a background thread.
+
+A reader thread pulls chunks from a source into a bounded queue while the
+calling thread parses the chunks already read, so slow producers (a pipe
+from another process, a decompressor) and parsing overlap:
+
+    reader thread --[chunk, chunk, ...]--> BlockReader --> lines
+
+The queue holds at most `queued_blocks` chunks. Once it is full the reader
+thread waits, which bounds memory and lets the producer feel backpressure
+through the pipe when parsing is the slower stage.
+"""
+import contextlib
+import io
+import queue
+import threading
+from typing import BinaryIO, Callable, ContextManager, Optional, Union
+
+# Size of each chunk read ahead of the parser
+BLOCK_SIZE = 1 << 20
+
+# Chunks read ahead of the parser before the reader thread waits
+QUEUED_BLOCKS = 4
+
+
+class BlockReader(io.RawIOBase):
+    """Read-only raw stream of chunks read by a background thread."""
+
+    def __init__(self, opener: Callable[[], ContextManager[BinaryIO]],
+                 block_size: int = BLOCK_SIZE, queued_blocks: int = QUEUED_BLOCKS,
+                 partial: bool = False):
+        """Start reading.
+
+        Args:
+            opener: Returns the file object to read chunks from, as a context
+                    manager that is exited once it is exhausted
+            block_size: Bytes per chunk
+            queued_blocks: Chunks to read ahead of the consumer
+            partial: Queue whatever a single read1 call returns instead of
+                     waiting for full chunks, for sources like pipes
+        """
+        super().__init__()
+        self._queue: queue.Queue = queue.Queue(queued_blocks)
+        self._stop = threading.Event()
+        self._block = b""
+        self._position = 0
+        self._eof = False
+        self._thread = threading.Thread(target=self._read_blocks,
+                                        args=(opener, block_size, partial), daemon=True)
+        self._thread.start()
+
+    def _read_blocks(self, opener: Callable[[], ContextManager[BinaryIO]],
+                     block_size: int, partial: bool) -> None:
+        try:
+            with opener() as f:
+                read = f.read1 if partial else f.read
+                while True:
+                    block = read(block_size)
+                    # An empty block marks the end of the stream
+                    if not self._put(block) or not block:
+                        return
+        except Exception as e:
+            # Raised again in the reading thread
+            self._put(e)
+
+    def _put(self, item: Union[bytes, Exception]) -> bool:
+        # Wait for room in the queue, unless the reader has been closed
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while self._position >= len(self._block):
+            if self._eof:
+                return 0
+            item = self._queue.get()
+            if isinstance(item, Exception):
+                self._eof = True
+                raise item
+            if not item:
+                self._eof = True
+                return 0
+            self._block = item
+            self._position = 0
+
+        size = min(len(buffer), len(self._block) - self._position)
+        buffer[:size] = self._block[self._position:self._position + size]
+        self._position += size
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+        super().close()
+
+
+def open_pipelined(stream: BinaryIO, mode: str = 'r', block_size: int = BLOCK_SIZE,
+                   queued_blocks: int = QUEUED_BLOCKS,
+                   encoding: Optional[str] = None) -> Union[BinaryIO, io.TextIOWrapper]:
+    """
+    Read a binary stream ahead in a background thread.
+
+    Closing the returned file stops the thread but leaves the stream open.
+
+    Args:
+        stream: Binary stream to read, such as sys.stdin.buffer
+        mode: 'r' for text or 'rb' for bytes
+        block_size: Bytes per chunk
+        queued_blocks: Chunks to read ahead of the consumer
+        encoding: Text encoding, defaulting to the locale's
+
+    Returns:
+        The read-ahead file
+    """
+    raw = BlockReader(lambda: contextlib.nullcontext(stream), block_size, queued_blocks,
+                      partial=True)
+    buffered = io.BufferedReader(raw, block_size)
+    return buffered if 'b' in mode else io.TextIOWrapper(buffered, encoding)
@@ -0,0 +1,198 @@
+"""Per-stage timing and counters for --profile and --stats-json."""
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from typing import AnyStr, Iterable, Iterator, Optional
+
+from src.entities import Network
+
+
+class Profiler:
+    """Records wall and CPU time per stage plus named counters.
+
+    A disabled profiler does no work: stage() returns a no-op context and
+    timed_lines() returns its input unchanged, so nothing is added per line.
+
+    Stages are timed in this process. Time measured in worker processes is
+    merged in under a "workers." prefix, summed over the workers.
+    """
+
+    def __init__(self, enabled: bool = True):
+        """Initialize a profiler.
+
+        Args:
+            enabled: Whether to record anything
+        """
+        self.enabled = enabled
+        # {stage_name: [wall_seconds, cpu_seconds]}, in the order stages first ran
+        self.stages: dict[str, list[float]] = {}
+        self.counters: dict[str, int] = {}
+
+    def add_time(self, stage: str, wall: float, cpu: float) -> None:
+        """Add wall and CPU seconds to a stage.
+
+        Args:
+            stage: Stage name
+            wall: Wall-clock seconds
+            cpu: CPU seconds
+        """
+        totals = self.stages.setdefault(stage, [0.0, 0.0])
+        totals[0] += wall
+        totals[1] += cpu
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Add n to a counter.
+
+        Args:
+            name: Counter name
+            n: Amount to add
+        """
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def merge(self, other: "Profiler", stage_prefix: str = "") -> None:
+        """Add another profiler's stages and counters to this one.
+
+        Args:
+            other: Profiler to add, e.g. one returned by a worker process
+            stage_prefix: Prefix for the names of the other profiler's stages
+        """
+        for name, (wall, cpu) in other.stages.items():
+            self.add_time(stage_prefix + name, wall, cpu)
+        for name, n in other.counters.items():
+            self.count(name, n)
+
+    def stage(self, name: str, exclude: Optional[str] = None):
+        """Time the enclosed block as a stage.
+
+        Args:
+            name: Stage name
+            exclude: Another stage that runs nested inside this one; time it
+                     accumulates during the block is not counted here
+
+        Returns:
+            Context manager for the block
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self._stage(name, exclude)
+
+    @contextmanager
+    def _stage(self, name: str, exclude: Optional[str]):
+        excluded_before = list(self.stages.get(exclude, (0.0, 0.0)))
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            excluded_after = self.stages.get(exclude, (0.0, 0.0))
+            wall -= excluded_after[0] - excluded_before[0]
+            cpu -= excluded_after[1] - excluded_before[1]
+            self.add_time(name, wall, cpu)
+
+    def timed_lines(self, lines: Iterable[AnyStr], stage: str = "read_input") -> Iterator[AnyStr]:
+        """Wrap a line iterator, timing each read and counting lines and commands.
+
+        Args:
+            lines: Input lines, as str or as bytes
+            stage: Stage to charge read time to
+
+        Returns:
+            Iterator over the same lines
+        """
+        if not self.enabled:
+            return iter(lines)
+        return self._timed_lines(lines, stage)
+
+    def _timed_lines(self, lines: Iterable[AnyStr], stage: str) -> Iterator[AnyStr]:
+        iterator = iter(lines)
+        perf_counter = time.perf_counter
+        process_time = time.process_time
+        wall = cpu = 0.0
+        num_lines = 0
+        commands: dict[AnyStr, int] = {}
+        try:
+            while True:
+                wall_start = perf_counter()
+                cpu_start = process_time()
+                line = next(iterator, None)
+                wall += perf_counter() - wall_start
+                cpu += process_time() - cpu_start
+                if line is None:
+                    return
+                num_lines += 1
+                parts = line.split(None, 1)
+                if parts:
+                    commands[parts[0]] = commands.get(parts[0], 0) + 1
+                yield line
+        finally:
+            # Recorded even if parsing stops early on a bad line
+            self.add_time(stage, wall, cpu)
+            self.count("lines", num_lines)
+            for command, n in commands.items():
+                if isinstance(command, bytes):
+                    command = command.decode('utf-8', 'replace')
+                self.count(f"commands.{command}", n)
+
+    def record_network(self, network: Network) -> None:
+        """Record entity counters for a built network.
+
+        Args:
+            network: The analyzed network
+        """
+        if not self.enabled:
+            return
+        self.counters["partners"] = len(network.partners)
+        self.counters["companies"] = len(network.companies)
+        self.counters["employees"] = len(network.employees)
+        self.counters["contacts"] = len(network.get_contacts())
+
+    def to_dict(self) -> dict:
+        """Return the recorded stages, counters and throughput as a dict.
+
+        Returns:
+            dict: {"stages": {name: {"wall_seconds", "cpu_seconds"}},
+                   "counters": {name: n}, "lines_per_second": float or None}
+        """
+        stages = {
+            name: {"wall_seconds": wall, "cpu_seconds": cpu}
+            for name, (wall, cpu) in self.stages.items()
+        }
+        ingest_seconds = sum(self.stages.get(name, (0.0, 0.0))[0]
+                             for name in ("read_input", "parse"))
+        lines = self.counters.get("lines")
+        lines_per_second = lines / ingest_seconds if lines and ingest_seconds > 0 else None
+        return {
+            "stages": stages,
+            "counters": dict(self.counters),
+            "lines_per_second": lines_per_second,
+        }
+
+    def format_report(self) -> str:
+        """Format the recorded data as a human-readable table.
+
+        Returns:
+            str: Multi-line report
+        """
+        data = self.to_dict()
+        width = max([12, *map(len, data["stages"])])
+        lines = [f"{'stage':<{width}} {'wall (s)':>10} {'cpu (s)':>10}"]
+        for name, times in data["stages"].items():
+            lines.append(f"{name:<{width}} {times['wall_seconds']:>10.4f} "
+                         f"{times['cpu_seconds']:>10.4f}")
+        for name, n in data["counters"].items():
+            lines.append(f"{name + ':':<24} {n:,}")
+        if data["lines_per_second"] is not None:
+            lines.append(f"{'lines/s:':<24} {data['lines_per_second']:,.0f}")
+        return "\n".join(lines)
+
+    def write_json(self, path: str) -> None:
+        """Write the recorded data to a JSON file.
+
+        Args:
+            path: Destination file path
+        """
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write("\n")
@@ -0,0 +1,215 @@
+"""Long-running query server holding one Network in memory.
+
+Clients connect over TCP on localhost or a Unix socket and send one request
+per line. Every response starts with a status line, either "OK <n>"
+followed by n result lines, or "ERR <message>".
+
+Writes use the existing command language:
+
+    Partner Alice                 apply one command (Partner, Company,
+                                  Employee, Contact, Move or Remove)
+    BATCH <n>                     apply the n command lines that follow
+
+Queries are answered from the counters Network maintains, so their cost
+does not depend on how many contacts have been loaded:
+
+    LEADERS                       analyze_network output, one line per company
+    LEADER <Company>              the company's line from LEADERS
+    TOP <Company> <K>             the company's K strongest partners
+    COMPANY <Company>             every partner's count for the company
+    PARTNER <Partner>             the partner's rank and count at each company
+    STATS                         entity and contact counts
+
+Everything runs on one asyncio event loop. Large batches are applied in
+slices with a yield to the loop between them, so queries from other
+connections are answered while a batch is still being ingested.
+"""
+import asyncio
+import os
+
+from src.analyzer import analyze_network, analyze_partner, format_leaders, top_partners
+from src.cli import parse_command
+from src.entities import Network
+
+# Commands applied from a batch before other connections get a turn
+BATCH_SLICE = 1_000
+
+# Keywords of the command language accepted as single-line writes
+WRITE_COMMANDS = ("Partner", "Company", "Employee", "Contact", "Move", "Remove")
+
+
+class NetworkServer:
+    """Serves writes and queries against one Network."""
+
+    def __init__(self, network: Network):
+        """Initialize a server.
+
+        Args:
+            network: Network to serve; updated in place by writes
+        """
+        self.network = network
+        self.queries = {
+            "LEADERS": self.query_leaders,
+            "LEADER": self.query_leader,
+            "TOP": self.query_top,
+            "COMPANY": self.query_company,
+            "PARTNER": self.query_partner,
+            "STATS": self.query_stats,
+        }
+
+    async def apply_commands(self, lines: list[str]) -> None:
+        """
+        Apply command lines to the network, stopping at the first error.
+
+        Args:
+            lines: Command lines
+
+        Raises:
+            ValueError: If a line fails, naming its position in the batch
+        """
+        for start in range(0, len(lines), BATCH_SLICE):
+            for number, line in enumerate(lines[start:start + BATCH_SLICE], start + 1):
+                try:
+                    parse_command(line, self.network)
+                except (ValueError, IndexError) as e:
+                    raise ValueError(f"line {number}: {e}") from e
+            # Let queries from other connections run between slices
+            await asyncio.sleep(0)
+
+    def query_leaders(self, args: list[str]) -> list[str]:
+        """Return analyze_network output for every company."""
+        output = analyze_network(self.network)
+        return output.split("\n") if output else []
+
+    def query_leader(self, args: list[str]) -> list[str]:
+        """Return one company's strongest relationship."""
+        company_name = self._company(args, 1)
+        return [format_leaders([company_name], self.network.leaders)]
+
+    def query_top(self, args: list[str]) -> list[str]:
+        """Return a company's top K partners, one "Partner (count)" per line."""
+        company_name = self._company(args, 2)
+        try:
+            k = int(args[1])
+        except ValueError:
+            raise ValueError(f"Invalid K '{args[1]}'") from None
+        return [f"{partner} ({count})"
+                for partner, count in top_partners(self.network, company_name, k)]
+
+    def query_company(self, args: list[str]) -> list[str]:
+        """Return every partner's contact count for a company."""
+        company_name = self._company(args, 1)
+        partner_counts = self.network.company_partner_counts.get(company_name, {})
+        return [f"{partner} {count}" for partner, count in partner_counts.items()]
+
+    def query_partner(self, args: list[str]) -> list[str]:
+        """Return a partner's "Company: #rank (count)" line for each company."""
+        if len(args) != 1:
+            raise ValueError("Invalid number of arguments")
+        return analyze_partner(self.network, args[0]).split("\n")
+
+    def query_stats(self, args: list[str]) -> list[str]:
+        """Return entity and contact counts."""
+        network = self.network
+        return [
+            f"partners {len(network.partners)}",
+            f"companies {len(network.companies)}",
+            f"employees {len(network.employees)}",
+            f"contacts {len(network.get_contacts())}",
+        ]
+
+    def _company(self, args: list[str], num_args: int) -> str:
+        """Check a query's argument count and that its company exists."""
+        if len(args) != num_args:
+            raise ValueError("Invalid number of arguments")
+        company_name = args[0]
+        if company_name not in self.network.companies:
+            raise ValueError(f"Company '{company_name}' does not exist")
+        return company_name
+
+    async def handle_request(self, line: str, reader: asyncio.StreamReader) -> list[str]:
+        """
+        Run one request.
+
+        Args:
+            line: Request line
+            reader: Stream to read batch lines from
+
+        Returns:
+            list[str]: Result lines
+        """
+        parts = line.split()
+        if not parts:
+            return []
+        keyword = parts[0]
+
+        if keyword == "BATCH":
+            if len(parts) != 2 or not parts[1].isdigit():
+                raise ValueError("Usage: BATCH <n>")
+            lines = []
+            for _ in range(int(parts[1])):
+                data = await reader.readline()
+                if not data:
+                    raise ValueError("Connection closed in the middle of a batch")
+                lines.append(data.decode('utf-8'))
+            await self.apply_commands(lines)
+            return []
+
+        query = self.queries.get(keyword)
+        if query is not None:
+            return query(parts[1:])
+        if keyword not in WRITE_COMMANDS:
+            raise ValueError(f"Unknown request '{keyword}'")
+        await self.apply_commands([line])
+        return []
+
+    async def handle_client(self, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> None:
+        """Serve requests from one connection until it closes."""
+        try:
+            while True:
+                data = await reader.readline()
+                if not data:
+                    break
+                try:
+                    results = await self.handle_request(data.decode('utf-8'), reader)
+                except (ValueError, IndexError) as e:
+                    response = f"ERR {e}\n"
+                else:
+                    response = "".join([f"OK {len(results)}\n"] + [f"{r}\n" for r in results])
+                writer.write(response.encode('utf-8'))
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def start(self, address: str) -> asyncio.AbstractServer:
+        """
+        Start listening.
+
+        Args:
+            address: "[host:]port" for TCP (host defaults to 127.0.0.1), or a
+                     Unix socket path (containing "/" or prefixed "unix:")
+
+        Returns:
+            asyncio.AbstractServer: The listening server
+        """
+        if address.startswith("unix:") or os.sep in address:
+            path = address[len("unix:"):] if address.startswith("unix:") else address
+            return await asyncio.start_unix_server(self.handle_client, path=path)
+
+        host, _, port = address.rpartition(":")
+        return await asyncio.start_server(self.handle_client, host=host or "127.0.0.1",
+                                          port=int(port))
+
+
+async def serve(network: Network, address: str) -> None:
+    """
+    Serve a network until cancelled.
+
+    Args:
+        network: Network to serve
+        address: Listening address, see NetworkServer.start
+    """
+    server = await NetworkServer(network).start(address)
+    async with server:
+        await server.serve_forever()
@@ -0,0 +1,243 @@
+"""Binary snapshots of a built Network.
+
+A snapshot stores everything needed to restore a Network without reparsing
+its commands. All integers are little-endian:
+
+    header      magic, format version and section sizes (HEADER)
+    strings     uint32 end offsets, then the UTF-8 bytes of every name
+    partners    int32 name IDs, in insertion order
+    companies   int32 name IDs, in insertion order
+    employees   int32 name IDs, then int32 company name IDs
+    contacts    int32 employee IDs, int32 partner IDs, uint8 type IDs,
+                uint32 run lengths (one entry per ContactStore row)
+    counters    int32 company IDs, int32 partner IDs, int64 counts
+    leaders     int32 company IDs, int32 partner IDs, int64 counts
+
+The first names in the string table are the contact store's own string
+table, so the contact columns are copied back into arrays byte for byte.
+Loading memory-maps the file and does one bulk copy per column.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from src.entities import Company, Employee, Network, Partner
+
+MAGIC = b"DNSNAP\x00\x00"
+FORMAT_VERSION = 2
+# Version 1 stored one row per contact and no run lengths
+SUPPORTED_VERSIONS = (1, 2)
+
+# magic, version, string table bytes, number of strings, number of strings
+# owned by the contact store, partners, companies, employees, contact rows,
+# counters, leaders
+HEADER = struct.Struct("<8sIQQQQQQQQQ")
+
+
+def is_snapshot(path: str) -> bool:
+    """
+    Check whether a file starts with the snapshot magic bytes.
+
+    Args:
+        path: File to check
+
+    Returns:
+        bool: True if the file is a snapshot
+    """
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def _to_bytes(values: array) -> bytes:
+    """Return the little-endian bytes of an array."""
+    if sys.byteorder == 'big' and values.itemsize > 1:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_bytes(typecode: str, data) -> array:
+    """Build an array from a bytes-like object holding little-endian values."""
+    values = array(typecode)
+    with memoryview(data) as view:
+        values.frombytes(view)
+    if sys.byteorder == 'big' and values.itemsize > 1:
+        values.byteswap()
+    return values
+
+
+def save_snapshot(network: Network, path: str) -> None:
+    """
+    Write a network to a binary snapshot file.
+
+    The snapshot is written to a temporary file next to path and moved into
+    place, so an existing snapshot is never left half overwritten.
+
+    Args:
+        network: Network to save
+        path: Destination file path
+    """
+    store = network.contacts
+    store.compact()
+
+    # Extend the contact store's string table with the remaining entity names
+    names = list(store.names)
+    name_ids = dict(store.name_ids)
+
+    def name_id(name: str) -> int:
+        found = name_ids.get(name)
+        if found is None:
+            found = name_ids[name] = len(names)
+            names.append(name)
+        return found
+
+    partners = array('i', (name_id(name) for name in network.partners))
+    companies = array('i', (name_id(name) for name in network.companies))
+    employees = array('i', (name_id(name) for name in network.employees))
+    employee_companies = array('i', (name_id(e.company_name) for e in network.employees.values()))
+
+    counter_companies = array('i')
+    counter_partners = array('i')
+    counter_counts = array('q')
+    for company_name, partner_counts in network.company_partner_counts.items():
+        company_id = name_id(company_name)
+        for partner_name, count in partner_counts.items():
+            counter_companies.append(company_id)
+            counter_partners.append(name_id(partner_name))
+            counter_counts.append(count)
+
+    leader_companies = array('i')
+    leader_partners = array('i')
+    leader_counts = array('q')
+    for company_name, (partner_name, count) in network.leaders.items():
+        leader_companies.append(name_id(company_name))
+        leader_partners.append(name_id(partner_name))
+        leader_counts.append(count)
+
+    encoded = [name.encode('utf-8') for name in names]
+    string_ends = array('I')
+    end = 0
+    for data in encoded:
+        end += len(data)
+        string_ends.append(end)
+
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, end, len(names), len(store.names),
+        len(partners), len(companies), len(employees), len(store.counts),
+        len(counter_counts), len(leader_counts),
+    )
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, 'wb') as f:
+            f.write(header)
+            f.write(_to_bytes(string_ends))
+            f.write(b"".join(encoded))
+            for column in (partners, companies, employees, employee_companies,
+                           store.employee_ids, store.partner_ids, store.type_ids, store.counts,
+                           counter_companies, counter_partners, counter_counts,
+                           leader_companies, leader_partners, leader_counts):
+                f.write(_to_bytes(column))
+        os.replace(temporary, path)
+    except BaseException:
+        try:
+            os.remove(temporary)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def load_snapshot(path: str) -> Network:
+    """
+    Load a network from a binary snapshot file.
+
+    Args:
+        path: Snapshot file path
+
+    Returns:
+        Network: The restored network
+    """
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            with memoryview(buffer) as view:
+                return _load(view)
+
+
+def _load(buffer: memoryview) -> Network:
+    """Restore a network from a snapshot held in a memoryview."""
+    if len(buffer) < HEADER.size:
+        raise ValueError("Snapshot is truncated")
+    (magic, version, string_bytes, num_strings, num_store_strings,
+     num_partners, num_companies, num_employees, num_rows,
+     num_counters, num_leaders) = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a network snapshot")
+    if version not in SUPPORTED_VERSIONS:
+        raise ValueError(f"Unsupported snapshot version {version}")
+
+    position = HEADER.size
+
+    def read(typecode: str, count: int) -> array:
+        nonlocal position
+        size = array(typecode).itemsize * count
+        if position + size > len(buffer):
+            raise ValueError("Snapshot is truncated")
+        values = _from_bytes(typecode, buffer[position:position + size])
+        position += size
+        return values
+
+    string_ends = read('I', num_strings)
+    if position + string_bytes > len(buffer):
+        raise ValueError("Snapshot is truncated")
+    blob = bytes(buffer[position:position + string_bytes])
+    position += string_bytes
+    names = []
+    start = 0
+    for end in string_ends:
+        names.append(blob[start:end].decode('utf-8'))
+        start = end
+
+    partners = read('i', num_partners)
+    companies = read('i', num_companies)
+    employees = read('i', num_employees)
+    employee_companies = read('i', num_employees)
+    contact_employees = read('i', num_rows)
+    contact_partners = read('i', num_rows)
+    contact_types = read('B', num_rows)
+    if version == 1:
+        contact_counts = array('I', [1]) * num_rows
+    else:
+        contact_counts = read('I', num_rows)
+    counter_companies = read('i', num_counters)
+    counter_partners = read('i', num_counters)
+    counter_counts = read('q', num_counters)
+    leader_companies = read('i', num_leaders)
+    leader_partners = read('i', num_leaders)
+    leader_counts = read('q', num_leaders)
+
+    network = Network()
+    network.partners = {names[i]: Partner(names[i]) for i in partners}
+    network.companies = {names[i]: Company(names[i]) for i in companies}
+    network.employees = {
+        names[i]: Employee(names[i], names[c])
+        for i, c in zip(employees, employee_companies)
+    }
+
+    store = network.contacts
+    store.names = names[:num_store_strings]
+    store.name_ids = {name: i for i, name in enumerate(store.names)}
+    store.employee_ids = contact_employees
+    store.partner_ids = contact_partners
+    store.type_ids = contact_types
+    store.counts = contact_counts
+    store.num_contacts = sum(contact_counts)
+
+    counts = network.company_partner_counts
+    for c, p, n in zip(counter_companies, counter_partners, counter_counts):
+        counts.setdefault(names[c], {})[names[p]] = n
+    network.leaders = {
+        names[c]: (names[p], n)
+        for c, p, n in zip(leader_companies, leader_partners, leader_counts)
+    }
+    return network
@@ -0,0 +1,346 @@
+"""SQLite storage backend for networks larger than memory.
+
+SqliteNetwork has the same add_partner/add_company/add_employee/add_contact
+interface and error messages as Network, so parse_command works with either.
+Entities and contacts live in an indexed SQLite database. New rows are
+buffered and written with executemany in a single transaction per flush, and
+analysis runs as one GROUP BY and window-function query. Inside
+SqliteNetwork.transaction() nothing is committed until the block ends, so a
+failed ingestion leaves the database as it was.
+"""
+import sqlite3
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Iterator, Optional
+
+from src.entities import CONTACT_TYPES
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS partners (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS companies (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS employees (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    company_id INTEGER NOT NULL REFERENCES companies(id)
+);
+CREATE TABLE IF NOT EXISTS contacts (
+    employee_id INTEGER NOT NULL REFERENCES employees(id),
+    partner_id INTEGER NOT NULL REFERENCES partners(id),
+    type_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS employees_company ON employees(company_id);
+CREATE INDEX IF NOT EXISTS contacts_employee_partner ON contacts(employee_id, partner_id);
+"""
+
+# One row per company, sorted by name. Partners are ranked within each
+# company by contact count, then name; SQLite compares TEXT as UTF-8 bytes,
+# which orders names the same way Python's sorted() does.
+LEADERS_QUERY = """
+WITH counts AS (
+    SELECT e.company_id AS company_id, c.partner_id AS partner_id, COUNT(*) AS n
+    FROM contacts c
+    JOIN employees e ON e.id = c.employee_id
+    GROUP BY e.company_id, c.partner_id
+),
+ranked AS (
+    SELECT counts.company_id AS company_id, p.name AS partner, counts.n AS n,
+           ROW_NUMBER() OVER (
+               PARTITION BY counts.company_id ORDER BY counts.n DESC, p.name
+           ) AS position
+    FROM counts
+    JOIN partners p ON p.id = counts.partner_id
+)
+SELECT co.name, r.partner, r.n
+FROM companies co
+LEFT JOIN ranked r ON r.company_id = co.id AND r.position = 1
+ORDER BY co.name
+"""
+
+# Rows buffered before they are written to the database
+FLUSH_SIZE = 10_000
+
+# Stored IDs remembered before the lookup cache is cleared
+ID_CACHE_SIZE = 100_000
+
+
+class SqliteNetwork:
+    """Network stored in an SQLite database."""
+
+    def __init__(self, path: str = ":memory:", flush_size: int = FLUSH_SIZE):
+        """Open or create a network database.
+
+        Args:
+            path: Database file path, or ":memory:"
+            flush_size: Number of buffered rows that triggers a flush
+        """
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.flush_size = flush_size
+
+        # Rows not yet written, with the IDs they will get, so they can be
+        # validated against before the next flush: {name: id}
+        self.pending_partners: dict[str, int] = {}
+        self.pending_companies: dict[str, int] = {}
+        self.pending_employees: dict[str, tuple[int, int]] = {}
+        self.pending_contacts: list[tuple[int, int, int]] = []
+
+        # IDs of rows already in the database: {(table, name): id}. Entries
+        # are dropped when their row is deleted; the cache is also bounded.
+        self.id_cache: dict[tuple[str, str], int] = {}
+
+        # Set inside transaction(), where writes are left uncommitted
+        self.in_transaction = False
+        self.next_ids = self._stored_next_ids()
+
+    def _stored_next_ids(self) -> dict[str, int]:
+        return {
+            table: self.connection.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}").fetchone()[0]
+            for table in ("partners", "companies", "employees")
+        }
+
+    def _writing(self) -> ContextManager:
+        # Outside a transaction() block every write is committed on its own
+        return nullcontext() if self.in_transaction else self.connection
+
+    def _pending_rows(self) -> int:
+        return (len(self.pending_partners) + len(self.pending_companies)
+                + len(self.pending_employees) + len(self.pending_contacts))
+
+    def _lookup(self, table: str, pending: dict, name: str) -> Optional[int]:
+        """Return the ID of a named row, pending or stored, or None."""
+        if name in pending:
+            found = pending[name]
+            return found[0] if isinstance(found, tuple) else found
+        found = self.id_cache.get((table, name))
+        if found is not None:
+            return found
+        row = self.connection.execute(f"SELECT id FROM {table} WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return None
+        if len(self.id_cache) >= ID_CACHE_SIZE:
+            self.id_cache.clear()
+        self.id_cache[(table, name)] = row[0]
+        return row[0]
+
+    def _new_id(self, table: str) -> int:
+        new_id = self.next_ids[table]
+        self.next_ids[table] = new_id + 1
+        return new_id
+
+    def _maybe_flush(self) -> None:
+        if self._pending_rows() >= self.flush_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all buffered rows to the database in one transaction."""
+        with self._writing():
+            self.connection.executemany(
+                "INSERT INTO partners (id, name) VALUES (?, ?)",
+                ((i, name) for name, i in self.pending_partners.items()))
+            self.connection.executemany(
+                "INSERT INTO companies (id, name) VALUES (?, ?)",
+                ((i, name) for name, i in self.pending_companies.items()))
+            self.connection.executemany(
+                "INSERT INTO employees (id, name, company_id) VALUES (?, ?, ?)",
+                ((i, name, company_id) for name, (i, company_id) in self.pending_employees.items()))
+            self.connection.executemany(
+                "INSERT INTO contacts (employee_id, partner_id, type_id) VALUES (?, ?, ?)",
+                self.pending_contacts)
+        self.pending_partners.clear()
+        self.pending_companies.clear()
+        self.pending_employees.clear()
+        self.pending_contacts.clear()
+
+    @contextmanager
+    def transaction(self) -> Iterator["SqliteNetwork"]:
+        """Apply all changes made in a block as one transaction.
+
+        The block's rows are committed when it ends. If it raises, buffered
+        rows are discarded and the database is rolled back to its state
+        before the block, so the same input can be loaded again once fixed.
+
+        Yields:
+            SqliteNetwork: This network
+        """
+        self.flush()
+        self.in_transaction = True
+        try:
+            yield self
+            self.flush()
+            self.connection.commit()
+        except BaseException:
+            self.discard()
+            raise
+        finally:
+            self.in_transaction = False
+
+    def discard(self) -> None:
+        """Drop buffered rows and roll back writes that are not committed."""
+        self.connection.rollback()
+        self.pending_partners.clear()
+        self.pending_companies.clear()
+        self.pending_employees.clear()
+        self.pending_contacts.clear()
+        # Cached and next IDs may belong to rows that were rolled back
+        self.id_cache.clear()
+        self.next_ids = self._stored_next_ids()
+
+    def close(self) -> None:
+        """Flush buffered rows and close the database."""
+        self.flush()
+        self.connection.close()
+
+    def add_partner(self, name: str) -> None:
+        """Add a partner to the network.
+
+        Args:
+            name: Partner's name
+        """
+        if self._lookup("partners", self.pending_partners, name) is not None:
+            raise ValueError(f"Partner '{name}' already exists")
+        self.pending_partners[name] = self._new_id("partners")
+        self._maybe_flush()
+
+    def add_company(self, name: str) -> None:
+        """Add a company to the network.
+
+        Args:
+            name: Company's name
+        """
+        if self._lookup("companies", self.pending_companies, name) is not None:
+            raise ValueError(f"Company '{name}' already exists")
+        self.pending_companies[name] = self._new_id("companies")
+        self._maybe_flush()
+
+    def add_employee(self, name: str, company_name: str) -> None:
+        """Add an employee to the network.
+
+        Args:
+            name: Employee's name
+            company_name: Name of the company where they work
+        """
+        if self._lookup("employees", self.pending_employees, name) is not None:
+            raise ValueError(f"Employee '{name}' already exists")
+        company_id = self._lookup("companies", self.pending_companies, company_name)
+        if company_id is None:
+            raise ValueError(f"Company '{company_name}' does not exist")
+        self.pending_employees[name] = (self._new_id("employees"), company_id)
+        self._maybe_flush()
+
+    def add_contact(self, employee_name: str, partner_name: str, contact_type: str,
+                    count: int = 1) -> None:
+        """Record a contact between an employee and a partner.
+
+        Args:
+            employee_name: Name of the employee
+            partner_name: Name of the partner
+            contact_type: Type of contact (email, call, coffee)
+            count: Number of identical contacts to record at once
+        """
+        employee_id = self._lookup("employees", self.pending_employees, employee_name)
+        if employee_id is None:
+            raise ValueError(f"Employee '{employee_name}' does not exist")
+        partner_id = self._lookup("partners", self.pending_partners, partner_name)
+        if partner_id is None:
+            raise ValueError(f"Partner '{partner_name}' does not exist")
+        if contact_type.lower() not in CONTACT_TYPES:
+            raise ValueError(f"Invalid contact type '{contact_type}'. Must be email, call, coffee, or pitch")
+
+        row = (employee_id, partner_id, CONTACT_TYPES.index(contact_type.lower()))
+        self.pending_contacts.extend([row] * count)
+        self._maybe_flush()
+
+    def move_employee(self, name: str, company_name: str) -> None:
+        """Move an employee, and their contacts, to another company.
+
+        Args:
+            name: Employee's name
+            company_name: Name of the company they now work at
+        """
+        self.flush()
+        employee_id = self._lookup("employees", self.pending_employees, name)
+        if employee_id is None:
+            raise ValueError(f"Employee '{name}' does not exist")
+        company_id = self._lookup("companies", self.pending_companies, company_name)
+        if company_id is None:
+            raise ValueError(f"Company '{company_name}' does not exist")
+        with self._writing():
+            self.connection.execute("UPDATE employees SET company_id = ? WHERE id = ?",
+                                    (company_id, employee_id))
+
+    def remove_employee(self, name: str) -> None:
+        """Remove an employee and all of their contacts.
+
+        Args:
+            name: Employee's name
+        """
+        self.flush()
+        employee_id = self._lookup("employees", self.pending_employees, name)
+        if employee_id is None:
+            raise ValueError(f"Employee '{name}' does not exist")
+        with self._writing():
+            self.connection.execute("DELETE FROM contacts WHERE employee_id = ?", (employee_id,))
+            self.connection.execute("DELETE FROM employees WHERE id = ?", (employee_id,))
+        self.id_cache.pop(("employees", name), None)
+
+    def remove_contact(self, employee_name: str, partner_name: str, contact_type: str) -> None:
+        """Remove one contact between an employee and a partner.
+
+        Args:
+            employee_name: Name of the employee
+            partner_name: Name of the partner
+            contact_type: Type of contact (email, call, coffee)
+        """
+        self.flush()
+        employee_id = self._lookup("employees", self.pending_employees, employee_name)
+        if employee_id is None:
+            raise ValueError(f"Employee '{employee_name}' does not exist")
+        partner_id = self._lookup("partners", self.pending_partners, partner_name)
+        if partner_id is None:
+            raise ValueError(f"Partner '{partner_name}' does not exist")
+        if contact_type.lower() not in CONTACT_TYPES:
+            raise ValueError(f"Invalid contact type '{contact_type}'. Must be email, call, coffee, or pitch")
+
+        with self._writing():
+            cursor = self.connection.execute(
+                "DELETE FROM contacts WHERE rowid = (SELECT rowid FROM contacts "
+                "WHERE employee_id = ? AND partner_id = ? AND type_id = ? LIMIT 1)",
+                (employee_id, partner_id, CONTACT_TYPES.index(contact_type.lower())))
+        if cursor.rowcount == 0:
+            raise ValueError(f"Contact '{employee_name} {partner_name} {contact_type}' does not exist")
+
+    def leaders(self):
+        """Yield the strongest relationship for every company.
+
+        Yields:
+            tuple: (company_name, partner_name, count), with partner_name and
+                   count None for companies without contacts, sorted by company
+        """
+        self.flush()
+        yield from self.connection.execute(LEADERS_QUERY)
+
+
+def analyze_sqlite(network: SqliteNetwork) -> str:
+    """
+    Analyze an SQLite-backed network.
+
+    Args:
+        network: SqliteNetwork to analyze
+
+    Returns:
+        str: Same output as analyze_network for the same commands
+    """
+    results = []
+    for company_name, partner_name, count in network.leaders():
+        if partner_name is not None:
+            results.append(f"{company_name}: {partner_name} ({count})")
+        else:
+            results.append(f"{company_name}: No current relationship")
+    return "\n".join(results)
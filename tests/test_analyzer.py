@@ -1,7 +1,9 @@
 """Tests for relationship analyzer."""
 import pytest
 from src.entities import Network
-from src.analyzer import analyze_network
+from src.analyzer import (analyze_network, analyze_network_numpy, analyze_partner,
+                          analyze_top_partners, format_delta, format_leaders, leader_table,
+                          top_partners)
 
 
 class TestAnalyzeNetwork:
@@ -183,3 +185,284 @@ class TestAnalyzeNetwork:
         assert lines[0] == "Acme: Alice (3)"
         assert lines[1] == "Globex: Charlie (2)"
         assert lines[2] == "Initech: No current relationship"
+
+
+def build_random_network(seed: int) -> Network:
+    """Build a small random network with plenty of ties."""
+    import random
+    rng = random.Random(seed)
+    network = Network()
+    partners = [f"P{i}" for i in range(6)]
+    companies = [f"C{i}" for i in range(5)]
+    for name in partners:
+        network.add_partner(name)
+    for name in companies:
+        network.add_company(name)
+    employees = [f"E{i}" for i in range(12)]
+    for name in employees:
+        network.add_employee(name, rng.choice(companies[:4]))
+    for _ in range(60):
+        # Some repeated contacts, so contact runs have lengths above one
+        network.add_contact(rng.choice(employees), rng.choice(partners), "email",
+                            rng.choice([1, 1, 3]))
+    return network
+
+
+class TestPartnerStanding:
+    """Tests for the partner-indexed view."""
+
+    def build_network(self) -> Network:
+        network = Network()
+        for name in ["Alice", "Bob", "Carol"]:
+            network.add_partner(name)
+        for name in ["Acme", "Globex", "Initech"]:
+            network.add_company(name)
+        network.add_employee("Dave", "Acme")
+        network.add_employee("Eve", "Globex")
+        network.add_contact("Dave", "Alice", "email", 3)
+        network.add_contact("Dave", "Bob", "email", 3)
+        network.add_contact("Dave", "Carol", "email", 5)
+        network.add_contact("Eve", "Bob", "call", 2)
+        return network
+
+    def test_standing(self):
+        """Test ranks and counts, with alphabetical tie-breaks."""
+        network = self.build_network()
+        assert network.get_partner_standing("Alice") == [("Acme", 2, 3)]
+        assert network.get_partner_standing("Bob") == [("Acme", 3, 3), ("Globex", 1, 2)]
+        assert network.partner_leads == {"Carol": {"Acme"}, "Bob": {"Globex"}}
+
+    def test_analyze_partner(self):
+        """Test the partner report format."""
+        network = self.build_network()
+        assert analyze_partner(network, "Bob") == "Acme: #3 (3)\nGlobex: #1 (2)"
+        network.add_partner("Zara")
+        assert analyze_partner(network, "Zara") == "Zara: No current relationship"
+        with pytest.raises(ValueError, match="Partner 'Nobody' does not exist"):
+            analyze_partner(network, "Nobody")
+
+    def test_index_built_on_first_query(self):
+        """Test that the reverse index is only kept once a partner is queried."""
+        network = self.build_network()
+        assert network.partner_companies is None
+        network.get_partner_standing("Alice")
+        network.add_contact("Eve", "Alice", "call", 3)
+        network.bulk_load([("Contact", "Eve", "Carol", "email")])
+
+        expected = self.build_network()
+        expected.add_contact("Eve", "Alice", "call", 3)
+        expected.add_contact("Eve", "Carol", "email")
+        expected.get_partner_standing("Alice")
+        assert network.partner_companies == expected.partner_companies
+        assert network.partner_leads == expected.partner_leads == {
+            "Carol": {"Acme"}, "Alice": {"Globex"}}
+
+    def test_index_follows_removals(self):
+        """Test that the reverse index is updated by Move and Remove."""
+        network = self.build_network()
+        network.get_partner_standing("Bob")
+        network.move_employee("Eve", "Acme")
+        assert network.get_partner_standing("Bob") == [("Acme", 1, 5)]
+        network.remove_employee("Eve")
+        network.remove_contact("Dave", "Alice", "email")
+        assert network.get_partner_standing("Bob") == [("Acme", 2, 3)]
+        assert network.get_partner_standing("Alice") == [("Acme", 3, 2)]
+
+    @pytest.mark.parametrize("seed", range(4))
+    def test_matches_full_ranking(self, seed):
+        """Test the maintained index against ranking every company from scratch."""
+        network = build_random_network(seed)
+        for partner_name in network.partners:
+            expected = []
+            for company_name in sorted(network.company_partner_counts):
+                ranking = top_partners(network, company_name, len(network.partners))
+                for rank, (name, count) in enumerate(ranking, 1):
+                    if name == partner_name:
+                        expected.append((company_name, rank, count))
+            assert network.get_partner_standing(partner_name) == expected
+
+    def test_snapshot_rebuilds_index(self, tmp_path):
+        """Test that a loaded snapshot answers partner queries."""
+        network = self.build_network()
+        path = str(tmp_path / "network.snap")
+        network.save_snapshot(path)
+        loaded = Network.load_snapshot(path)
+        assert loaded.get_partner_standing("Bob") == network.get_partner_standing("Bob")
+
+
+class TestMemoizedAnalysis:
+    """Tests for analysis results memoized against the network version."""
+
+    def build(self):
+        """Build a small network with one leader."""
+        network = Network()
+        network.add_partner("Alice")
+        network.add_company("Acme")
+        network.add_company("Globex")
+        network.add_employee("Dave", "Acme")
+        network.add_contact("Dave", "Alice", "email")
+        return network
+
+    def test_unchanged_network_reuses_results(self):
+        """Test that repeated calls return the stored results."""
+        network = self.build()
+        output = analyze_network(network)
+        table = leader_table(network)
+        assert analyze_network(network) is output
+        assert leader_table(network) is table
+        assert table == [("Acme", ("Alice", 1)), ("Globex", None)]
+
+    @pytest.mark.parametrize("mutate", [
+        lambda network: network.add_partner("Bob"),
+        lambda network: network.add_company("Initech"),
+        lambda network: network.add_employee("Eve", "Globex"),
+        lambda network: network.add_contact("Dave", "Alice", "call"),
+        lambda network: network.move_employee("Dave", "Globex"),
+        lambda network: network.remove_contact("Dave", "Alice", "email"),
+        lambda network: network.remove_employee("Dave"),
+        lambda network: network.bulk_load([("Company", "Initech")]),
+    ])
+    def test_mutations_invalidate(self, mutate):
+        """Test that every mutation bumps the version and forces a recompute."""
+        network = self.build()
+        analyze_network(network)
+        leader_table(network)
+        version = network.version
+        mutate(network)
+        assert network.version > version
+        assert analyze_network(network) == format_leaders(sorted(network.companies),
+                                                          network.leaders)
+        assert leader_table(network) == [(name, network.leaders.get(name))
+                                         for name in sorted(network.companies)]
+
+    def test_failed_mutation_keeps_version(self):
+        """Test that a rejected command leaves the version unchanged."""
+        network = self.build()
+        version = network.version
+        with pytest.raises(ValueError):
+            network.add_contact("Nobody", "Alice", "email")
+        assert network.version == version
+
+    def test_clear_results(self):
+        """Test that memoized results can be dropped."""
+        network = self.build()
+        output = analyze_network(network)
+        network.clear_results()
+        assert network.results == {}
+        assert analyze_network(network) == output
+
+
+class TestFormatDelta:
+    """Tests for leader delta output."""
+
+    def test_added_removed_and_changed(self):
+        """Test one line per kind of difference, in the given order."""
+        before = {"Acme": ("Alice", 2), "Globex": ("Bob", 1), "Initech": ("Bob", 5)}
+        after = {"Acme": ("Bob", 3), "Initech": ("Bob", 5), "Umbrella": ("Alice", 1)}
+        result = format_delta(["Acme", "Globex", "Initech", "Umbrella"], before, after)
+        assert result == ("~ Acme: Alice (2) -> Bob (3)\n"
+                          "- Globex: Bob (1)\n"
+                          "+ Umbrella: Alice (1)")
+
+    def test_count_change_only(self):
+        """Test that a leader whose count changed is reported."""
+        assert format_delta(["Acme"], {"Acme": ("Alice", 2)}, {"Acme": ("Alice", 4)}) == \
+            "~ Acme: Alice (2) -> Alice (4)"
+
+    def test_no_changes(self):
+        """Test that unchanged leaders produce no output."""
+        leaders = {"Acme": ("Alice", 2)}
+        assert format_delta(["Acme", "Globex"], leaders, dict(leaders)) == ""
+
+
+class TestTopPartners:
+    """Tests for top-K partner queries."""
+
+    def build_network(self) -> Network:
+        network = Network()
+        for name in ("Zara", "Alice", "Mike", "Bob"):
+            network.add_partner(name)
+        network.add_company("Acme")
+        network.add_company("Empty")
+        network.add_employee("Dave", "Acme")
+        for partner, times in (("Zara", 2), ("Alice", 1), ("Mike", 2), ("Bob", 3)):
+            for _ in range(times):
+                network.add_contact("Dave", partner, "email")
+        return network
+
+    def test_top_k_order_and_ties(self):
+        """Test that partners are ordered by count, then alphabetically."""
+        network = self.build_network()
+        assert top_partners(network, "Acme", 3) == [("Bob", 3), ("Mike", 2), ("Zara", 2)]
+
+    def test_k_larger_than_partners(self):
+        """Test that k beyond the number of partners returns them all."""
+        network = self.build_network()
+        assert len(top_partners(network, "Acme", 10)) == 4
+
+    def test_company_without_contacts(self):
+        """Test that a company without contacts has no top partners."""
+        network = self.build_network()
+        assert top_partners(network, "Empty", 2) == []
+
+    def test_analyze_top_partners(self):
+        """Test formatted top-K output."""
+        network = self.build_network()
+        assert analyze_top_partners(network, 2) == (
+            "Acme: Bob (3), Mike (2)\nEmpty: No current relationship")
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_k1_matches_analyze_network(self, seed):
+        """Test that k=1 gives the same output as analyze_network."""
+        network = build_random_network(seed)
+        assert analyze_top_partners(network, 1) == analyze_network(network)
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_full_sort(self, seed):
+        """Test that the heap selection matches a full sort."""
+        network = build_random_network(seed)
+        for company, counts in network.company_partner_counts.items():
+            expected = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:3]
+            assert top_partners(network, company, 3) == expected
+
+
+class TestAnalyzeNetworkNumpy:
+    """Tests for the numpy analysis engine."""
+
+    @pytest.fixture(autouse=True)
+    def require_numpy(self):
+        pytest.importorskip("numpy")
+
+    def test_empty_network(self):
+        """Test that an empty network gives empty output."""
+        assert analyze_network_numpy(Network()) == ""
+
+    def test_tie_breaking_alphabetical(self):
+        """Test that ties are broken alphabetically."""
+        network = Network()
+        network.add_partner("Zara")
+        network.add_partner("Alice")
+        network.add_company("Acme")
+        network.add_company("NoContacts")
+        network.add_employee("Bob", "Acme")
+        network.add_contact("Bob", "Zara", "email")
+        network.add_contact("Bob", "Alice", "call")
+
+        result = analyze_network_numpy(network)
+        assert result == "Acme: Alice (1)\nNoContacts: No current relationship"
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_python_engine(self, seed, monkeypatch):
+        """Test that the dense path matches analyze_network exactly."""
+        import src.analyzer
+        monkeypatch.setattr(src.analyzer, "_DENSE_CELLS_PER_ROW", 1 << 30)
+        network = build_random_network(seed)
+        assert analyze_network_numpy(network) == analyze_network(network)
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_sparse_path_matches_python_engine(self, seed, monkeypatch):
+        """Test that the sort-based path matches analyze_network exactly."""
+        import src.analyzer
+        monkeypatch.setattr(src.analyzer, "_DENSE_LIMIT", 0)
+        network = build_random_network(seed)
+        assert analyze_network_numpy(network) == analyze_network(network)
@@ -0,0 +1,146 @@
+"""Tests for the approximate heavy-hitter mode."""
+import random
+import pytest
+from src.analyzer import analyze_network
+from src.approx import ApproxNetwork, SpaceSaving, analyze_approx
+from src.cli import main, parse_command, read_input
+from src.entities import Network
+
+
+class TestSpaceSaving:
+    """Tests for the SpaceSaving sketch."""
+
+    def test_exact_below_capacity(self):
+        """Test that counts are exact while partners fit in the sketch."""
+        sketch = SpaceSaving(3)
+        for name in ["Bob", "Alice", "Bob", "Carol", "Alice"]:
+            sketch.add(name)
+        assert sketch.leader() == ("Alice", 2, 0)
+
+    def test_memory_is_bounded(self):
+        """Test that the sketch never holds more than capacity counters."""
+        sketch = SpaceSaving(5)
+        for i in range(1000):
+            sketch.add(f"P{i}")
+        assert len(sketch.counters) == 5
+
+    def test_eviction_overestimates(self):
+        """Test that a replacing partner inherits the evicted count as error."""
+        sketch = SpaceSaving(1)
+        sketch.add("Alice", 3)
+        sketch.add("Bob")
+        assert sketch.counters == {"Bob": [4, 3]}
+        assert sketch.leader() == ("Bob", 4, 3)
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_error_bound(self, seed):
+        """Test that heavy hitters are kept and counts stay within total / capacity."""
+        rng = random.Random(seed)
+        capacity = 10
+        stream = ["Heavy"] * 300 + [f"P{rng.randrange(200)}" for _ in range(700)]
+        rng.shuffle(stream)
+        sketch = SpaceSaving(capacity)
+        for name in stream:
+            sketch.add(name)
+        count, error = sketch.counters["Heavy"]
+        assert 300 <= count <= 300 + len(stream) / capacity
+        assert count - error <= 300
+        assert sketch.leader()[0] == "Heavy"
+
+    def test_evicts_smallest_after_increments(self):
+        """Test that eviction uses current counts, not the counts at insertion."""
+        sketch = SpaceSaving(3)
+        for name in ["A", "B", "C"]:
+            sketch.add(name)
+        sketch.add("A", 5)
+        sketch.add("C", 2)
+        sketch.add("D")
+        assert sketch.counters == {"A": [6, 0], "C": [3, 0], "D": [2, 1]}
+        sketch.add("E")
+        assert sketch.counters == {"A": [6, 0], "C": [3, 0], "E": [3, 2]}
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_counts_sum_to_stream_length(self, seed):
+        """Test that evictions keep the Space-Saving invariant on a long stream."""
+        rng = random.Random(seed)
+        sketch = SpaceSaving(20)
+        total = 0
+        for _ in range(5000):
+            count = rng.randint(1, 3)
+            sketch.add(f"P{int(rng.paretovariate(1.0))}", count)
+            total += count
+        assert sum(count for count, _ in sketch.counters.values()) == total
+        assert len(sketch.counters) == 20
+
+    def test_invalid_capacity(self):
+        """Test that a capacity below one is rejected."""
+        with pytest.raises(ValueError):
+            SpaceSaving(0)
+
+
+class TestApproxNetwork:
+    """Tests for ApproxNetwork and analyze_approx."""
+
+    @pytest.mark.parametrize("path", ["examples/basic.txt", "examples/complex.txt",
+                                      "examples/pitch.txt", "examples/spec-example.txt"])
+    def test_examples_match_exact(self, path):
+        """Test that output equals analyze_network when no counter is evicted."""
+        network = Network()
+        approx = ApproxNetwork(epsilon=0.01)
+        for line in read_input(path):
+            parse_command(line, network)
+            parse_command(line, approx)
+        assert analyze_approx(approx) == analyze_network(network)
+
+    def test_approximate_counts_flagged(self):
+        """Test that counts that may be overestimated are marked with ~."""
+        approx = ApproxNetwork(epsilon=0.5)
+        lines = ["Company Acme", "Employee Dave Acme"]
+        lines += [f"Partner P{i}" for i in range(3)]
+        lines += ["Contact Dave P0 email", "Contact Dave P0 email",
+                  "Contact Dave P1 email", "Contact Dave P2 email"]
+        for line in lines:
+            parse_command(line, approx)
+        assert analyze_approx(approx) == "Acme: P0 (2)"
+
+        approx.add_contact("Dave", "P1", "call", 5)
+        assert analyze_approx(approx) == "Acme: P1 (~7)"
+
+    def test_same_errors_as_network(self):
+        """Test that invalid commands fail the same way as on Network."""
+        approx = ApproxNetwork()
+        approx.add_company("Acme")
+        with pytest.raises(ValueError, match="Company 'Acme' already exists"):
+            approx.add_company("Acme")
+        with pytest.raises(ValueError, match="Company 'Nope' does not exist"):
+            approx.add_employee("Dave", "Nope")
+        with pytest.raises(ValueError, match="Employee 'Dave' does not exist"):
+            approx.add_contact("Dave", "Alice", "email")
+
+    def test_invalid_epsilon(self):
+        """Test that epsilon must be in (0, 1]."""
+        with pytest.raises(ValueError):
+            ApproxNetwork(epsilon=0)
+
+
+class TestApproxCli:
+    """Tests for the --approx option."""
+
+    def test_matches_exact_output(self, capsys):
+        """Test --approx on an example where every partner fits."""
+        main(["examples/basic.txt"])
+        exact = capsys.readouterr().out
+        main(["--approx", "0.01", "examples/basic.txt"])
+        assert capsys.readouterr().out == exact
+
+    @pytest.mark.parametrize("extra", [["--top", "2"], ["--engine", "numpy"], ["--jobs", "2"],
+                                       ["--profile"], ["--stats-json", "stats.json"]])
+    def test_rejects_incompatible_options(self, extra):
+        """Test that --approx cannot be combined with exact-only options."""
+        with pytest.raises(SystemExit):
+            main(["--approx", "0.01", *extra, "examples/basic.txt"])
+
+    def test_rejects_invalid_epsilon(self):
+        """Test that --approx must be in (0, 1]."""
+        with pytest.raises(SystemExit):
+            main(["--approx", "2", "examples/basic.txt"])
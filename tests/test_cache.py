@@ -0,0 +1,144 @@
+"""Tests for the content-addressed result cache."""
+import os
+import pytest
+from src.cache import ResultCache
+from src.cli import main, parse_command, read_input
+from src.entities import Network
+
+
+BASE = "Partner Alice\nPartner Bob\nCompany Acme\nEmployee Dave Acme\nContact Dave Alice email\n"
+TAIL = "Contact Dave Bob call\nContact Dave Bob coffee\n"
+
+
+def build(text):
+    """Build a network from command text."""
+    network = Network()
+    for line in text.splitlines():
+        parse_command(line, network)
+    return network
+
+
+@pytest.fixture
+def input_file(tmp_path):
+    """Return a path holding BASE."""
+    path = tmp_path / "input.txt"
+    path.write_text(BASE)
+    return path
+
+
+class TestResultCache:
+    """Tests for ResultCache."""
+
+    def test_miss_then_hit(self, tmp_path, input_file):
+        """Test that a stored output is returned for identical input."""
+        cache = ResultCache(str(tmp_path / "cache"))
+        lookup = cache.lookup(str(input_file), "leaders")
+        assert lookup.output is None and lookup.snapshot is None
+        cache.store(lookup, build(BASE), "leaders", "Acme: Alice (1)")
+
+        lookup = ResultCache(str(tmp_path / "cache")).lookup(str(input_file), "leaders")
+        assert lookup.output == "Acme: Alice (1)"
+        assert lookup.offset == lookup.size == len(BASE)
+
+    def test_output_keyed_by_variant(self, tmp_path, input_file):
+        """Test that outputs for other options are not returned."""
+        cache = ResultCache(str(tmp_path / "cache"))
+        lookup = cache.lookup(str(input_file), "leaders")
+        cache.store(lookup, build(BASE), "leaders", "Acme: Alice (1)")
+        lookup = cache.lookup(str(input_file), "top=2")
+        assert lookup.output is None
+        assert lookup.snapshot is not None
+
+    def test_append_finds_prefix(self, tmp_path, input_file):
+        """Test that an appended input reuses the cached prefix."""
+        cache = ResultCache(str(tmp_path / "cache"))
+        cache.store(cache.lookup(str(input_file), "leaders"), build(BASE), "leaders", "x")
+        with open(input_file, 'a') as f:
+            f.write(TAIL)
+        lookup = cache.lookup(str(input_file), "leaders")
+        assert lookup.output is None
+        assert lookup.offset == len(BASE)
+        assert lookup.size == len(BASE) + len(TAIL)
+
+    def test_prefix_without_newline_not_reused(self, tmp_path):
+        """Test that an input not ending in a newline is never resumed from."""
+        path = tmp_path / "input.txt"
+        path.write_text(BASE.rstrip("\n"))
+        cache = ResultCache(str(tmp_path / "cache"))
+        cache.store(cache.lookup(str(path), "leaders"), build(BASE), "leaders", "x")
+        path.write_text(BASE.rstrip("\n") + "Extra\n")
+        assert cache.lookup(str(path), "leaders").snapshot is None
+
+    def test_lru_eviction(self, tmp_path):
+        """Test that least recently used entries are evicted past the bound."""
+        cache = ResultCache(str(tmp_path / "cache"), max_bytes=1)
+        digests = []
+        for i in range(3):
+            path = tmp_path / f"input{i}.txt"
+            path.write_text(BASE + f"Partner P{i}\n")
+            lookup = cache.lookup(str(path), "leaders")
+            cache.store(lookup, build(path.read_text()), "leaders", "x")
+            digests.append(lookup.digest)
+        assert list(cache.index) == [digests[-1]]
+        assert not os.path.exists(cache.snapshot_path(digests[0]))
+        assert os.path.exists(cache.snapshot_path(digests[-1]))
+
+
+class TestCacheCli:
+    """Tests for --cache-dir and --no-cache."""
+
+    def run(self, capsys, *argv):
+        main(list(argv))
+        return capsys.readouterr().out
+
+    def test_cached_output_matches(self, tmp_path, capsys):
+        """Test that cached runs print the same output as uncached runs."""
+        cache_dir = str(tmp_path / "cache")
+        expected = self.run(capsys, "examples/complex.txt")
+        assert self.run(capsys, "--cache-dir", cache_dir, "examples/complex.txt") == expected
+        assert self.run(capsys, "--cache-dir", cache_dir, "examples/complex.txt") == expected
+        assert self.run(capsys, "--cache-dir", cache_dir, "--top", "2", "examples/complex.txt") \
+            == self.run(capsys, "--top", "2", "examples/complex.txt")
+
+    def test_append_parses_tail(self, tmp_path, capsys, input_file):
+        """Test that a grown input gives the same output as a full parse."""
+        cache_dir = str(tmp_path / "cache")
+        self.run(capsys, "--cache-dir", cache_dir, str(input_file))
+        with open(input_file, 'a') as f:
+            f.write(TAIL)
+        output = self.run(capsys, "--cache-dir", cache_dir, str(input_file))
+        assert output == "Acme: Bob (2)\n"
+        assert output == self.run(capsys, str(input_file))
+
+    def test_hit_skips_parsing(self, tmp_path, capsys, input_file):
+        """Test that a hit does not read the input's commands."""
+        cache_dir = str(tmp_path / "cache")
+        self.run(capsys, "--cache-dir", cache_dir, str(input_file))
+        stats = tmp_path / "stats.json"
+        self.run(capsys, "--cache-dir", cache_dir, "--stats-json", str(stats), str(input_file))
+        assert "parse" not in stats.read_text()
+
+    def test_no_cache_bypasses(self, tmp_path, capsys, input_file):
+        """Test that --no-cache neither reads nor writes the cache."""
+        cache_dir = tmp_path / "cache"
+        self.run(capsys, "--cache-dir", str(cache_dir), "--no-cache", str(input_file))
+        assert not cache_dir.exists()
+
+    def test_environment_variable(self, tmp_path, capsys, input_file, monkeypatch):
+        """Test that NETWORK_ANALYZER_CACHE_DIR enables the cache."""
+        cache_dir = tmp_path / "cache"
+        monkeypatch.setenv("NETWORK_ANALYZER_CACHE_DIR", str(cache_dir))
+        self.run(capsys, str(input_file))
+        assert (cache_dir / "index.json").exists()
+
+    def test_save_snapshot_on_hit(self, tmp_path, capsys):
+        """Test that --save-snapshot still writes the network on a cache hit."""
+        network = Network()
+        for line in read_input("examples/basic.txt"):
+            parse_command(line, network)
+        cache_dir = str(tmp_path / "cache")
+        self.run(capsys, "--cache-dir", cache_dir, "examples/basic.txt")
+        self.run(capsys, "--cache-dir", cache_dir, "--save-snapshot",
+                 str(tmp_path / "net.snap"), "examples/basic.txt")
+        restored = Network.load_snapshot(str(tmp_path / "net.snap"))
+        assert restored.leaders == network.leaders
@@ -0,0 +1,157 @@
+"""Tests for checkpointed ingestion and the quarantine file."""
+import io
+import json
+import pytest
+from src.analyzer import analyze_network
+from src.checkpoint import Checkpointer, ingest
+from src.cli import main, parse_command, read_input
+from src.entities import Network
+
+
+LINES = ["Partner Alice", "Partner Bob", "Company Acme", "Employee Dave Acme",
+         "Contact Dave Alice email", "Contact Dave Bob call", "Contact Dave Bob coffee"]
+
+
+def write_lines(path, lines):
+    path.write_text("".join(f"{line}\n" for line in lines))
+
+
+class TestIngest:
+    """Tests for ingest and Checkpointer."""
+
+    def test_matches_parse_command(self):
+        """Test that ingest builds the same network as parse_command."""
+        expected = Network()
+        for line in read_input("examples/complex.txt"):
+            parse_command(line, expected)
+        network = Network()
+        with open("examples/complex.txt", 'rb') as f:
+            ingest(f, network)
+        assert analyze_network(network) == analyze_network(expected)
+
+    def test_quarantine(self):
+        """Test that bad lines are quarantined with a comment and skipped."""
+        network = Network()
+        quarantine = io.StringIO()
+        data = b"Partner Alice\nContact Nobody Alice email\nCompany Acme\n"
+        assert ingest(io.BytesIO(data), network, quarantine=quarantine) == 1
+        assert "Acme" in network.companies
+        assert quarantine.getvalue() == ("# line 2: Employee 'Nobody' does not exist\n"
+                                         "Contact Nobody Alice email\n")
+
+    def test_periodic_checkpoints(self, tmp_path):
+        """Test that checkpoints record the offset after every N lines."""
+        path = tmp_path / "input.txt"
+        write_lines(path, LINES)
+        checkpointer = Checkpointer(str(tmp_path / "ckpt"), str(path), every=3)
+        saved = []
+        original_save = checkpointer.save
+        checkpointer.save = lambda network, offset, line_number: (
+            saved.append((offset, line_number)), original_save(network, offset, line_number))
+        with open(path, 'rb') as f:
+            ingest(f, Network(), checkpointer=checkpointer)
+        assert [line_number for _, line_number in saved] == [3, 6]
+        assert saved[0][0] == len("Partner Alice\nPartner Bob\nCompany Acme\n")
+        # Only the latest snapshot is kept
+        assert sorted(p.name for p in tmp_path.glob("ckpt*")) == ["ckpt", "ckpt.2.snap"]
+
+    def test_bad_line_saves_checkpoint_and_raises(self, tmp_path):
+        """Test that a failing line is not lost work: the prefix is checkpointed."""
+        path = tmp_path / "input.txt"
+        write_lines(path, LINES[:4] + ["Contact Dave Nobody email"] + LINES[4:])
+        checkpointer = Checkpointer(str(tmp_path / "ckpt"), str(path), every=100)
+        with open(path, 'rb') as f, pytest.raises(ValueError, match="Partner 'Nobody'"):
+            ingest(f, Network(), checkpointer=checkpointer)
+
+        network, offset, line_number = checkpointer.load()
+        assert line_number == 4
+        assert list(network.employees) == ["Dave"]
+        assert path.read_bytes()[offset:].startswith(b"Contact Dave Nobody")
+
+    def test_load_rejects_other_input(self, tmp_path):
+        """Test that a checkpoint is not applied to a different file."""
+        path = tmp_path / "input.txt"
+        write_lines(path, LINES)
+        checkpointer = Checkpointer(str(tmp_path / "ckpt"), str(path))
+        checkpointer.save(Network(), 14, 1)
+        write_lines(path, ["Partner Zara"] + LINES[1:])
+        with pytest.raises(ValueError, match="does not match"):
+            checkpointer.load()
+
+    def test_load_without_checkpoint(self, tmp_path):
+        """Test that load returns None when nothing was saved."""
+        assert Checkpointer(str(tmp_path / "ckpt"), "examples/basic.txt").load() is None
+
+
+class TestCheckpointCli:
+    """Tests for --checkpoint, --resume and --quarantine."""
+
+    def test_resume_after_fixing_bad_line(self, tmp_path, capsys):
+        """Test that a run stopped by a bad line resumes where it stopped."""
+        path = tmp_path / "input.txt"
+        checkpoint = str(tmp_path / "ckpt")
+        write_lines(path, LINES[:5] + ["Contact Dave Bob meeting"] + LINES[5:])
+        with pytest.raises(ValueError):
+            main(["--checkpoint", checkpoint, "--checkpoint-every", "2", str(path)])
+        state = json.loads((tmp_path / "ckpt").read_text())
+        assert state["line_number"] == 5
+
+        # Fix the bad line; the part before the checkpoint is unchanged
+        write_lines(path, LINES[:5] + ["Contact Dave Bob email"] + LINES[5:])
+        main(["--checkpoint", checkpoint, "--resume", str(path)])
+        captured = capsys.readouterr()
+        assert captured.out == "Acme: Bob (3)\n"
+        assert "Resuming from line 6" in captured.err
+        # A finished run removes its checkpoint
+        assert list(tmp_path.glob("ckpt*")) == []
+
+    def test_resume_without_checkpoint_starts_fresh(self, tmp_path, capsys):
+        """Test that --resume with no saved checkpoint parses from the start."""
+        main(["--checkpoint", str(tmp_path / "ckpt"), "--resume", "examples/basic.txt"])
+        assert capsys.readouterr().out == "Acme: Alice (3)\nGlobex: Bob (1)\n"
+
+    def test_quarantine_keeps_going(self, tmp_path, capsys):
+        """Test that --quarantine writes bad lines and finishes the run."""
+        path = tmp_path / "input.txt"
+        quarantine = tmp_path / "bad.txt"
+        write_lines(path, LINES[:5] + ["Contact Dave", "Contact Eve Bob call"] + LINES[5:])
+        main(["--quarantine", str(quarantine), str(path)])
+        captured = capsys.readouterr()
+        assert captured.out == "Acme: Bob (2)\n"
+        assert "2 bad lines" in captured.err
+        assert quarantine.read_text().splitlines()[1::2] == ["Contact Dave", "Contact Eve Bob call"]
+
+    def test_quarantine_bypasses_cache(self, tmp_path, capsys):
+        """Test that quarantine runs neither use nor fill the result cache."""
+        path = tmp_path / "input.txt"
+        cache_dir = str(tmp_path / "cache")
+        write_lines(path, LINES)
+        main(["--cache-dir", cache_dir, str(path)])
+        capsys.readouterr()
+
+        # A bad line appended to a cached input still goes to quarantine
+        write_lines(path, LINES + ["Contact Nobody Alice email"])
+        quarantine = tmp_path / "bad.txt"
+        main(["--cache-dir", cache_dir, "--quarantine", str(quarantine), str(path)])
+        assert capsys.readouterr().out == "Acme: Bob (2)\n"
+        assert quarantine.read_text().splitlines()[1] == "Contact Nobody Alice email"
+
+        # and the quarantined result is not served to a run without quarantine
+        with pytest.raises(ValueError, match="Employee 'Nobody' does not exist"):
+            main(["--cache-dir", cache_dir, str(path)])
+
+    @pytest.mark.parametrize("argv", [
+        ["--resume", "examples/basic.txt"],
+        ["--checkpoint", "ckpt"],
+        ["--checkpoint", "ckpt", "--jobs", "2", "examples/basic.txt"],
+        ["--quarantine", "bad.txt", "--fast", "examples/basic.txt"],
+        ["--quarantine", "bad.txt", "--approx", "0.5", "examples/basic.txt"],
+        ["--quarantine", "bad.txt", "--db", "network.db", "examples/basic.txt"],
+        ["--checkpoint", "ckpt", "--db", "network.db", "examples/basic.txt"],
+        ["--checkpoint", "ckpt", "--follow", "examples/basic.txt"],
+        ["--checkpoint-every", "2", "examples/basic.txt"],
+    ])
+    def test_invalid_options(self, argv):
+        """Test option combinations that are rejected."""
+        with pytest.raises(SystemExit):
+            main(argv)
@@ -0,0 +1,108 @@
+"""Tests for transparent decompression of input files."""
+import bz2
+import gzip
+import io
+import lzma
+import pytest
+from src.analyzer import analyze_network
+from src.cli import main, read_input
+from src.compression import detect_compression, open_input, open_stream
+from src.entities import Network
+from src.parallel import parse_files_parallel
+
+
+COMPRESSORS = {"gzip": gzip.compress, "bz2": bz2.compress, "xz": lzma.compress}
+
+
+def write_compressed(path, compression: str, data: bytes) -> str:
+    """Write data compressed with the given format, under a misleading name."""
+    path.write_bytes(COMPRESSORS[compression](data))
+    return str(path)
+
+
+class TestOpenInput:
+    """Tests for detect_compression and open_input."""
+
+    @pytest.mark.parametrize("compression", sorted(COMPRESSORS))
+    def test_detect_by_magic_bytes(self, tmp_path, compression):
+        """Test that the format is detected from content, not the file name."""
+        path = write_compressed(tmp_path / "input.txt", compression, b"Partner Alice\n")
+        assert detect_compression(path) == compression
+        assert detect_compression("examples/basic.txt") is None
+
+    @pytest.mark.parametrize("compression", sorted(COMPRESSORS))
+    def test_read_input(self, tmp_path, compression):
+        """Test that compressed files read the same lines as plain ones."""
+        data = open("examples/complex.txt", 'rb').read()
+        path = write_compressed(tmp_path / "input", compression, data)
+        assert read_input(path) == read_input("examples/complex.txt")
+        with open_input(path, 'rb') as f:
+            assert f.read() == data
+
+    def test_corrupt_input(self, tmp_path):
+        """Test that decompression errors are raised in the reading thread."""
+        path = tmp_path / "input.gz"
+        path.write_bytes(gzip.compress(b"Partner Alice\n" * 100)[:-20])
+        with pytest.raises(EOFError):
+            read_input(str(path))
+
+
+class TestOpenStream:
+    """Tests for open_stream."""
+
+    @pytest.mark.parametrize("compression", [*sorted(COMPRESSORS), None])
+    def test_decompresses_by_peeking(self, compression):
+        """Test that a compressed stream is decompressed and left open."""
+        data = open("examples/complex.txt", 'rb').read()
+        stream = io.BufferedReader(io.BytesIO(
+            COMPRESSORS[compression](data) if compression else data))
+        with open_stream(stream, 'rb') as f:
+            assert f.read() == data
+        assert not stream.closed
+
+    def test_stream_without_peek(self):
+        """Test that streams without peek are read as they are."""
+        data = gzip.compress(b"Partner Alice\n")
+        with open_stream(io.BytesIO(data), 'rb') as f:
+            assert f.read() == data
+
+
+class TestCompressedCli:
+    """Tests for compressed inputs from the command line."""
+
+    def test_main(self, tmp_path, capsys):
+        """Test that main analyzes a compressed file like the plain one."""
+        path = write_compressed(tmp_path / "input.xz", "xz",
+                                open("examples/basic.txt", 'rb').read())
+        main([path])
+        assert capsys.readouterr().out == "Acme: Alice (3)\nGlobex: Bob (1)\n"
+
+    @pytest.mark.parametrize("compression", sorted(COMPRESSORS))
+    @pytest.mark.parametrize("option", [[], ["--trusted"], ["--db", "network.db"]])
+    def test_stdin(self, tmp_path, monkeypatch, capsys, compression, option):
+        """Test that compressed stdin is analyzed like the plain file."""
+        data = COMPRESSORS[compression](open("examples/basic.txt", 'rb').read())
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BufferedReader(io.BytesIO(data))))
+        main(option)
+        assert capsys.readouterr().out == "Acme: Alice (3)\nGlobex: Bob (1)\n"
+
+    def test_compressed_shards(self, tmp_path):
+        """Test compressed files among several inputs."""
+        lines = open("examples/basic.txt", 'rb').read().splitlines(keepends=True)
+        paths = [write_compressed(tmp_path / "declarations", "gzip", b"".join(lines[:7])),
+                 write_compressed(tmp_path / "contacts-1", "bz2", b"".join(lines[7:10]))]
+        plain = tmp_path / "contacts-2"
+        plain.write_bytes(b"".join(lines[10:]))
+        paths.append(str(plain))
+
+        network = Network()
+        parse_files_parallel(paths, network, jobs=2)
+        assert analyze_network(network) == "Acme: Alice (3)\nGlobex: Bob (1)"
+
+    @pytest.mark.parametrize("option", [["--fast"], ["--jobs", "2"], ["--follow"]])
+    def test_seeking_options_rejected(self, tmp_path, option):
+        """Test that options that seek in the input need an uncompressed file."""
+        path = write_compressed(tmp_path / "input.gz", "gzip", b"Partner Alice\n")
+        with pytest.raises(SystemExit):
+            main(option + [path])
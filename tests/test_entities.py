@@ -1,6 +1,7 @@
 """Tests for domain entities."""
+import random
 import pytest
-from src.entities import Partner, Company, Employee, Contact, Network
+from src.entities import CONTACT_TYPES, Partner, Company, Employee, Contact, ContactStore, Network
 
 
 class TestPartner:
@@ -62,6 +63,77 @@ class TestContact:
         assert repr(contact) == "Contact('Bob', 'Alice', 'email')"
 
 
+class TestContactStore:
+    """Tests for ContactStore class."""
+
+    def test_append_and_index(self):
+        """Test that stored contacts come back as Contact objects."""
+        store = ContactStore()
+        store.append("Bob", "Alice", "email")
+        store.append("Eve", "Alice", "pitch")
+
+        assert len(store) == 2
+        assert repr(store[0]) == "Contact('Bob', 'Alice', 'email')"
+        assert repr(store[-1]) == "Contact('Eve', 'Alice', 'pitch')"
+        assert [c.employee_name for c in store[0:2]] == ["Bob", "Eve"]
+
+    def test_index_out_of_range(self):
+        """Test that indexing past the end raises IndexError."""
+        store = ContactStore()
+        store.append("Bob", "Alice", "email")
+        with pytest.raises(IndexError):
+            store[1]
+
+    def test_names_are_interned(self):
+        """Test that repeated names share one string table entry."""
+        store = ContactStore()
+        store.append("Bob", "Alice", "email")
+        store.append("Bob", "Alice", "call")
+
+        assert store.names == ["Bob", "Alice"]
+        assert list(store.employee_ids) == [0, 0]
+        assert list(store.partner_ids) == [1, 1]
+
+    def test_iterate(self):
+        """Test iterating the store."""
+        store = ContactStore()
+        store.append("Bob", "Alice", "email")
+        store.append("Bob", "Alice", "call")
+
+        assert [c.contact_type for c in store] == ["email", "call"]
+
+    def test_repeated_contacts_share_a_row(self):
+        """Test that consecutive identical contacts are stored as one run."""
+        store = ContactStore()
+        store.append("Bob", "Alice", "email")
+        store.append("Bob", "Alice", "email", 3)
+        store.append("Bob", "Alice", "call")
+        store.append("Bob", "Alice", "email")
+
+        assert list(store.counts) == [4, 1, 1]
+        assert len(store) == 6
+        assert [c.contact_type for c in store] == ["email"] * 4 + ["call", "email"]
+        assert [store[i].contact_type for i in range(-6, 6)] == \
+            (["email"] * 4 + ["call", "email"]) * 2
+        assert [c.contact_type for c in store[3:5]] == ["email", "call"]
+        assert list(store.rows()) == [("Bob", "Alice", "email", 4), ("Bob", "Alice", "call", 1),
+                                      ("Bob", "Alice", "email", 1)]
+
+    def test_remove_from_runs(self):
+        """Test that removals shrink runs and join runs left adjacent."""
+        store = ContactStore()
+        store.append("Bob", "Alice", "email", 2)
+        store.append("Bob", "Alice", "call")
+        store.append("Bob", "Alice", "email", 2)
+        store.remove("Bob", "Alice", "call")
+        store.remove("Bob", "Alice", "email")
+
+        assert len(store) == 3
+        store.compact()
+        assert list(store.counts) == [3]
+        assert [c.contact_type for c in store] == ["email"] * 3
+
+
 class TestNetwork:
     """Tests for Network class."""
 
@@ -243,3 +315,288 @@ class TestNetwork:
         assert len(network.companies) == 2
         assert len(network.employees) == 3
         assert len(network.contacts) == 4
+
+    def test_counters_track_contacts(self):
+        """Test that per-company partner counts are maintained on add_contact."""
+        network = Network()
+        network.add_partner("Alice")
+        network.add_partner("Bob")
+        network.add_company("Acme")
+        network.add_employee("Dave", "Acme")
+        network.add_employee("Eve", "Acme")
+        network.add_contact("Dave", "Alice", "email")
+        network.add_contact("Eve", "Alice", "call")
+        network.add_contact("Dave", "Bob", "coffee")
+
+        assert network.company_partner_counts == {"Acme": {"Alice": 2, "Bob": 1}}
+        assert network.get_leader("Acme") == ("Alice", 2)
+
+    def test_leader_overtaken(self):
+        """Test that the leader changes when another partner pulls ahead."""
+        network = Network()
+        network.add_partner("Alice")
+        network.add_partner("Bob")
+        network.add_company("Acme")
+        network.add_employee("Dave", "Acme")
+        network.add_contact("Dave", "Alice", "email")
+        network.add_contact("Dave", "Bob", "email")
+        network.add_contact("Dave", "Bob", "call")
+
+        assert network.get_leader("Acme") == ("Bob", 2)
+
+    def test_leader_tie_breaks_alphabetically(self):
+        """Test that a partner tying the leader takes over only if alphabetically first."""
+        network = Network()
+        network.add_partner("Mike")
+        network.add_partner("Alice")
+        network.add_partner("Zara")
+        network.add_company("Acme")
+        network.add_employee("Dave", "Acme")
+        network.add_contact("Dave", "Mike", "email")
+        network.add_contact("Dave", "Zara", "email")
+        assert network.get_leader("Acme") == ("Mike", 1)
+        network.add_contact("Dave", "Alice", "email")
+        assert network.get_leader("Acme") == ("Alice", 1)
+
+    def test_leader_for_company_without_contacts(self):
+        """Test that companies without contacts have no leader."""
+        network = Network()
+        network.add_company("Acme")
+        assert network.get_leader("Acme") is None
+
+
+def rebuilt_counts(network):
+    """Recompute company/partner counts from scratch from the stored contacts."""
+    counts = {}
+    for contact in network.get_contacts():
+        company_name = network.employees[contact.employee_name].company_name
+        partner_counts = counts.setdefault(company_name, {})
+        partner_counts[contact.partner_name] = partner_counts.get(contact.partner_name, 0) + 1
+    return counts
+
+
+class TestMoveAndRemove:
+    """Tests for moving and removing employees and contacts."""
+
+    def build(self):
+        network = Network()
+        for name in ["Alice", "Bob"]:
+            network.add_partner(name)
+        for name in ["Acme", "Globex"]:
+            network.add_company(name)
+        network.add_employee("Dave", "Acme")
+        network.add_employee("Eve", "Acme")
+        network.add_contact("Dave", "Alice", "email")
+        network.add_contact("Dave", "Alice", "call")
+        network.add_contact("Eve", "Bob", "email")
+        return network
+
+    def test_move_employee(self):
+        """Test that moving an employee moves their contact counts."""
+        network = self.build()
+        network.move_employee("Dave", "Globex")
+        assert network.employees["Dave"].company_name == "Globex"
+        assert network.company_partner_counts == {"Acme": {"Bob": 1}, "Globex": {"Alice": 2}}
+        assert network.get_leader("Acme") == ("Bob", 1)
+        assert network.get_leader("Globex") == ("Alice", 2)
+
+    def test_remove_employee(self):
+        """Test that removing an employee removes their contacts."""
+        network = self.build()
+        network.remove_employee("Eve")
+        assert "Eve" not in network.employees
+        assert network.get_leader("Acme") == ("Alice", 2)
+        assert [c.employee_name for c in network.get_contacts()] == ["Dave", "Dave"]
+
+    def test_remove_contact(self):
+        """Test that removing contacts lowers counts and can hand over the lead."""
+        network = self.build()
+        network.remove_contact("Dave", "Alice", "EMAIL")
+        assert network.get_leader("Acme") == ("Alice", 1)
+        network.remove_contact("Dave", "Alice", "call")
+        assert network.get_leader("Acme") == ("Bob", 1)
+        assert len(network.get_contacts()) == 1
+
+    def test_remove_last_contact_clears_leader(self):
+        """Test that a company with no contacts left has no leader."""
+        network = self.build()
+        network.remove_contact("Eve", "Bob", "email")
+        network.remove_employee("Dave")
+        assert network.get_leader("Acme") is None
+        assert network.company_partner_counts == {}
+
+    def test_removed_name_can_be_reused(self):
+        """Test that a new employee with a removed employee's name starts empty."""
+        network = self.build()
+        network.remove_employee("Dave")
+        network.add_employee("Dave", "Globex")
+        network.add_contact("Dave", "Bob", "call")
+        assert [(c.employee_name, c.partner_name) for c in network.get_contacts()] == \
+            [("Eve", "Bob"), ("Dave", "Bob")]
+        assert network.company_partner_counts == {"Acme": {"Bob": 1}, "Globex": {"Bob": 1}}
+
+    def test_errors(self):
+        """Test that invalid moves and removals are rejected."""
+        network = self.build()
+        with pytest.raises(ValueError, match="Employee 'Zed' does not exist"):
+            network.move_employee("Zed", "Acme")
+        with pytest.raises(ValueError, match="Company 'Initech' does not exist"):
+            network.move_employee("Dave", "Initech")
+        with pytest.raises(ValueError, match="Employee 'Zed' does not exist"):
+            network.remove_employee("Zed")
+        with pytest.raises(ValueError, match="Contact 'Eve Bob call' does not exist"):
+            network.remove_contact("Eve", "Bob", "call")
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_random_operations_match_rebuild(self, seed):
+        """Test that incremental counters match a rebuild after random changes."""
+        rng = random.Random(seed)
+        network = Network()
+        partners = ["Zoë", "Alice", "Bob", "Carol"]
+        companies = ["C0", "C1", "C2"]
+        for name in partners:
+            network.add_partner(name)
+        for name in companies:
+            network.add_company(name)
+        employees = [f"E{i}" for i in range(6)]
+        for name in employees:
+            network.add_employee(name, rng.choice(companies))
+
+        for _ in range(300):
+            action = rng.random()
+            employee = rng.choice(employees)
+            if employee not in network.employees:
+                network.add_employee(employee, rng.choice(companies))
+            elif action < 0.6:
+                network.add_contact(employee, rng.choice(partners), rng.choice(CONTACT_TYPES))
+            elif action < 0.75:
+                network.move_employee(employee, rng.choice(companies))
+            elif action < 0.8:
+                network.remove_employee(employee)
+            else:
+                contacts = [c for c in network.get_contacts() if c.employee_name == employee]
+                if contacts:
+                    contact = rng.choice(contacts)
+                    network.remove_contact(employee, contact.partner_name, contact.contact_type)
+
+            expected = rebuilt_counts(network)
+            assert network.company_partner_counts == expected
+            for company_name in companies:
+                partner_counts = expected.get(company_name)
+                leader = None
+                if partner_counts:
+                    leader = min(partner_counts.items(), key=lambda item: (-item[1], item[0]))
+                assert network.get_leader(company_name) == leader
+
+
+def load_sequentially(network, commands):
+    """Apply split commands one at a time through the add_* methods."""
+    for command in commands:
+        if command[0] == "Partner":
+            network.add_partner(command[1])
+        elif command[0] == "Company":
+            network.add_company(command[1])
+        elif command[0] == "Employee":
+            network.add_employee(command[1], command[2])
+        elif command[0] == "Contact":
+            network.add_contact(command[1], command[2], command[3])
+
+
+BULK_COMMANDS = [
+    ("Partner", "Alice"), ("Partner", "Bob"), ("Company", "Acme"), ("Company", "Globex"),
+    ("Employee", "Dave", "Acme"), ("Employee", "Eve", "Globex"),
+    ("Contact", "Dave", "Alice", "email"), ("Contact", "Dave", "Bob", "Call"),
+    ("Contact", "Eve", "Bob", "coffee"), ("Contact", "Dave", "Alice", "email"),
+    ("Contact", "Dave", "Bob", "call"),
+]
+
+
+class TestBulkLoad:
+    """Tests for Network.bulk_load."""
+
+    def test_matches_add_methods(self):
+        """Test that a batch builds the same counters and contacts as add_*."""
+        expected = Network()
+        load_sequentially(expected, BULK_COMMANDS)
+        network = Network()
+        network.bulk_load(BULK_COMMANDS)
+
+        assert network.company_partner_counts == expected.company_partner_counts
+        assert network.leaders == expected.leaders
+        assert network.get_partner_standing("Bob") == expected.get_partner_standing("Bob")
+        assert list(map(repr, network.contacts)) == list(map(repr, expected.contacts))
+        assert network.pop_changed_companies() == {"Acme", "Globex"}
+
+    def test_batches_build_on_each_other(self):
+        """Test that a later batch can use names from an earlier one."""
+        network = Network()
+        network.bulk_load(BULK_COMMANDS[:6])
+        network.bulk_load(BULK_COMMANDS[6:])
+        network.remove_contact("Dave", "Bob", "call")
+        assert network.company_partner_counts == {"Acme": {"Alice": 2, "Bob": 1},
+                                                  "Globex": {"Bob": 1}}
+
+    @pytest.mark.parametrize("bad", [
+        ("Partner", "Bob"),
+        ("Company", "Acme"),
+        ("Employee", "Dave", "Globex"),
+        ("Employee", "Zed", "Initech"),
+        ("Contact", "Zed", "Alice", "email"),
+        ("Contact", "Dave", "Zara", "email"),
+        ("Contact", "Dave", "Alice", "meeting"),
+        ("Contact", "Eve", "Zara", "meeting"),
+    ])
+    @pytest.mark.parametrize("at", [0, 4, 7, 11])
+    def test_same_error_as_add_methods(self, bad, at):
+        """Test that the first invalid command raises add_*'s message."""
+        # Zed, Zara and Initech are declared after the bad command
+        commands = (BULK_COMMANDS[:at] + [bad] + BULK_COMMANDS[at:]
+                    + [("Partner", "Zara"), ("Company", "Initech"), ("Employee", "Zed", "Acme")])
+        with pytest.raises(ValueError) as expected:
+            load_sequentially(Network(), commands)
+
+        network = Network()
+        network.add_partner("Carol")
+        with pytest.raises(ValueError) as actual:
+            network.bulk_load(commands)
+        assert str(actual.value) == str(expected.value)
+        # Nothing from a failed batch is stored
+        assert list(network.partners) == ["Carol"]
+        assert not network.companies and not network.employees and not len(network.contacts)
+
+    def test_add_contacts_matches_add_contact(self):
+        """Test that add_contacts counts and stores like add_contact."""
+        contacts = [command[1:] for command in BULK_COMMANDS if command[0] == "Contact"]
+        expected = Network()
+        load_sequentially(expected, BULK_COMMANDS)
+        network = Network()
+        network.bulk_load(BULK_COMMANDS[:6])
+        network.add_contacts(*zip(*contacts))
+
+        assert network.company_partner_counts == expected.company_partner_counts
+        assert network.leaders == expected.leaders
+        assert list(map(repr, network.contacts)) == list(map(repr, expected.contacts))
+        network.remove_contact("Dave", "Bob", "call")
+        assert network.company_partner_counts["Acme"] == {"Alice": 2, "Bob": 1}
+
+    @pytest.mark.parametrize("bad, message", [
+        (("Zed", "Alice", "email"), "Employee 'Zed' does not exist"),
+        (("Dave", "Zara", "email"), "Partner 'Zara' does not exist"),
+        (("Dave", "Alice", "meeting"), "Invalid contact type 'meeting'"),
+    ])
+    def test_add_contacts_first_error(self, bad, message):
+        """Test that add_contacts raises for the first invalid contact and stores nothing."""
+        network = Network()
+        network.bulk_load(BULK_COMMANDS[:6])
+        contacts = [("Dave", "Alice", "email"), bad, ("Eve", "Nobody", "call")]
+        with pytest.raises(ValueError, match=message):
+            network.add_contacts(*zip(*contacts))
+        assert not len(network.contacts) and not network.company_partner_counts
+
+    def test_existing_names(self):
+        """Test duplicates of names already in the network."""
+        network = Network()
+        network.bulk_load(BULK_COMMANDS)
+        with pytest.raises(ValueError, match="Employee 'Eve' already exists"):
+            network.bulk_load([("Partner", "Carol"), ("Employee", "Eve", "Acme")])
+        assert "Carol" not in network.partners
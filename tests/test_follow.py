@@ -0,0 +1,119 @@
+"""Tests for tail mode."""
+import pytest
+from src.cli import main
+from src.entities import Network
+from src.follow import LineFollower, apply_available, format_update
+
+
+def setup_file(path):
+    """Write the declarations used by the tests."""
+    path.write_text("Partner Alice\nPartner Bob\nCompany Acme\nCompany Globex\n"
+                    "Employee Dave Acme\nEmployee Eve Globex\n")
+
+
+class TestLineFollower:
+    """Tests for reading appended lines."""
+
+    def test_reads_appended_lines(self, tmp_path):
+        """Test that lines appended after the first read are picked up."""
+        path = tmp_path / "log.txt"
+        path.write_text("Partner Alice\n")
+        with open(path) as f:
+            follower = LineFollower(f)
+            assert list(follower.read_available()) == ["Partner Alice\n"]
+            assert list(follower.read_available()) == []
+            with open(path, "a") as out:
+                out.write("Company Acme\n")
+            assert list(follower.read_available()) == ["Company Acme\n"]
+
+    def test_partial_line_held_back(self, tmp_path):
+        """Test that a line is only returned once its newline is written."""
+        path = tmp_path / "log.txt"
+        path.write_text("Partner Al")
+        with open(path) as f:
+            follower = LineFollower(f)
+            assert list(follower.read_available()) == []
+            with open(path, "a") as out:
+                out.write("ice\nCompany")
+            assert list(follower.read_available()) == ["Partner Alice\n"]
+
+
+class TestFollowUpdates:
+    """Tests for applying batches and formatting updates."""
+
+    def test_changed_only(self, tmp_path):
+        """Test that only companies whose leader changed are reported."""
+        path = tmp_path / "log.txt"
+        setup_file(path)
+        network = Network()
+        with open(path) as f:
+            follower = LineFollower(f)
+            assert apply_available(follower, network) == 6
+            network.pop_changed_companies()
+
+            with open(path, "a") as out:
+                out.write("Contact Dave Alice email\n")
+            assert apply_available(follower, network) == 1
+            assert format_update(network, changed_only=True) == "Acme: Alice (1)"
+
+            # Bob does not overtake Alice, so nothing changes
+            with open(path, "a") as out:
+                out.write("Contact Dave Bob email\n")
+            apply_available(follower, network)
+            assert format_update(network, changed_only=True) == ""
+
+            with open(path, "a") as out:
+                out.write("Contact Dave Bob call\nContact Eve Bob call\n")
+            apply_available(follower, network)
+            assert format_update(network, changed_only=True) == "Acme: Bob (2)\nGlobex: Bob (1)"
+
+    def test_all_companies(self, tmp_path):
+        """Test that the full analysis is reported without changed_only."""
+        path = tmp_path / "log.txt"
+        setup_file(path)
+        network = Network()
+        with open(path) as f:
+            follower = LineFollower(f)
+            apply_available(follower, network)
+            with open(path, "a") as out:
+                out.write("Contact Eve Alice email\n")
+            apply_available(follower, network)
+            assert format_update(network, changed_only=False) == (
+                "Acme: No current relationship\nGlobex: Alice (1)")
+
+    def test_uses_given_engine(self):
+        """Test that full updates come from the chosen analysis engine."""
+        network = Network()
+        network.add_company("Acme")
+        assert format_update(network, changed_only=False, analyze=lambda n: "engine") == "engine"
+
+    def test_new_company_reported(self):
+        """Test that a newly declared company counts as changed."""
+        network = Network()
+        network.add_company("Acme")
+        assert network.pop_changed_companies() == {"Acme"}
+        assert network.pop_changed_companies() == set()
+
+
+class TestFollowCli:
+    """Tests for --follow option checks."""
+
+    @pytest.mark.parametrize("option", [
+        ["--top", "2"], ["--partner", "Alice"], ["--fast"], ["--save-snapshot"], ["--profile"],
+        ["--stats-json", "stats.json"], ["--cache-dir", "cache"], ["--poll-interval", "0"]])
+    def test_invalid_options(self, tmp_path, monkeypatch, option):
+        """Test options that tail mode does not support."""
+        monkeypatch.chdir(tmp_path)
+        path = tmp_path / "input.txt"
+        setup_file(path)
+        with pytest.raises(SystemExit):
+            main(["--follow", *option, str(path)])
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["input.txt"]
+
+    @pytest.mark.parametrize("option", [["--changed-only"], ["--poll-interval", "1"]])
+    def test_follow_only_options(self, tmp_path, option):
+        """Test that options for tail mode are rejected without --follow."""
+        path = tmp_path / "input.txt"
+        setup_file(path)
+        with pytest.raises(SystemExit):
+            main([*option, str(path)])
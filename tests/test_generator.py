@@ -0,0 +1,53 @@
+"""Tests for the synthetic command generator."""
+import io
+import pytest
+from benchmarks.generate import generate_commands, write_commands
+from src.cli import parse_command
+from src.entities import Network
+
+
+class TestGenerateCommands:
+    """Tests for generate_commands."""
+
+    def test_deterministic(self):
+        """Test that the same seed gives the same commands."""
+        first = list(generate_commands(num_contacts=500, interleave=0.5, seed=7))
+        second = list(generate_commands(num_contacts=500, interleave=0.5, seed=7))
+        other = list(generate_commands(num_contacts=500, interleave=0.5, seed=8))
+        assert first == second
+        assert first != other
+
+    @pytest.mark.parametrize("interleave", [0.0, 0.3, 1.0])
+    def test_output_parses(self, interleave):
+        """Test that every contact references already-declared entities."""
+        network = Network()
+        for line in generate_commands(num_partners=20, num_companies=30,
+                                      employees_per_company=3, num_contacts=2_000,
+                                      interleave=interleave, seed=1):
+            parse_command(line, network)
+
+        assert len(network.partners) == 20
+        assert len(network.companies) == 30
+        assert len(network.employees) == 90
+        assert len(network.contacts) == 2_000
+
+    def test_interleave_zero_declares_first(self):
+        """Test that interleave=0 puts every declaration before the contacts."""
+        lines = list(generate_commands(num_partners=5, num_companies=4,
+                                       employees_per_company=2, num_contacts=50))
+        first_contact = next(i for i, line in enumerate(lines) if line.startswith("Contact"))
+        assert all(line.startswith("Contact") for line in lines[first_contact:])
+
+    def test_skew_favours_first_partner(self):
+        """Test that a high skew concentrates contacts on the top partner."""
+        lines = generate_commands(num_partners=10, num_contacts=2_000, skew=2.0, seed=3)
+        partners = [line.split()[2] for line in lines if line.startswith("Contact")]
+        assert partners.count("P0") > len(partners) / 2
+
+    def test_write_commands(self):
+        """Test that write_commands writes one line per command."""
+        out = io.StringIO()
+        num_lines = write_commands(out, num_partners=2, num_companies=1,
+                                   employees_per_company=1, num_contacts=3)
+        assert num_lines == 7
+        assert out.getvalue().count("\n") == 7
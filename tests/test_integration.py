@@ -1,7 +1,8 @@
 """End-to-end integration tests."""
 import pytest
 from io import StringIO
-from src.cli import parse_command, read_input, main
+from src.cli import (parse_command, parse_commands, parse_file_mmap, parse_trusted, read_input,
+                     iter_input, main)
 from src.entities import Network
 
 
@@ -50,6 +51,177 @@ class TestParseCommand:
         assert "Alice" in network.partners
 
 
+class TestMoveAndRemoveCommands:
+    """Tests for the Move and Remove commands."""
+
+    LINES = ["Partner Alice", "Partner Bob", "Company Acme", "Company Globex",
+             "Employee Dave Acme", "Employee Eve Acme",
+             "Contact Dave Alice email", "Contact Dave Alice call", "Contact Eve Bob email"]
+
+    def test_parse_command(self):
+        """Test Move and Remove through parse_command."""
+        network = Network()
+        for line in self.LINES + ["Move Dave Globex", "Remove Contact Eve Bob email",
+                                  "Remove Employee Eve"]:
+            parse_command(line, network)
+        assert network.employees["Dave"].company_name == "Globex"
+        assert "Eve" not in network.employees
+        assert network.company_partner_counts == {"Globex": {"Alice": 2}}
+
+    def test_parse_commands_matches_parse_command(self):
+        """Test that the bytes parser handles Move and Remove the same way."""
+        lines = self.LINES + ["Move Eve Globex", "Remove Contact Dave Alice call"]
+        expected = Network()
+        for line in lines:
+            parse_command(line, expected)
+        network = Network()
+        parse_commands("\n".join(lines).encode(), network)
+        assert network.company_partner_counts == expected.company_partner_counts
+        assert len(network.contacts) == len(expected.contacts) == 2
+
+    @pytest.mark.parametrize("line, message", [
+        ("Move Dave", "Invalid number of arguments"),
+        ("Remove Employee", "Invalid number of arguments"),
+        ("Remove Contact Dave Alice", "Invalid number of arguments"),
+        ("Remove Partner Alice", "Remove must be followed by Employee or Contact"),
+        ("Remove Contact Dave Bob email", "Contact 'Dave Bob email' does not exist"),
+    ])
+    def test_invalid(self, line, message):
+        """Test that malformed Move and Remove lines are rejected."""
+        network = Network()
+        for command in self.LINES:
+            parse_command(command, network)
+        with pytest.raises(ValueError, match=message):
+            parse_command(line, network)
+
+    @pytest.mark.parametrize("options", [[], ["--engine", "numpy"], ["--jobs", "2"], ["--fast"],
+                                         ["--trusted"]])
+    def test_main(self, tmp_path, capsys, options):
+        """Test Move and Remove end to end with each parsing and analysis path."""
+        if "numpy" in options:
+            pytest.importorskip("numpy")
+        path = tmp_path / "input.txt"
+        path.write_text("\n".join(self.LINES + ["Move Dave Globex", "Remove Employee Eve",
+                                                "Employee Eve Acme", "Contact Eve Alice call"])
+                        + "\n")
+        main([*options, str(path)])
+        assert capsys.readouterr().out == "Acme: Alice (1)\nGlobex: Alice (2)\n"
+
+
+class TestParseTrusted:
+    """Tests for batched loading of trusted input."""
+
+    @pytest.mark.parametrize("batch_size", [1, 7, 100_000])
+    def test_matches_parse_command(self, batch_size):
+        """Test that trusted loading builds the same network in any batch size."""
+        lines = read_input("examples/complex.txt")
+        expected = Network()
+        for line in lines:
+            parse_command(line, expected)
+        network = Network()
+        parse_trusted(lines, network, batch_size)
+        assert network.company_partner_counts == expected.company_partner_counts
+        assert network.leaders == expected.leaders
+        assert list(map(repr, network.contacts)) == list(map(repr, expected.contacts))
+
+    @pytest.mark.parametrize("batch_size", [2, 100_000])
+    def test_contact_only_batches(self, batch_size):
+        """Test batches of Contact lines, with blank lines and odd spacing."""
+        lines = (TestMoveAndRemoveCommands.LINES[:7]
+                 + ["Contact Dave Alice email\n", "\n", "  Contact\tEve Bob  Call \r\n",
+                    "Contact Dave Bob coffee"])
+        expected = Network()
+        for line in lines:
+            parse_command(line, expected)
+        network = Network()
+        parse_trusted(lines, network, batch_size)
+        assert network.leaders == expected.leaders
+        assert list(map(repr, network.contacts)) == list(map(repr, expected.contacts))
+
+    @pytest.mark.parametrize("bad_line", ["Contact Dave Alice", "Contact Dave Alice email call",
+                                          "Contact Zed Alice email"])
+    def test_contact_only_batch_errors(self, bad_line):
+        """Test that an invalid line among contacts fails like parse_command."""
+        lines = TestMoveAndRemoveCommands.LINES[:7] + ["Contact Dave Alice email", bad_line]
+        expected_network = Network()
+        with pytest.raises(ValueError) as expected:
+            for line in lines:
+                parse_command(line, expected_network)
+        network = Network()
+        with pytest.raises(ValueError) as actual:
+            parse_trusted(lines, network, 2)
+        assert str(actual.value) == str(expected.value)
+
+    @pytest.mark.parametrize("bad_line", [
+        "Contact Dave Alice", "Partner", "Move Dave Initech", "Contact Dave Zara email",
+        "Remove Partner Alice",
+    ])
+    @pytest.mark.parametrize("batch_size", [2, 100_000])
+    def test_same_error_as_parse_command(self, bad_line, batch_size):
+        """Test that errors come in the same order as line by line parsing."""
+        lines = (TestMoveAndRemoveCommands.LINES[:7] + ["Move Dave Globex", bad_line]
+                 + TestMoveAndRemoveCommands.LINES[7:] + ["Contact Eve Zara call"])
+        expected_network = Network()
+        with pytest.raises((ValueError, IndexError)) as expected:
+            for line in lines:
+                parse_command(line, expected_network)
+        network = Network()
+        with pytest.raises(expected.type) as actual:
+            parse_trusted(lines, network, batch_size)
+        assert str(actual.value) == str(expected.value)
+        assert network.employees["Dave"].company_name == "Globex"
+
+
+class TestParseCommands:
+    """Tests for the bytes-level batch parser."""
+
+    def test_parse_all_commands(self):
+        """Test parsing every command type from bytes."""
+        network = Network()
+        parse_commands(b"Partner Alice\nCompany Acme\n\n  Employee  Bob Acme \n"
+                       b"Contact Bob Alice Email\nContact Bob Alice call", network)
+        assert "Alice" in network.partners
+        assert network.employees["Bob"].company_name == "Acme"
+        assert [c.contact_type for c in network.contacts] == ["email", "call"]
+
+    def test_unknown_command_ignored(self):
+        """Test that unknown commands are skipped like parse_command does."""
+        network = Network()
+        parse_commands(b"Meeting Alice\nPartner Alice\n", network)
+        assert list(network.partners) == ["Alice"]
+
+    def test_invalid_contact_arguments(self):
+        """Test that malformed contacts raise the parse_command error."""
+        network = Network()
+        with pytest.raises(ValueError, match="Invalid number of arguments"):
+            parse_commands(b"Contact Bob Alice\n", network)
+
+    def test_contact_errors_match_network(self):
+        """Test that validation errors come from Network.add_contact."""
+        network = Network()
+        with pytest.raises(ValueError, match="Employee 'Bob' does not exist"):
+            parse_commands(b"Partner Alice\nContact Bob Alice email\n", network)
+
+    def test_parse_file_mmap(self, tmp_path):
+        """Test memory-mapped parsing matches line-by-line parsing."""
+        from src.analyzer import analyze_network
+
+        expected = Network()
+        for line in read_input("examples/complex.txt"):
+            parse_command(line, expected)
+        network = Network()
+        parse_file_mmap("examples/complex.txt", network)
+        assert analyze_network(network) == analyze_network(expected)
+
+    def test_parse_empty_file_mmap(self, tmp_path):
+        """Test that an empty file parses to an empty network."""
+        path = tmp_path / "empty.txt"
+        path.write_text("")
+        network = Network()
+        parse_file_mmap(str(path), network)
+        assert len(network.contacts) == 0
+
+
 class TestReadInput:
     """Tests for input reading."""
 
@@ -258,3 +430,123 @@ class TestEndToEnd:
         assert lines[0].startswith("Apple:")
         assert lines[1].startswith("Mango:")
         assert lines[2].startswith("Zebra:")
+
+
+class TestIterInput:
+    """Tests for streaming input."""
+
+    def test_iter_from_file(self):
+        """Test streaming lines from example file."""
+        lines = iter_input("examples/basic.txt")
+        assert not isinstance(lines, list)
+        assert list(lines) == read_input("examples/basic.txt")
+
+    def test_iter_from_stdin(self, monkeypatch):
+        """Test streaming lines from stdin."""
+        monkeypatch.setattr("sys.stdin", StringIO("Partner Alice\nCompany Acme\n"))
+        lines = list(iter_input(None))
+        assert lines == ["Partner Alice\n", "Company Acme\n"]
+
+    def test_main_streams_stdin(self, monkeypatch, capsys):
+        """Test main builds the network from piped stdin."""
+        monkeypatch.setattr("sys.argv", ["network_analyzer.py"])
+        with open("examples/basic.txt") as f:
+            monkeypatch.setattr("sys.stdin", StringIO(f.read()))
+        main()
+        assert capsys.readouterr().out == "Acme: Alice (3)\nGlobex: Bob (1)\n"
+
+    def test_main_numpy_engine(self, capsys):
+        """Test selecting the numpy engine from the command line."""
+        pytest.importorskip("numpy")
+        main(["--engine", "numpy", "examples/complex.txt"])
+        numpy_output = capsys.readouterr().out
+        main(["examples/complex.txt"])
+        assert numpy_output == capsys.readouterr().out
+
+    def test_main_parallel_jobs(self, capsys):
+        """Test parsing with worker processes from the command line."""
+        main(["--jobs", "2", "examples/complex.txt"])
+        parallel_output = capsys.readouterr().out
+        main(["examples/complex.txt"])
+        assert parallel_output == capsys.readouterr().out
+
+    def test_main_fast_parser(self, capsys):
+        """Test the --fast parser from the command line."""
+        main(["--fast", "examples/pitch.txt"])
+        fast_output = capsys.readouterr().out
+        main(["examples/pitch.txt"])
+        assert fast_output == capsys.readouterr().out
+
+    def test_main_top_partners(self, capsys):
+        """Test the --top option from the command line."""
+        main(["--top", "2", "examples/basic.txt"])
+        assert capsys.readouterr().out == "Acme: Alice (3), Bob (1)\nGlobex: Bob (1)\n"
+
+    def test_main_partner(self, capsys):
+        """Test the --partner option from the command line."""
+        main(["--partner", "Bob", "examples/basic.txt"])
+        assert capsys.readouterr().out == "Acme: #2 (1)\nGlobex: #1 (1)\n"
+
+    def test_main_partner_with_top(self):
+        """Test that --partner and --top are mutually exclusive."""
+        with pytest.raises(SystemExit):
+            main(["--partner", "Bob", "--top", "2", "examples/basic.txt"])
+
+    def test_main_delta(self, tmp_path, capsys):
+        """Test --delta against a saved snapshot, and saving the new state."""
+        prior = str(tmp_path / "prior.snap")
+        main(["--save-snapshot", prior, "examples/basic.txt"])
+        capsys.readouterr()
+
+        path = tmp_path / "more.txt"
+        path.write_text("Company Initech\nEmployee Gina Initech\n"
+                        "Contact Gina Bob email\nContact Frank Alice call\n"
+                        "Contact Frank Alice email\nContact Eve Alice email\n")
+        current = str(tmp_path / "current.snap")
+        main(["--delta", prior, "--save-snapshot", current, str(path)])
+        assert capsys.readouterr().out == ("~ Acme: Alice (3) -> Alice (4)\n"
+                                           "~ Globex: Bob (1) -> Alice (2)\n"
+                                           "+ Initech: Bob (1)\n")
+
+        # Comparing two snapshots directly gives the same delta
+        main(["--delta", prior, current])
+        assert capsys.readouterr().out == ("~ Acme: Alice (3) -> Alice (4)\n"
+                                           "~ Globex: Bob (1) -> Alice (2)\n"
+                                           "+ Initech: Bob (1)\n")
+
+    def test_main_delta_no_changes(self, tmp_path, capsys):
+        """Test that --delta prints nothing when no leader changed."""
+        prior = str(tmp_path / "prior.snap")
+        main(["--save-snapshot", prior, "examples/basic.txt"])
+        capsys.readouterr()
+        main(["--delta", prior, prior])
+        assert capsys.readouterr().out == ""
+
+    def test_main_delta_with_top(self):
+        """Test that --delta cannot be combined with --top."""
+        with pytest.raises(SystemExit):
+            main(["--delta", "prior.snap", "--top", "2", "examples/basic.txt"])
+
+    def test_main_glob_inputs(self, tmp_path, capsys):
+        """Test several input files and glob patterns from the command line."""
+        lines = open("examples/basic.txt").read().splitlines(keepends=True)
+        (tmp_path / "declarations.txt").write_text("".join(lines[:7]))
+        (tmp_path / "contacts-1.txt").write_text("".join(lines[7:10]))
+        (tmp_path / "contacts-2.txt").write_text("".join(lines[10:]))
+
+        main([str(tmp_path / "contacts-*.txt"), str(tmp_path / "declarations.txt")])
+        assert capsys.readouterr().out == "Acme: Alice (3)\nGlobex: Bob (1)\n"
+
+    @pytest.mark.parametrize("argv", [
+        ["does-not-exist-*.txt"],
+        ["--fast", "examples/basic.txt", "examples/pitch.txt"],
+    ])
+    def test_main_invalid_inputs(self, argv):
+        """Test rejected input lists."""
+        with pytest.raises(SystemExit):
+            main(argv)
+
+    def test_main_trusted_with_jobs(self):
+        """Test that --trusted cannot be combined with --jobs."""
+        with pytest.raises(SystemExit):
+            main(["--trusted", "--jobs", "2", "examples/basic.txt"])
@@ -0,0 +1,187 @@
+"""Tests for multi-process parsing."""
+import random
+import pytest
+from src.analyzer import analyze_network
+from src.cli import parse_command
+from src.entities import Network
+from src.parallel import (split_file, parse_chunk, apply_events, parse_file_parallel,
+                          parse_files_parallel)
+
+
+def parse_sequential(path: str) -> Network:
+    """Parse a file line by line, the way main does without --jobs."""
+    network = Network()
+    with open(path) as f:
+        for line in f:
+            parse_command(line, network)
+    return network
+
+
+def parse_chunked(path: str, num_chunks: int) -> Network:
+    """Parse a file chunk by chunk in-process."""
+    network = Network()
+    for start, end in split_file(path, num_chunks):
+        apply_events(parse_chunk(path, start, end), network)
+    return network
+
+
+def write_random_commands(path, seed: int) -> None:
+    """Write a command file with declarations interleaved among contacts."""
+    rng = random.Random(seed)
+    lines = ["Company Acme", "Company Globex", "Partner Alice",
+             "Employee Dave Acme", "Employee Eve Globex"]
+    partners = ["Alice"]
+    employees = ["Dave", "Eve"]
+    for i in range(300):
+        if i % 50 == 25:
+            partners.append(f"P{i}")
+            lines.append(f"Partner P{i}")
+        elif i % 70 == 35:
+            employees.append(f"E{i}")
+            lines.append(f"Employee E{i} {rng.choice(['Acme', 'Globex'])}")
+        else:
+            lines.append(f"Contact {rng.choice(employees)} {rng.choice(partners)} "
+                         f"{rng.choice(['email', 'Call', 'coffee'])}")
+    path.write_text("\n".join(lines) + "\n")
+
+
+class TestSplitFile:
+    """Tests for splitting files into chunks."""
+
+    def test_chunks_cover_file_on_line_boundaries(self, tmp_path):
+        """Test that chunks are contiguous and start at line starts."""
+        path = tmp_path / "input.txt"
+        write_random_commands(path, 0)
+        data = path.read_bytes()
+
+        chunks = split_file(str(path), 7)
+        assert chunks[0][0] == 0
+        assert chunks[-1][1] == len(data)
+        for (_, end), (start, _) in zip(chunks, chunks[1:]):
+            assert end == start
+            assert data[start - 1:start] == b"\n"
+
+    def test_empty_file(self, tmp_path):
+        """Test that an empty file has no chunks."""
+        path = tmp_path / "empty.txt"
+        path.write_text("")
+        assert split_file(str(path), 4) == []
+
+
+class TestParseChunk:
+    """Tests for chunk parsing."""
+
+    def test_repeated_contacts_are_batched(self, tmp_path):
+        """Test that only first uses are replayed and the rest are counted."""
+        path = tmp_path / "input.txt"
+        path.write_text("Partner Alice\n"
+                        "Contact Bob Alice email\n"
+                        "Contact Bob Alice email\n"
+                        "Contact Bob Alice Call\n")
+        events = parse_chunk(str(path), 0, path.stat().st_size)
+        assert events == [
+            "Partner Alice\n",
+            "Contact Bob Alice email\n",
+            {("Bob", "Alice", "email"): 1, ("Bob", "Alice", "call"): 1},
+        ]
+
+
+class TestParseFileParallel:
+    """Tests for parallel parsing against sequential parsing."""
+
+    @pytest.mark.parametrize("seed", range(4))
+    @pytest.mark.parametrize("num_chunks", [1, 3, 17])
+    def test_matches_sequential(self, tmp_path, seed, num_chunks):
+        """Test that chunked parsing builds the same network."""
+        path = tmp_path / "input.txt"
+        write_random_commands(path, seed)
+
+        expected = parse_sequential(str(path))
+        network = parse_chunked(str(path), num_chunks)
+        assert analyze_network(network) == analyze_network(expected)
+        assert network.company_partner_counts == expected.company_partner_counts
+        assert len(network.contacts) == len(expected.contacts)
+
+    @pytest.mark.parametrize("bad_line", [
+        "Contact Nobody Alice email",
+        "Contact Dave Nobody email",
+        "Contact Dave Alice meeting",
+        "Contact Dave Alice",
+        "Contact Zed Alice email",
+    ])
+    @pytest.mark.parametrize("num_chunks", [1, 5])
+    def test_same_error_as_sequential(self, tmp_path, bad_line, num_chunks):
+        """Test that invalid lines raise the same error as sequential parsing."""
+        path = tmp_path / "input.txt"
+        write_random_commands(path, 1)
+        lines = path.read_text().splitlines()
+        # Zed is declared, but only after the bad line uses it
+        lines.insert(200, bad_line)
+        lines.append("Employee Zed Acme")
+        path.write_text("\n".join(lines) + "\n")
+
+        with pytest.raises(ValueError) as expected:
+            parse_sequential(str(path))
+        with pytest.raises(ValueError) as actual:
+            parse_chunked(str(path), num_chunks)
+        assert str(actual.value) == str(expected.value)
+
+    def test_worker_processes(self, tmp_path):
+        """Test parsing with a real process pool."""
+        path = tmp_path / "input.txt"
+        write_random_commands(path, 2)
+
+        network = Network()
+        parse_file_parallel(str(path), network, jobs=2)
+        assert analyze_network(network) == analyze_network(parse_sequential(str(path)))
+
+
+def write_shards(tmp_path, seed: int, num_shards: int) -> list[str]:
+    """Write a declaration file followed by Contact-only shard files."""
+    rng = random.Random(seed)
+    declarations = tmp_path / "declarations.txt"
+    declarations.write_text("Company Acme\nCompany Globex\nPartner Alice\nPartner Bob\n"
+                            "Employee Dave Acme\nEmployee Eve Globex\n")
+    paths = [str(declarations)]
+    for i in range(num_shards):
+        shard = tmp_path / f"contacts-{i:02d}.txt"
+        shard.write_text("".join(
+            f"Contact {rng.choice(['Dave', 'Eve'])} {rng.choice(['Alice', 'Bob'])} "
+            f"{rng.choice(['email', 'call'])}\n" for _ in range(rng.randrange(0, 40))))
+        paths.append(str(shard))
+    return paths
+
+
+class TestParseFilesParallel:
+    """Tests for parsing many files with one pool."""
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_matches_concatenation(self, tmp_path, jobs):
+        """Test that many files build the same network as one concatenated file."""
+        paths = write_shards(tmp_path, 3, 6)
+        combined = tmp_path / "combined.txt"
+        combined.write_text("".join(open(path).read() for path in paths))
+
+        network = Network()
+        parse_files_parallel(paths, network, jobs)
+        expected = parse_sequential(str(combined))
+        assert analyze_network(network) == analyze_network(expected)
+        assert network.company_partner_counts == expected.company_partner_counts
+
+    def test_shards_before_declarations(self, tmp_path):
+        """Test that Contact-only files are applied after declaration files."""
+        paths = write_shards(tmp_path, 4, 3)
+        network = Network()
+        parse_files_parallel(paths[1:] + paths[:1], network, jobs=1)
+
+        expected = Network()
+        parse_files_parallel(paths, expected, jobs=1)
+        assert analyze_network(network) == analyze_network(expected)
+
+    def test_shard_error(self, tmp_path):
+        """Test that an invalid contact in a shard raises the sequential error."""
+        paths = write_shards(tmp_path, 5, 2)
+        with open(paths[1], 'a') as f:
+            f.write("Contact Dave Nobody email\n")
+        with pytest.raises(ValueError, match="Partner 'Nobody' does not exist"):
+            parse_files_parallel(paths, Network(), jobs=1)
@@ -0,0 +1,96 @@
+"""Tests for read-ahead of input streams."""
+import io
+import os
+import threading
+import pytest
+from src.cli import iter_input, main
+from src.pipeline import BlockReader, open_pipelined
+
+
+class CountingStream(io.BytesIO):
+    """BytesIO that counts read1 calls."""
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.reads = 0
+
+    def read1(self, size=-1):
+        self.reads += 1
+        return super().read1(size)
+
+
+class TestBlockReader:
+    """Tests for BlockReader and open_pipelined."""
+
+    def test_small_blocks(self):
+        """Test reading across many small blocks."""
+        data = b"".join(b"Contact Dave Alice email %d\n" % i for i in range(1000))
+        reader = io.BufferedReader(BlockReader(lambda: io.BytesIO(data), block_size=7,
+                                               queued_blocks=2))
+        assert reader.readlines() == data.splitlines(keepends=True)
+        reader.close()
+
+    def test_close_early(self):
+        """Test that closing before the end stops the reader thread."""
+        raw = BlockReader(lambda: io.BytesIO(b"x" * 10000), block_size=10, queued_blocks=1)
+        assert raw.read(5) == b"xxxxx"
+        raw.close()
+        assert not raw._thread.is_alive()
+
+    def test_backpressure(self):
+        """Test that the reader thread stops once the queue is full."""
+        stream = CountingStream(b"x" * 1000)
+        with open_pipelined(stream, 'rb', block_size=10, queued_blocks=2) as f:
+            # Wait until the thread has blocked on the full queue
+            while not f.raw._queue.full():
+                pass
+            assert stream.reads <= 3
+            assert f.read() == b"x" * 1000
+        assert not stream.closed
+
+    def test_pipe(self):
+        """Test reading a pipe as it is written, in partial chunks."""
+        read_fd, write_fd = os.pipe()
+        lines = [b"Partner P%d\n" % i for i in range(2000)]
+
+        def produce():
+            with os.fdopen(write_fd, 'wb', buffering=0) as w:
+                for line in lines:
+                    w.write(line)
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        with os.fdopen(read_fd, 'rb') as r, open_pipelined(r, 'r', block_size=64) as f:
+            assert [line.encode() for line in f] == lines
+        producer.join()
+
+    def test_reader_error(self):
+        """Test that errors in the reader thread are raised to the consumer."""
+        def opener():
+            raise OSError("broken pipe")
+
+        with pytest.raises(OSError, match="broken pipe"):
+            BlockReader(opener).read()
+
+
+class TestStdinPipeline:
+    """Tests for read-ahead of stdin from the command line."""
+
+    def test_iter_input(self, monkeypatch):
+        """Test that stdin with a binary buffer is read through the pipeline."""
+        data = b"Partner Alice\nCompany Acme\n"
+        monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(data)))
+        assert list(iter_input(None, chunk_size=4, queued_chunks=1)) == \
+            ["Partner Alice\n", "Company Acme\n"]
+
+    def test_main(self, monkeypatch, capsys):
+        """Test main with small read-ahead chunks."""
+        with open("examples/basic.txt", 'rb') as f:
+            monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(f.read())))
+        main(["--read-chunk", "1", "--read-ahead", "1"])
+        assert capsys.readouterr().out == "Acme: Alice (3)\nGlobex: Bob (1)\n"
+
+    def test_invalid_options(self):
+        """Test that chunk sizes and queue lengths must be positive."""
+        with pytest.raises(SystemExit):
+            main(["--read-ahead", "0", "examples/basic.txt"])
@@ -0,0 +1,112 @@
+"""Tests for stage timing and counters."""
+import json
+import pytest
+from src.cli import main
+from src.entities import Network
+from src.profiling import Profiler
+
+
+class TestProfiler:
+    """Tests for the Profiler class."""
+
+    def test_disabled_profiler_records_nothing(self):
+        """Test that a disabled profiler passes lines through untouched."""
+        profiler = Profiler(enabled=False)
+        lines = ["Partner Alice\n"]
+        with profiler.stage("parse"):
+            assert list(profiler.timed_lines(lines)) == lines
+        profiler.record_network(Network())
+        assert profiler.stages == {}
+        assert profiler.counters == {}
+
+    def test_timed_lines_counts_commands(self):
+        """Test that lines and commands by type are counted."""
+        profiler = Profiler()
+        lines = ["Partner Alice\n", "\n", "Company Acme\n", "Partner Bob\n"]
+        assert list(profiler.timed_lines(lines)) == lines
+        assert profiler.counters == {"lines": 4, "commands.Partner": 2, "commands.Company": 1}
+        assert "read_input" in profiler.stages
+
+    def test_timed_lines_counts_bytes_commands(self):
+        """Test that commands read as bytes are counted under their decoded names."""
+        profiler = Profiler()
+        list(profiler.timed_lines([b"Partner Alice\n", b"Contact Dave Alice email\n"]))
+        assert profiler.counters == {"lines": 2, "commands.Partner": 1, "commands.Contact": 1}
+
+    def test_merge(self):
+        """Test that merged stages are prefixed and counters are added."""
+        profiler = Profiler()
+        profiler.add_time("parse", 1.0, 1.0)
+        profiler.count("lines", 3)
+        worker = Profiler()
+        worker.add_time("parse", 2.0, 1.5)
+        worker.count("lines", 4)
+        profiler.merge(worker, "workers.")
+        profiler.merge(worker, "workers.")
+        assert profiler.stages == {"parse": [1.0, 1.0], "workers.parse": [4.0, 3.0]}
+        assert profiler.counters == {"lines": 11}
+
+    def test_stage_excludes_nested_stage(self):
+        """Test that a nested stage's time is not charged to its parent."""
+        profiler = Profiler()
+        with profiler.stage("parse", exclude="read_input"):
+            profiler.add_time("read_input", 5.0, 5.0)
+        wall, cpu = profiler.stages["parse"]
+        assert wall == pytest.approx(-5.0, abs=0.5)
+        assert cpu == pytest.approx(-5.0, abs=0.5)
+
+    def test_to_dict_throughput(self):
+        """Test that lines per second is computed from ingest time."""
+        profiler = Profiler()
+        profiler.add_time("read_input", 1.0, 1.0)
+        profiler.add_time("parse", 3.0, 3.0)
+        profiler.count("lines", 100)
+        assert profiler.to_dict()["lines_per_second"] == 25
+
+
+class TestProfileCli:
+    """Tests for --profile and --stats-json."""
+
+    def test_stats_json(self, tmp_path, capsys):
+        """Test that --stats-json writes stages and counters."""
+        path = tmp_path / "stats.json"
+        main(["--stats-json", str(path), "examples/basic.txt"])
+        assert capsys.readouterr().out == "Acme: Alice (3)\nGlobex: Bob (1)\n"
+
+        stats = json.loads(path.read_text())
+        assert set(stats["stages"]) == {"read_input", "parse", "analyze", "output"}
+        assert stats["counters"]["commands.Contact"] == 5
+        assert stats["counters"]["companies"] == 2
+        assert stats["lines_per_second"] > 0
+
+    def test_profile_report_on_stderr(self, capsys):
+        """Test that --profile leaves stdout unchanged."""
+        main(["--profile", "examples/basic.txt"])
+        captured = capsys.readouterr()
+        assert captured.out == "Acme: Alice (3)\nGlobex: Bob (1)\n"
+        assert "analyze" in captured.err
+
+    @pytest.mark.parametrize("options, shards, stages", [
+        (["--fast"], 0, {"read_input", "parse"}),
+        (["--jobs", "2"], 0, {"workers.read_input", "workers.parse", "parse"}),
+        (["--jobs", "2"], 1, {"workers.read_input", "workers.parse", "parse"}),
+        ([], 1, {"workers.read_input", "workers.parse", "parse"}),
+    ])
+    def test_counts_for_other_parsers(self, tmp_path, capsys, options, shards, stages):
+        """Test that --fast, --jobs and several inputs report reading, lines and commands."""
+        inputs = ["examples/basic.txt"]
+        for i in range(shards):
+            shard = tmp_path / f"shard-{i}.txt"
+            shard.write_text("Contact Dave Alice email\n")
+            inputs.append(str(shard))
+        path = tmp_path / "stats.json"
+        main(["--stats-json", str(path), *options, *inputs])
+        capsys.readouterr()
+
+        stats = json.loads(path.read_text())
+        assert stages <= set(stats["stages"])
+        assert stats["counters"]["lines"] == 12 + shards
+        assert stats["counters"]["commands.Contact"] == 5 + shards
+        assert stats["counters"]["commands.Partner"] == 2
+        assert stats["counters"]["contacts"] == 5 + shards
+        assert stats["lines_per_second"] > 0
@@ -0,0 +1,126 @@
+"""Tests for the query server."""
+import asyncio
+import pytest
+from src.cli import main
+from src.entities import Network
+from src.server import NetworkServer
+
+
+async def request(reader, writer, *lines: str) -> list[str]:
+    """Send request lines and read back one response."""
+    writer.write("".join(f"{line}\n" for line in lines).encode())
+    await writer.drain()
+    status = (await reader.readline()).decode().rstrip("\n")
+    if not status.startswith("OK"):
+        return [status]
+    count = int(status.split()[1])
+    return [status] + [(await reader.readline()).decode().rstrip("\n") for _ in range(count)]
+
+
+def run_session(session, network: Network = None):
+    """Start a server on a free port, run session(reader, writer), then stop."""
+    async def main():
+        server = await NetworkServer(network or Network()).start("127.0.0.1:0")
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            return await session(reader, writer)
+        finally:
+            writer.close()
+            server.close()
+            await server.wait_closed()
+    return asyncio.run(main())
+
+
+DECLARATIONS = [
+    "Partner Alice", "Partner Bob", "Company Acme", "Company Globex",
+    "Employee Dave Acme", "Employee Eve Globex",
+]
+
+
+class TestNetworkServer:
+    """Tests for server writes and queries."""
+
+    def test_batch_then_queries(self):
+        """Test applying a batch and answering leader queries."""
+        async def session(reader, writer):
+            lines = DECLARATIONS + ["Contact Dave Alice email", "Contact Dave Bob call",
+                                    "Contact Dave Bob coffee"]
+            assert await request(reader, writer, f"BATCH {len(lines)}", *lines) == ["OK 0"]
+            assert await request(reader, writer, "LEADERS") == [
+                "OK 2", "Acme: Bob (2)", "Globex: No current relationship"]
+            assert await request(reader, writer, "LEADER Acme") == ["OK 1", "Acme: Bob (2)"]
+            assert await request(reader, writer, "TOP Acme 5") == ["OK 2", "Bob (2)", "Alice (1)"]
+            assert await request(reader, writer, "COMPANY Acme") == ["OK 2", "Alice 1", "Bob 2"]
+            assert await request(reader, writer, "PARTNER Alice") == ["OK 1", "Acme: #2 (1)"]
+            assert await request(reader, writer, "PARTNER Zed") == ["ERR Partner 'Zed' does not exist"]
+        run_session(session)
+
+    def test_single_command_write(self):
+        """Test that a bare command line is applied as a write."""
+        async def session(reader, writer):
+            assert await request(reader, writer, "Company Acme") == ["OK 0"]
+            assert await request(reader, writer, "STATS") == [
+                "OK 4", "partners 0", "companies 1", "employees 0", "contacts 0"]
+        run_session(session)
+
+    def test_batch_error_reports_line(self):
+        """Test that a failing batch line is reported with its position."""
+        async def session(reader, writer):
+            response = await request(reader, writer, "BATCH 2", "Partner Alice",
+                                     "Contact Bob Alice email")
+            assert response == ["ERR line 2: Employee 'Bob' does not exist"]
+            # Lines before the error were applied, and the connection still works
+            assert await request(reader, writer, "STATS") == [
+                "OK 4", "partners 1", "companies 0", "employees 0", "contacts 0"]
+        run_session(session)
+
+    def test_query_errors(self):
+        """Test errors for unknown companies and bad arguments."""
+        async def session(reader, writer):
+            assert await request(reader, writer, "LEADER Nope") == [
+                "ERR Company 'Nope' does not exist"]
+            assert await request(reader, writer, "TOP") == ["ERR Invalid number of arguments"]
+            assert await request(reader, writer, "BATCH x") == ["ERR Usage: BATCH <n>"]
+            assert await request(reader, writer, "leaders") == ["ERR Unknown request 'leaders'"]
+            assert await request(reader, writer, "FOO bar") == ["ERR Unknown request 'FOO'"]
+        run_session(session)
+
+    def test_queries_answered_during_large_batch(self):
+        """Test that another connection is served while a batch is ingested."""
+        network = Network()
+        network.add_partner("Alice")
+        network.add_company("Acme")
+        network.add_employee("Dave", "Acme")
+
+        async def session(reader, writer):
+            port = writer.get_extra_info("peername")[1]
+            contacts = ["Contact Dave Alice email"] * 20_000
+            writer.write(("BATCH 20000\n" + "\n".join(contacts) + "\n").encode())
+            await writer.drain()
+
+            other_reader, other_writer = await asyncio.open_connection("127.0.0.1", port)
+            response = await request(other_reader, other_writer, "LEADER Acme")
+            other_writer.close()
+            assert response[0] == "OK 1"
+
+            assert (await reader.readline()).decode() == "OK 0\n"
+            assert network.get_leader("Acme") == ("Alice", 20_000)
+        run_session(session, network)
+
+
+class TestServeCli:
+    """Tests for the --serve option."""
+
+    @pytest.mark.parametrize("extra", [
+        ["--top", "2"], ["--partner", "Alice"], ["--engine", "numpy"],
+        ["--save-snapshot", "out.snap"], ["--profile"], ["--stats-json", "stats.json"],
+        ["--cache-dir", "cache"], ["--db", "network.db"], ["--follow"],
+        ["--checkpoint", "ckpt"], ["--quarantine", "bad.txt"],
+    ])
+    def test_invalid_options(self, tmp_path, monkeypatch, extra):
+        """Test that options --serve would ignore are rejected before serving."""
+        monkeypatch.chdir(tmp_path)
+        with pytest.raises(SystemExit):
+            main(["--serve", "127.0.0.1:0", *extra])
+        assert list(tmp_path.iterdir()) == []
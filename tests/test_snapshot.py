@@ -0,0 +1,156 @@
+"""Tests for binary network snapshots."""
+import pytest
+from src.analyzer import analyze_network
+from src.cli import main, parse_command, read_input
+from src.entities import Network
+from src.snapshot import is_snapshot, load_snapshot, save_snapshot
+
+
+def build_network(path: str = "examples/complex.txt") -> Network:
+    """Build a network from an example file."""
+    network = Network()
+    for line in read_input(path):
+        parse_command(line, network)
+    return network
+
+
+class TestSnapshot:
+    """Tests for saving and loading snapshots."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that a loaded snapshot matches the saved network."""
+        network = build_network()
+        path = str(tmp_path / "network.snap")
+        network.save_snapshot(path)
+        loaded = Network.load_snapshot(path)
+
+        assert list(loaded.partners) == list(network.partners)
+        assert list(loaded.companies) == list(network.companies)
+        assert ({name: e.company_name for name, e in loaded.employees.items()}
+                == {name: e.company_name for name, e in network.employees.items()})
+        assert ([repr(c) for c in loaded.get_contacts()]
+                == [repr(c) for c in network.get_contacts()])
+        assert loaded.company_partner_counts == network.company_partner_counts
+        assert loaded.leaders == network.leaders
+        assert analyze_network(loaded) == analyze_network(network)
+
+    def test_run_lengths_round_trip(self, tmp_path):
+        """Test that repeated contacts keep their run lengths."""
+        network = build_network()
+        network.add_contact("Dave", "Alice", "email", 1000)
+        path = str(tmp_path / "network.snap")
+        network.save_snapshot(path)
+        loaded = Network.load_snapshot(path)
+
+        assert list(loaded.contacts.counts) == list(network.contacts.counts)
+        assert len(loaded.get_contacts()) == len(network.get_contacts())
+        assert analyze_network(loaded) == analyze_network(network)
+
+    def test_loads_version_1(self, tmp_path):
+        """Test that snapshots without run lengths still load."""
+        from src.snapshot import HEADER
+
+        network = build_network()
+        path = tmp_path / "network.snap"
+        network.save_snapshot(str(path))
+        assert max(network.contacts.counts) == 1
+
+        # Rewrite as version 1: no run length column, which sits just before
+        # the counter and leader sections
+        data = bytearray(path.read_bytes())
+        fields = list(HEADER.unpack_from(data, 0))
+        num_rows, num_counters, num_leaders = fields[8:11]
+        tail = (num_counters + num_leaders) * 16
+        start = len(data) - tail - 4 * num_rows
+        del data[start:start + 4 * num_rows]
+        fields[1] = 1
+        data[:HEADER.size] = HEADER.pack(*fields)
+        path.write_bytes(bytes(data))
+
+        loaded = Network.load_snapshot(str(path))
+        assert [repr(c) for c in loaded.get_contacts()] == [repr(c) for c in network.get_contacts()]
+        assert analyze_network(loaded) == analyze_network(network)
+
+    def test_loaded_network_accepts_new_commands(self, tmp_path):
+        """Test that a loaded network keeps interning and counting correctly."""
+        network = build_network()
+        path = str(tmp_path / "network.snap")
+        save_snapshot(network, path)
+        loaded = load_snapshot(path)
+
+        for target in (network, loaded):
+            parse_command("Partner Zed", target)
+            parse_command("Employee Yan Hooli", target)
+            parse_command("Contact Yan Zed pitch", target)
+            parse_command("Contact Dave Zed call", target)
+
+        assert analyze_network(loaded) == analyze_network(network)
+        assert loaded.contacts.names == network.contacts.names
+
+    def test_failed_save_keeps_old_snapshot(self, tmp_path, monkeypatch):
+        """Test that a save that fails part way leaves the old file whole."""
+        import src.snapshot
+
+        network = build_network()
+        path = tmp_path / "network.snap"
+        network.save_snapshot(str(path))
+        saved = path.read_bytes()
+
+        def fail(column):
+            raise OSError("disk full")
+
+        network.add_partner("Zara")
+        monkeypatch.setattr(src.snapshot, "_to_bytes", fail)
+        with pytest.raises(OSError, match="disk full"):
+            network.save_snapshot(str(path))
+        assert path.read_bytes() == saved
+        assert [p.name for p in tmp_path.iterdir()] == ["network.snap"]
+
+    def test_empty_network(self, tmp_path):
+        """Test snapshotting an empty network."""
+        path = str(tmp_path / "empty.snap")
+        Network().save_snapshot(path)
+        loaded = Network.load_snapshot(path)
+        assert len(loaded.contacts) == 0
+        assert analyze_network(loaded) == ""
+
+    def test_unicode_names(self, tmp_path):
+        """Test that non-ASCII names survive a round trip."""
+        network = Network()
+        network.add_partner("Zoë")
+        network.add_company("Café")
+        network.add_employee("José", "Café")
+        network.add_contact("José", "Zoë", "coffee")
+        path = str(tmp_path / "unicode.snap")
+        network.save_snapshot(path)
+        assert analyze_network(Network.load_snapshot(path)) == "Café: Zoë (1)"
+
+    def test_is_snapshot(self, tmp_path):
+        """Test detecting snapshot files by their magic bytes."""
+        path = str(tmp_path / "network.snap")
+        build_network().save_snapshot(path)
+        assert is_snapshot(path)
+        assert not is_snapshot("examples/basic.txt")
+
+    def test_not_a_snapshot(self, tmp_path):
+        """Test that loading a non-snapshot file raises an error."""
+        path = tmp_path / "bogus.snap"
+        path.write_bytes(b"x" * 200)
+        with pytest.raises(ValueError, match="Not a network snapshot"):
+            load_snapshot(str(path))
+
+    def test_truncated_snapshot(self, tmp_path):
+        """Test that a truncated snapshot raises an error."""
+        path = tmp_path / "network.snap"
+        build_network().save_snapshot(str(path))
+        path.write_bytes(path.read_bytes()[:-10])
+        with pytest.raises(ValueError, match="truncated"):
+            load_snapshot(str(path))
+
+    def test_cli_reads_snapshot(self, tmp_path, capsys):
+        """Test that the CLI accepts a snapshot in place of a command file."""
+        path = str(tmp_path / "network.snap")
+        main(["examples/complex.txt", "--save-snapshot", path])
+        text_output = capsys.readouterr().out
+        main([path])
+        assert capsys.readouterr().out == text_output
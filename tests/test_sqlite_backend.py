@@ -0,0 +1,140 @@
+"""Tests for the SQLite storage backend."""
+import random
+import pytest
+from src.analyzer import analyze_network
+from src.cli import main, parse_command, read_input
+from src.entities import Network
+from src.sqlite_backend import SqliteNetwork, analyze_sqlite
+
+
+def build_both(lines, flush_size=3):
+    """Apply the same commands to a Network and a small-buffer SqliteNetwork."""
+    network = Network()
+    sqlite_network = SqliteNetwork(flush_size=flush_size)
+    for line in lines:
+        parse_command(line, network)
+        parse_command(line, sqlite_network)
+    return network, sqlite_network
+
+
+class TestSqliteNetwork:
+    """Tests for SqliteNetwork."""
+
+    @pytest.mark.parametrize("path", ["examples/basic.txt", "examples/complex.txt",
+                                      "examples/pitch.txt", "examples/spec-example.txt"])
+    def test_examples_match_network(self, path):
+        """Test that analysis matches analyze_network on the examples."""
+        network, sqlite_network = build_both(read_input(path))
+        assert analyze_sqlite(sqlite_network) == analyze_network(network)
+
+    def test_move_and_remove_match_network(self):
+        """Test that Move and Remove give the same analysis as Network."""
+        lines = ["Partner Alice", "Partner Bob", "Company Acme", "Company Globex",
+                 "Employee Dave Acme", "Employee Eve Acme",
+                 "Contact Dave Alice email", "Contact Dave Alice email", "Contact Eve Bob call",
+                 "Move Dave Globex", "Remove Contact Dave Alice email",
+                 "Remove Employee Eve", "Employee Eve Globex", "Contact Eve Bob call"]
+        network, sqlite_network = build_both(lines)
+        assert analyze_sqlite(sqlite_network) == analyze_network(network)
+        with pytest.raises(ValueError, match="Contact 'Eve Alice call' does not exist"):
+            sqlite_network.remove_contact("Eve", "Alice", "call")
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_random_ties_match_network(self, seed):
+        """Test the alphabetical tie-break on random networks with many ties."""
+        rng = random.Random(seed)
+        partners = ["Zoë", "alice", "Alice", "Bob", "Émile"]
+        lines = [f"Partner {p}" for p in partners]
+        lines += [f"Company C{i}" for i in range(4)]
+        lines += [f"Employee E{i} C{i % 3}" for i in range(8)]
+        lines += [f"Contact E{rng.randrange(8)} {rng.choice(partners)} email" for _ in range(40)]
+        network, sqlite_network = build_both(lines)
+        assert analyze_sqlite(sqlite_network) == analyze_network(network)
+
+    @pytest.mark.parametrize("lines, message", [
+        (["Partner Alice", "Partner Alice"], "Partner 'Alice' already exists"),
+        (["Company Acme", "Company Acme"], "Company 'Acme' already exists"),
+        (["Employee Bob Acme"], "Company 'Acme' does not exist"),
+        (["Company Acme", "Employee Bob Acme", "Employee Bob Acme"], "Employee 'Bob' already exists"),
+        (["Partner Alice", "Contact Bob Alice email"], "Employee 'Bob' does not exist"),
+        (["Company Acme", "Employee Bob Acme", "Contact Bob Alice email"],
+         "Partner 'Alice' does not exist"),
+        (["Partner Alice", "Company Acme", "Employee Bob Acme", "Contact Bob Alice meeting"],
+         "Invalid contact type 'meeting'"),
+    ])
+    @pytest.mark.parametrize("flush_size", [1, 100])
+    def test_same_errors_as_network(self, lines, message, flush_size):
+        """Test validation against both flushed and buffered rows."""
+        sqlite_network = SqliteNetwork(flush_size=flush_size)
+        with pytest.raises(ValueError, match=message):
+            for line in lines:
+                parse_command(line, sqlite_network)
+
+    def test_persists_between_connections(self, tmp_path):
+        """Test that a database can be reopened and appended to."""
+        path = str(tmp_path / "network.db")
+        first = SqliteNetwork(path)
+        for line in ["Partner Alice", "Company Acme", "Employee Bob Acme", "Contact Bob Alice email"]:
+            parse_command(line, first)
+        first.close()
+
+        second = SqliteNetwork(path)
+        parse_command("Partner Zed", second)
+        parse_command("Contact Bob Zed call", second)
+        parse_command("Contact Bob Zed call", second)
+        assert analyze_sqlite(second) == "Acme: Zed (2)"
+        with pytest.raises(ValueError, match="Partner 'Alice' already exists"):
+            second.add_partner("Alice")
+        second.close()
+
+    @pytest.mark.parametrize("flush_size", [1, 100])
+    def test_failed_transaction_rolls_back(self, tmp_path, flush_size):
+        """Test that a failing transaction leaves no rows behind, even flushed ones."""
+        path = str(tmp_path / "network.db")
+        network = SqliteNetwork(path, flush_size=flush_size)
+        parse_command("Company Acme", network)
+        lines = ["Partner Alice", "Company Globex", "Employee Bob Acme",
+                 "Contact Bob Alice email", "Move Bob Globex", "Contact Eve Alice email"]
+        with pytest.raises(ValueError, match="Employee 'Eve' does not exist"):
+            with network.transaction():
+                for line in lines:
+                    parse_command(line, network)
+        assert analyze_sqlite(network) == "Acme: No current relationship"
+
+        with network.transaction():
+            for line in lines[:-1]:
+                parse_command(line, network)
+        network.close()
+        assert analyze_sqlite(SqliteNetwork(path)) == (
+            "Acme: No current relationship\nGlobex: Alice (1)")
+
+    def test_cli_db_failure_can_be_rerun(self, tmp_path, capsys):
+        """Test that a failed --db run leaves the database ready for the fixed input."""
+        path = str(tmp_path / "network.db")
+        lines = ["Partner Alice", "Company Acme", "Employee Bob Acme",
+                 "Contact Bob Alice email", "Contact Eve Alice email"]
+        bad = tmp_path / "bad.txt"
+        bad.write_text("\n".join(lines) + "\n")
+        with pytest.raises(ValueError, match="Employee 'Eve' does not exist"):
+            main(["--db", path, str(bad)])
+
+        fixed = tmp_path / "fixed.txt"
+        fixed.write_text("\n".join(lines[:-1]) + "\n")
+        main(["--db", path, str(fixed)])
+        assert capsys.readouterr().out == "Acme: Alice (1)\n"
+
+    def test_cli_db_option(self, tmp_path, capsys):
+        """Test the --db option from the command line."""
+        main(["--db", str(tmp_path / "network.db"), "examples/complex.txt"])
+        sqlite_output = capsys.readouterr().out
+        main(["examples/complex.txt"])
+        assert sqlite_output == capsys.readouterr().out
+
+    @pytest.mark.parametrize("extra", [["--save-snapshot", "out.snap"], ["--profile"],
+                                       ["--stats-json", "stats.json"], ["--top", "2"],
+                                       ["--serve", "127.0.0.1:0"], ["--cache-dir", "cache"]])
+    def test_cli_db_rejects_options(self, tmp_path, extra):
+        """Test that --db cannot be combined with options it does not support."""
+        with pytest.raises(SystemExit):
+            main(["--db", str(tmp_path / "network.db"), *extra, "examples/basic.txt"])
+        assert not (tmp_path / "network.db").exists()